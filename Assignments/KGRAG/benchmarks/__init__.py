@@ -0,0 +1,4 @@
+"""Benchmarks and consistency checks for the RAG and Knowledge Graph pipelines.
+
+Run the scripts from the project root, e.g. ``python -m benchmarks.graph_store``.
+"""
@@ -0,0 +1,167 @@
+"""
+Benchmark the two-phase bulk load against writing the graph episode by episode.
+
+Usage:
+    python -m benchmarks.bulk_load [--copies 20] [--batch-size 1000] [--backend neo4j|sqlite]
+
+A local Neo4j container is enough:
+
+    docker run -d -p 7474:7474 -p 7687:7687 -e NEO4J_AUTH=neo4j/password \\
+        -e NEO4J_PLUGINS='["apoc"]' neo4j:5
+
+Phase one is simulated without LLM calls: the sample chunks are extracted
+heuristically and written to a JSONL file ``--copies`` times, with entity
+names suffixed per copy so the graph grows like a larger corpus. The same
+records are then written through the per-episode store calls
+(add_episode / add_entities / add_edges, as add_documents_to_graph does)
+and through load_jsonl. Each path runs in its own group, cleared before
+and after.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from knowledge_graph import Neo4jGraphStore, SQLiteGraphStore
+from knowledge_graph.bulk_load import read_records, load_jsonl
+from .common import SAMPLE_FILES, load_chunks, heuristic_extraction, neo4j_settings
+
+console = Console()
+
+
+def write_records(path: str, chunks: List[str], copies: int) -> int:
+    """Write heuristic extraction records for ``copies`` renamed copies of the chunks."""
+    reference_time = datetime.now(timezone.utc).isoformat()
+    extracted = [heuristic_extraction(chunk) for chunk in chunks]
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for copy in range(copies):
+            for i, (chunk, graph) in enumerate(zip(chunks, extracted)):
+                record = {
+                    "name": f"bulk_{copy}_chunk_{i}",
+                    "source": "bulk",
+                    "content": chunk,
+                    "source_description": f"Document chunk {i} (copy {copy})",
+                    "reference_time": reference_time,
+                    "entities": [{**e, "name": f"{e['name']}_{copy}"} for e in graph["entities"]],
+                    "relations": [
+                        {**r, "source": f"{r['source']}_{copy}", "target": f"{r['target']}_{copy}"}
+                        for r in graph["relations"]
+                    ]
+                }
+                f.write(json.dumps(record) + "\n")
+                count += 1
+    return count
+
+
+def episode_path(store, path: str, group_id: str) -> Dict[str, Any]:
+    """Write the records one episode at a time, as add_documents_to_graph does."""
+    start = time.perf_counter()
+    totals = {"episodes": 0, "edges": 0}
+    entities = set()
+    for record in read_records(path):
+        reference_time = datetime.fromisoformat(record["reference_time"])
+        episode_uuid = store.add_episode(
+            record["name"], record["content"], record["source_description"], reference_time, group_id
+        )
+        uuids = store.add_entities(record["entities"], group_id, episode_uuid)
+        edges = [
+            {
+                "source_uuid": uuids[r["source"]],
+                "target_uuid": uuids[r["target"]],
+                "relation": r["relation"],
+                "fact": r["fact"],
+                "valid_at": reference_time
+            }
+            for r in record["relations"]
+        ]
+        totals["episodes"] += 1
+        entities.update(uuids.values())
+        totals["edges"] += store.add_edges(edges, group_id, episode_uuid)
+    seconds = time.perf_counter() - start
+    return {**totals, "entities": len(entities), "seconds": seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=20, help="Copies of the sample corpus to load")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Chunks per bulk write")
+    parser.add_argument("--backend", choices=["neo4j", "sqlite"], default="neo4j", help="Graph store to load")
+    args = parser.parse_args()
+
+    if args.backend == "neo4j":
+        settings = neo4j_settings()
+        if not settings:
+            console.print("[red]NEO4J_URI is not configured[/red]")
+            return
+
+        def factory():
+            return Neo4jGraphStore(**settings)
+    else:
+        def factory():
+            return SQLiteGraphStore(":memory:")
+
+    chunks = [chunk for path in SAMPLE_FILES for chunk in load_chunks(path)]
+    fd, records_path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    rows = []
+    try:
+        num_records = write_records(records_path, chunks, args.copies)
+        console.print(f"[cyan]Extraction file: {num_records} chunks[/cyan]")
+
+        for label in ("episode", "bulk"):
+            store = factory()
+            group_id = f"benchmark_{label}_load" if args.backend == "neo4j" else ""
+            store.ensure_indexes()
+            store.clear(group_id=group_id)
+            try:
+                if label == "episode":
+                    report = episode_path(store, records_path, group_id)
+                else:
+                    report = load_jsonl(store, records_path, group_id, args.batch_size)
+            finally:
+                store.clear(group_id=group_id)
+                store.close()
+            nodes = report["episodes"] + report["entities"]
+            rows.append({
+                "path": label,
+                "nodes": nodes,
+                "edges": report["edges"],
+                "seconds": report["seconds"],
+                "nodes_per_second": nodes / report["seconds"],
+                "edges_per_second": report["edges"] / report["seconds"]
+            })
+    finally:
+        os.remove(records_path)
+
+    table = Table(title=f"Initial Load ({args.backend}, {num_records} chunks)", box=box.ROUNDED)
+    table.add_column("Path", style="cyan")
+    table.add_column("Nodes", style="magenta")
+    table.add_column("Edges", style="magenta")
+    table.add_column("Time", style="yellow")
+    table.add_column("Nodes/s", style="green")
+    table.add_column("Edges/s", style="green")
+    for row in rows:
+        table.add_row(
+            row["path"],
+            str(row["nodes"]),
+            str(row["edges"]),
+            f"{row['seconds']:.2f}s",
+            f"{row['nodes_per_second']:.0f}",
+            f"{row['edges_per_second']:.0f}"
+        )
+    console.print(table)
+    speedup = rows[0]["seconds"] / rows[1]["seconds"] if rows[1]["seconds"] > 0 else 0.0
+    console.print(f"\n[bold]Bulk load speedup: {speedup:.1f}x[/bold]")
+
+
+if __name__ == "__main__":
+    main()
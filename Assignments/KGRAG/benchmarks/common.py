@@ -0,0 +1,142 @@
+"""Shared helpers for the benchmark scripts."""
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+
+from dotenv import load_dotenv
+
+
+SAMPLE_FILES = [
+    "sample_data/api_documentation.txt",
+    "sample_data/py_best_practice.txt",
+]
+
+# CamelCase identifiers (AuthenticationService) and capitalised terms (PEP 8)
+_ENTITY_PATTERN = re.compile(r"\b(?:[A-Z][a-z0-9]+){2,}\b|\b[A-Z]{2,}(?:\s?\d+)?\b")
+
+
+def load_chunks(path: str, chunk_size: int = 1000) -> List[str]:
+    """
+    Split a text file into paragraph-aligned chunks of about ``chunk_size`` characters.
+
+    Args:
+        path: Path to the text file
+        chunk_size: Target chunk size in characters
+
+    Returns:
+        List of chunks
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        paragraphs = [p.strip() for p in f.read().split("\n\n") if p.strip()]
+
+    chunks, current = [], ""
+    for paragraph in paragraphs:
+        if current and len(current) + len(paragraph) > chunk_size:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def heuristic_extraction(text: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Deterministic stand-in for LLM extraction, used to benchmark storage.
+
+    Entities are identifier-like terms; every pair of consecutive entities in a
+    sentence becomes a relation whose fact is the sentence itself.
+
+    Args:
+        text: Document chunk
+
+    Returns:
+        Dictionary with entities and relations, in the extraction format
+    """
+    entities = {}
+    relations = []
+    for sentence in re.split(r"(?<=[.!?])\s+|\n", text):
+        names = list(dict.fromkeys(_ENTITY_PATTERN.findall(sentence)))
+        for name in names:
+            entities.setdefault(name, {"name": name, "type": "Entity", "summary": ""})
+        for source, target in zip(names, names[1:]):
+            relations.append({
+                "source": source,
+                "relation": "MENTIONED_WITH",
+                "target": target,
+                "fact": sentence.strip()
+            })
+    return {"entities": list(entities.values()), "relations": relations}
+
+
+def populate_store(
+    store,
+    chunks: List[str],
+    source: str,
+    group_id: str = "",
+    reference_time: Optional[datetime] = None
+) -> Dict[str, int]:
+    """
+    Write chunks to a graph store using heuristic extraction.
+
+    Args:
+        store: GraphStore instance
+        chunks: Document chunks
+        source: Source identifier for the episodes
+        group_id: Partition for the written data
+        reference_time: Document timestamp, used as the episode time and
+            valid_at of every fact (defaults to now)
+
+    Returns:
+        Dictionary with the number of episodes, entities and edges written
+    """
+    reference_time = reference_time or datetime.now(timezone.utc)
+    counts = {"episodes": 0, "entities": 0, "edges": 0}
+    for i, chunk in enumerate(chunks):
+        episode_uuid = store.add_episode(
+            f"{source}_chunk_{i}", chunk, f"Document chunk {i} from {source}",
+            reference_time, group_id
+        )
+        extracted = heuristic_extraction(chunk)
+        uuids = store.add_entities(extracted["entities"], group_id, episode_uuid)
+        edges = [
+            {
+                "source_uuid": uuids[r["source"]],
+                "target_uuid": uuids[r["target"]],
+                "relation": r["relation"],
+                "fact": r["fact"],
+                "valid_at": reference_time
+            }
+            for r in extracted["relations"]
+        ]
+        counts["episodes"] += 1
+        counts["entities"] += len(uuids)
+        counts["edges"] += store.add_edges(edges, group_id, episode_uuid)
+    return counts
+
+
+def neo4j_settings() -> Dict[str, str]:
+    """Neo4j connection settings from the environment (empty if not configured)."""
+    load_dotenv()
+    uri = os.getenv("NEO4J_URI")
+    if not uri:
+        return {}
+    return {
+        "uri": uri,
+        "user": os.getenv("NEO4J_USERNAME"),
+        "password": os.getenv("NEO4J_PASSWORD"),
+    }
+
+
+@contextmanager
+def timed(timings: Dict[str, float], name: str):
+    """Record the wall time of a block in ``timings[name]`` (seconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
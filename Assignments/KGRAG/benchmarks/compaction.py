@@ -0,0 +1,117 @@
+"""
+Benchmark graph growth and lookup latency under re-ingestion, with and without compaction.
+
+Usage:
+    python -m benchmarks.compaction [--rounds 5] [--backend sqlite|neo4j]
+
+Every round re-ingests the sample chunks (heuristic extraction, no LLM calls),
+as a rebuild over overlapping documents would. One graph is compacted after
+each round and one is not; the table shows their size and search/expansion
+latency per round. The neo4j backend uses its own group, which is cleared
+before and after each graph, and needs APOC plus Graphiti's fulltext index
+(run demo.py once).
+"""
+
+import argparse
+import time
+from typing import Dict, Any, List
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from knowledge_graph import Neo4jGraphStore, SQLiteGraphStore
+from .common import SAMPLE_FILES, load_chunks, populate_store, neo4j_settings
+from .graph_store import top_entities
+
+console = Console()
+
+
+def lookup_latency(store, queries: List[str]) -> Dict[str, float]:
+    """Average search_facts and expand_hop latency in milliseconds."""
+    start = time.perf_counter()
+    seeds = []
+    for query in queries:
+        for edge in store.search_facts(query, 10):
+            seeds.extend([edge["source_uuid"], edge["target_uuid"]])
+    search_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    store.expand_hop(list(dict.fromkeys(seeds)), [], 10)
+    expand_ms = (time.perf_counter() - start) * 1000
+    return {"search_ms": search_ms, "expand_ms": expand_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="Number of re-ingestion rounds")
+    parser.add_argument("--backend", choices=["sqlite", "neo4j"], default="sqlite", help="Graph store to churn")
+    args = parser.parse_args()
+
+    chunks = [chunk for path in SAMPLE_FILES for chunk in load_chunks(path)]
+    queries = top_entities(chunks, 10)
+
+    if args.backend == "neo4j":
+        settings = neo4j_settings()
+        if not settings:
+            console.print("[red]NEO4J_URI is not configured[/red]")
+            return
+
+        def factory():
+            store = Neo4jGraphStore(**settings)
+            store.ensure_indexes()
+            return store
+        group_id = "benchmark_churn"
+    else:
+        def factory():
+            return SQLiteGraphStore(":memory:")
+        group_id = ""
+
+    # One graph at a time, so lookups never see the other graph's data
+    rows: List[Dict[str, Any]] = []
+    for label in ("raw", "compacted"):
+        store = factory()
+        store.clear(group_id=group_id)
+        try:
+            for round_number in range(1, args.rounds + 1):
+                populate_store(store, chunks, "churn", group_id)
+                report = None
+                if label == "compacted":
+                    report = store.compact(group_id=group_id, archive_path=None)
+                stats = store.get_statistics()
+                rows.append({
+                    "round": round_number,
+                    "graph": label,
+                    "nodes": stats["total_nodes"],
+                    "relationships": stats["total_relationships"],
+                    "compact_s": report["seconds"] if report else None,
+                    **lookup_latency(store, queries)
+                })
+        finally:
+            store.clear(group_id=group_id)
+            store.close()
+    rows.sort(key=lambda row: row["round"])
+
+    table = Table(title=f"Re-ingestion Churn ({args.backend})", box=box.ROUNDED)
+    table.add_column("Round", style="cyan")
+    table.add_column("Graph", style="cyan")
+    table.add_column("Nodes", style="magenta")
+    table.add_column("Relationships", style="magenta")
+    table.add_column("Compaction", style="magenta")
+    table.add_column("Search", style="green")
+    table.add_column("Expand", style="green")
+    for row in rows:
+        table.add_row(
+            str(row["round"]),
+            row["graph"],
+            str(row["nodes"]),
+            str(row["relationships"]),
+            f"{row['compact_s']:.2f}s" if row["compact_s"] is not None else "-",
+            f"{row['search_ms']:.2f} ms",
+            f"{row['expand_ms']:.2f} ms"
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
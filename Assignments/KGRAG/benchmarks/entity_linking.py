@@ -0,0 +1,136 @@
+"""
+Benchmark entity linking: local entity index vs the remote search path.
+
+Usage:
+    python -m benchmarks.entity_linking [--probes 50] [--k 5]
+
+Runs against the graph that is already built (see demo.py). For a sample of
+entities a probe question mentions the entity in spoken form
+("authentication service" for AuthenticationService); a probe is a hit
+when the entity is among the k linked seeds. The search path is
+graphiti.search (neo4j backend) or the store's keyword search (sqlite).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import time
+from typing import List, Dict, Any
+
+import numpy as np
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from knowledge_graph import KnowledgeGraphRAG
+
+console = Console()
+
+
+def spoken(name: str) -> str:
+    """Turn an identifier into the words a user would type."""
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", name).replace("_", " ").lower()
+
+
+def summarize(latencies: List[float], hits: List[bool]) -> Dict[str, Any]:
+    """Latency percentiles (ms) and hit rate."""
+    values = np.asarray(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "hit_rate": sum(hits) / len(hits)
+    }
+
+
+async def run(args) -> None:
+    load_dotenv()
+    kg_system = KnowledgeGraphRAG(
+        neo4j_uri=os.getenv("NEO4J_URI"),
+        neo4j_user=os.getenv("NEO4J_USERNAME"),
+        neo4j_password=os.getenv("NEO4J_PASSWORD"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        model_name=os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
+        backend=os.getenv("KG_BACKEND", "neo4j"),
+        sqlite_path=os.getenv("KG_SQLITE_PATH", "knowledge_graph.db"),
+        base_url=os.getenv("OPENAI_BASE_URL")
+    )
+
+    try:
+        build_start = time.time()
+        entity_index = kg_system.enable_entity_index(
+            embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+            base_url=os.getenv("OPENAI_BASE_URL")
+        )
+        build_time = time.time() - build_start
+        if entity_index.num_entities == 0:
+            console.print("[red]The graph has no entities; build it first (python demo.py)[/red]")
+            return
+
+        rng = random.Random(args.seed)
+        sample = rng.sample(entity_index.names, min(args.probes, entity_index.num_entities))
+        probes = [(name, f"What is the role of {spoken(name)} in the system?") for name in sample]
+        console.print(f"Linking {len(probes)} probe questions against {entity_index.num_entities} entities "
+                      f"(index built in {build_time:.1f}s)\n")
+
+        results = {}
+
+        latencies, hits = [], []
+        for name, question in probes:
+            start = time.perf_counter()
+            linked = entity_index.link(question, args.k, embed_fallback=False)
+            latencies.append(time.perf_counter() - start)
+            hits.append(name in {e["name"] for e in linked})
+        results["Index (names)"] = summarize(latencies, hits)
+
+        embed_latencies, latencies, hits = [], [], []
+        for name, question in probes:
+            start = time.perf_counter()
+            vector = entity_index.embeddings.embed_query(question)
+            embed_latencies.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            linked = entity_index.link(question, args.k, query_vector=vector)
+            latencies.append(time.perf_counter() - start)
+            hits.append(name in {e["name"] for e in linked})
+        results["Index (names + HNSW)"] = summarize(latencies, hits)
+        results["  question embedding"] = summarize(embed_latencies, hits)
+
+        latencies, hits = [], []
+        for name, question in probes:
+            start = time.perf_counter()
+            edges = await kg_system.search_edges(question, args.k)
+            seeds = {uuid for edge in edges for uuid in (edge["source_uuid"], edge["target_uuid"]) if uuid}
+            names = await asyncio.to_thread(kg_system.store.entity_names, list(seeds))
+            latencies.append(time.perf_counter() - start)
+            hits.append(name in names)
+        results["Remote search"] = summarize(latencies, hits)
+    finally:
+        kg_system.close()
+
+    table = Table(title=f"Entity Linking (k={args.k})", box=box.ROUNDED)
+    table.add_column("Path", style="cyan")
+    table.add_column("p50", style="magenta")
+    table.add_column("p95", style="magenta")
+    table.add_column(f"Hit@{args.k}", style="magenta")
+    for path, summary in results.items():
+        table.add_row(
+            path,
+            f"{summary['p50_ms']:.3f} ms",
+            f"{summary['p95_ms']:.3f} ms",
+            f"{summary['hit_rate']:.0%}" if not path.startswith(" ") else ""
+        )
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--probes", type=int, default=50, help="Number of probe questions")
+    parser.add_argument("--k", type=int, default=5, help="Seeds linked per question")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the entity sample")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark the embedded SQLite graph store against Neo4j on the sample data.
+
+Usage:
+    python -m benchmarks.graph_store [--skip-neo4j]
+
+Neo4j is benchmarked only when NEO4J_URI is configured. Its database is
+cleared first.
+"""
+
+import argparse
+from collections import Counter
+from typing import Dict
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from knowledge_graph import Neo4jGraphStore, SQLiteGraphStore
+from .common import SAMPLE_FILES, load_chunks, populate_store, neo4j_settings, timed, heuristic_extraction
+
+console = Console()
+
+
+def top_entities(chunks, n: int = 20):
+    """Most frequently extracted entity names in the chunks."""
+    counts = Counter()
+    for chunk in chunks:
+        counts.update(e["name"] for e in heuristic_extraction(chunk)["entities"])
+    return [name for name, _ in counts.most_common(n)]
+
+
+def benchmark_store(name: str, factory, chunks, entities) -> Dict[str, float]:
+    """
+    Run the benchmark operations against one backend.
+
+    Args:
+        name: Backend label
+        factory: Callable returning a fresh GraphStore
+        chunks: Document chunks to ingest
+        entities: Entity names used for lookups
+
+    Returns:
+        Mapping of operation to wall time in seconds
+    """
+    timings = {}
+    with timed(timings, "startup"):
+        store = factory()
+        store.ensure_indexes()
+
+    store.clear()
+    with timed(timings, "ingest"):
+        populate_store(store, chunks, "benchmark")
+    with timed(timings, "statistics"):
+        store.get_statistics()
+    with timed(timings, "relationships"):
+        for entity in entities:
+            list(store.iter_entity_relationships([entity]))
+    with timed(timings, "bulk_relationships"):
+        list(store.iter_entity_relationships(entities))
+
+    seeds = [edge["source_uuid"] for edge, _ in zip(store.iter_edges(), range(len(entities)))]
+    with timed(timings, "expand_hop"):
+        store.expand_hop(seeds, [], 10)
+    with timed(timings, "clear"):
+        store.clear()
+
+    store.close()
+    console.print(f"[green][OK][/green] {name} done")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skip-neo4j", action="store_true", help="Only benchmark the SQLite store")
+    parser.add_argument("--sqlite-path", default=":memory:", help="SQLite database path")
+    args = parser.parse_args()
+
+    chunks = [chunk for path in SAMPLE_FILES for chunk in load_chunks(path)]
+    entities = top_entities(chunks)
+    console.print(f"Loaded {len(chunks)} chunks, looking up {len(entities)} entities\n")
+
+    results = {"sqlite": benchmark_store("sqlite", lambda: SQLiteGraphStore(args.sqlite_path), chunks, entities)}
+
+    settings = neo4j_settings()
+    if settings and not args.skip_neo4j:
+        results["neo4j"] = benchmark_store(
+            "neo4j",
+            lambda: Neo4jGraphStore(settings["uri"], settings["user"], settings["password"]),
+            chunks,
+            entities
+        )
+
+    table = Table(title="Graph Store Benchmark", box=box.ROUNDED)
+    table.add_column("Operation", style="cyan")
+    for backend in results:
+        table.add_column(backend, style="magenta")
+    if "neo4j" in results:
+        table.add_column("neo4j / sqlite", style="green")
+
+    for operation in results["sqlite"]:
+        row = [operation] + [f"{results[b][operation] * 1000:.1f} ms" for b in results]
+        if "neo4j" in results:
+            row.append(f"{results['neo4j'][operation] / max(results['sqlite'][operation], 1e-9):.1f}x")
+        table.add_row(*row)
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare per-episode and bulk knowledge graph ingestion on the sample data.
+
+Usage:
+    python -m benchmarks.ingestion [--max-chunks 20] [--batch-size 10]
+
+Each path ingests the same chunks into its own group, which is cleared
+before and after the run, so existing graph data is left untouched. This
+makes real OpenAI calls (and Neo4j writes unless KG_BACKEND=sqlite).
+"""
+
+import argparse
+import asyncio
+import os
+
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from knowledge_graph import KnowledgeGraphRAG
+from .common import SAMPLE_FILES, load_chunks
+
+console = Console()
+
+
+async def run(args) -> None:
+    load_dotenv()
+    kg_system = KnowledgeGraphRAG(
+        neo4j_uri=os.getenv("NEO4J_URI"),
+        neo4j_user=os.getenv("NEO4J_USERNAME"),
+        neo4j_password=os.getenv("NEO4J_PASSWORD"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        model_name=os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
+        backend=os.getenv("KG_BACKEND", "neo4j"),
+        sqlite_path=os.getenv("KG_SQLITE_PATH", "knowledge_graph.db"),
+        base_url=os.getenv("OPENAI_BASE_URL")
+    )
+    if kg_system.graphiti is not None:
+        await kg_system.graphiti.build_indices_and_constraints()
+
+    chunks = [chunk for path in SAMPLE_FILES for chunk in load_chunks(path)][:args.max_chunks]
+    console.print(f"Benchmarking ingestion of {len(chunks)} chunks\n")
+
+    reports = []
+    try:
+        for bulk in (False, True):
+            group_id = f"benchmark_{'bulk' if bulk else 'episode'}"
+            kg_system.clear_graph(group_id=group_id)
+            reports.append(await kg_system.add_documents_to_graph(
+                chunks,
+                source="benchmark",
+                group_id=group_id,
+                bulk=bulk,
+                batch_size=args.batch_size
+            ))
+            kg_system.clear_graph(group_id=group_id)
+    finally:
+        kg_system.close()
+
+    table = Table(title="Ingestion Throughput", box=box.ROUNDED)
+    table.add_column("Path", style="cyan")
+    table.add_column("Time", style="magenta")
+    table.add_column("Chunks/s", style="magenta")
+    table.add_column("LLM calls", style="magenta")
+    table.add_column("LLM calls/chunk", style="magenta")
+    for report in reports:
+        table.add_row(
+            report["mode"],
+            f"{report['seconds']:.1f}s",
+            f"{report['chunks_per_second']:.2f}",
+            str(report["llm_calls"]),
+            f"{report['llm_calls_per_chunk']:.2f}"
+        )
+    console.print(table)
+
+    episode, bulk = reports
+    if bulk["seconds"] > 0:
+        console.print(f"\nBulk ingestion is [bold]{episode['seconds'] / bulk['seconds']:.2f}x[/bold] faster "
+                      f"and uses [bold]{bulk['llm_calls_per_chunk']:.2f}[/bold] vs "
+                      f"[bold]{episode['llm_calls_per_chunk']:.2f}[/bold] LLM calls per chunk")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-chunks", type=int, default=20, help="Number of sample chunks to ingest")
+    parser.add_argument("--batch-size", type=int, default=10, help="Chunks per bulk batch")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
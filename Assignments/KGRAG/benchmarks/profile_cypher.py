@@ -0,0 +1,369 @@
+"""
+Profile every Cypher query the project issues against seeded graphs.
+
+Usage:
+    python -m benchmarks.profile_cypher --yes [--sizes 1000,10000] [--save-baseline FILE]
+    python -m benchmarks.profile_cypher --yes --baseline benchmarks/cypher_baseline.json
+
+For each size a synthetic graph (Entity, Episodic, RELATES_TO, MENTIONS in
+the Graphiti schema) is written to its own group. Every query then runs
+under PROFILE, and the harness records db hits, rows and the median wall
+time. Plans with full graph/label scans, scans filtered on a property
+(a likely missing index) or cartesian products are flagged. Writing
+queries run in a transaction that is rolled back. With ``--baseline``
+the script exits with status 1 when a query's db hits (or time) grew past
+the tolerance.
+
+Use an empty database: the graph-wide queries also see any other data.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any
+
+from neo4j import GraphDatabase
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from comparison.visualize import SAMPLE_BY_DEGREE_QUERY, SAMPLE_BY_UUID_QUERY, EGO_NETWORKS_QUERY
+from knowledge_graph.neo4j_store import (
+    Neo4jGraphStore,
+    STATISTICS_QUERY,
+    ENTITY_RELATIONSHIPS_QUERY,
+    EXPAND_HOP_QUERY,
+    EDGES_SINCE_QUERY,
+    ENTITIES_SINCE_QUERY,
+    ENTITY_NAMES_QUERY,
+    SEARCH_FACTS_QUERY,
+    MERGE_ENTITIES_QUERY,
+    MERGE_EDGES_QUERY,
+    ARCHIVE_EDGES_QUERY,
+    MERGE_EPISODES_QUERY,
+    ORPHAN_ENTITIES_MATCH,
+    WINDOW_SEARCH_QUERY,
+    BACKFILL_VALID_AT_QUERY,
+    _window_predicate,
+)
+from knowledge_graph.graph_store import time_window
+from .common import neo4j_settings
+
+console = Console()
+
+GROUP_ID = "cypher_profile"
+
+# Graphiti creates this index; the seeded graph needs it for search_facts
+FULLTEXT_INDEX = (
+    "CREATE FULLTEXT INDEX edge_name_and_fact IF NOT EXISTS "
+    "FOR ()-[r:RELATES_TO]-() ON EACH [r.name, r.fact]"
+)
+
+SEED_ENTITIES = """
+UNWIND range(0, $n - 1) AS i
+CALL {
+    WITH i
+    CREATE (:Entity {uuid: $group_id + '-e' + i, name: 'ProfileEntity' + i, group_id: $group_id,
+                     summary: 'Synthetic entity ' + i, created_at: datetime()})
+} IN TRANSACTIONS OF 5000 ROWS
+"""
+
+SEED_EDGES = """
+UNWIND range(0, $n * $degree - 1) AS j
+CALL {
+    WITH j
+    MATCH (a:Entity {uuid: $group_id + '-e' + (j % $n)})
+    MATCH (b:Entity {uuid: $group_id + '-e' + toInteger(rand() * $n)})
+    CREATE (a)-[:RELATES_TO {uuid: $group_id + '-r' + j, name: 'DEPENDS_ON',
+                             fact: a.name + ' depends on ' + b.name, group_id: $group_id,
+                             episodes: [], created_at: datetime(), valid_at: datetime(),
+                             invalid_at: null, expired_at: null}]->(b)
+} IN TRANSACTIONS OF 5000 ROWS
+"""
+
+SEED_EPISODES = """
+UNWIND range(0, $n / 10) AS k
+CALL {
+    WITH k
+    CREATE (ep:Episodic {uuid: $group_id + '-ep' + k, name: 'profile_chunk_' + k, group_id: $group_id,
+                         content: 'Synthetic chunk ' + k, created_at: datetime(), valid_at: datetime()})
+    WITH ep, k
+    UNWIND range(0, 9) AS offset
+    MATCH (e:Entity {uuid: $group_id + '-e' + ((k * 10 + offset) % $n)})
+    CREATE (ep)-[:MENTIONS {group_id: $group_id}]->(e)
+} IN TRANSACTIONS OF 1000 ROWS
+"""
+
+
+def catalogue(n: int) -> List[Dict[str, Any]]:
+    """
+    Every Cypher statement the project issues, with parameters for a seeded graph of size n.
+
+    Returns:
+        Dictionaries with name, source, query, params and write
+    """
+    names = [f"ProfileEntity{i}" for i in range(0, n, max(n // 20, 1))]
+    uuids = [f"{GROUP_ID}-e{i}" for i in range(0, n, max(n // 20, 1))]
+    group = {"group_id": GROUP_ID, "batch_size": 1000}
+    now = datetime.now(timezone.utc)
+    window = time_window(between=(now - timedelta(days=1), now))
+    window_params = {f"window_{key}": value for key, value in window.items()}
+    return [
+        # knowledge_graph/neo4j_store.py: statistics, clear, lookups
+        {"name": "statistics", "source": "neo4j_store.get_statistics",
+         "query": STATISTICS_QUERY, "params": {}},
+        {"name": "clear_scoped_count", "source": "neo4j_store.clear",
+         "query": "MATCH (n:Entity) WHERE n.group_id = $group_id RETURN count(n) AS count", "params": group},
+        {"name": "entity_relationships", "source": "neo4j_store.iter_entity_relationships",
+         "query": ENTITY_RELATIONSHIPS_QUERY + "\nSKIP $skip",
+         "params": {"entity_names": names, "relationship_types": None, "skip": 0}},
+        {"name": "expand_hop", "source": "neo4j_store.expand_hop",
+         "query": EXPAND_HOP_QUERY, "params": {"uuids": uuids, "seen_edges": [], "fan_out": 10}},
+        {"name": "edges_since", "source": "neo4j_store.iter_edges",
+         "query": EDGES_SINCE_QUERY, "params": {"since": now}},
+        {"name": "entities_since", "source": "neo4j_store.iter_entities",
+         "query": ENTITIES_SINCE_QUERY, "params": {"since": now}},
+        {"name": "entity_names", "source": "neo4j_store.entity_names",
+         "query": ENTITY_NAMES_QUERY, "params": {"uuids": uuids}},
+        {"name": "search_facts", "source": "neo4j_store.search_facts",
+         "query": SEARCH_FACTS_QUERY, "params": {"query": "ProfileEntity1 depends", "limit": 10}},
+        {"name": "search_facts_window", "source": "neo4j_store.search_facts",
+         "query": WINDOW_SEARCH_QUERY.format(predicate=_window_predicate(window)),
+         "params": {"terms": ["profileentity1", "depends"], "limit": 10, **window_params}},
+        {"name": "expand_hop_window", "source": "neo4j_store.expand_hop",
+         "query": EXPAND_HOP_QUERY.replace("r.expired_at IS NULL", _window_predicate(window)),
+         "params": {"uuids": uuids, "seen_edges": [], "fan_out": 10, **window_params}},
+        {"name": "backfill_valid_at", "source": "neo4j_store.backfill_valid_at",
+         "query": BACKFILL_VALID_AT_QUERY,
+         "params": {"episode_names": ["profile_chunk_0", "profile_chunk_1"], "group_id": GROUP_ID}, "write": True},
+        {"name": "compact_merge_entities", "source": "neo4j_store.compact",
+         "query": MERGE_ENTITIES_QUERY, "params": group, "write": True},
+        {"name": "compact_archive_edges", "source": "neo4j_store.compact",
+         "query": ARCHIVE_EDGES_QUERY, "params": {**group, "cutoff": now}, "write": True},
+        {"name": "compact_merge_edges", "source": "neo4j_store.compact",
+         "query": MERGE_EDGES_QUERY, "params": group, "write": True},
+        {"name": "compact_merge_episodes", "source": "neo4j_store.compact",
+         "query": MERGE_EPISODES_QUERY, "params": group, "write": True},
+        {"name": "compact_orphans", "source": "neo4j_store.compact",
+         "query": ORPHAN_ENTITIES_MATCH + "RETURN count(n) AS count", "params": group},
+        # comparison/visualize.py
+        {"name": "visualize_sample_degree", "source": "visualize.sample_subgraph",
+         "query": SAMPLE_BY_DEGREE_QUERY,
+         "params": {"group_id": GROUP_ID, "max_nodes": 100, "fan_out": 100}},
+        {"name": "visualize_sample_uuids", "source": "visualize.sample_subgraph",
+         "query": SAMPLE_BY_UUID_QUERY,
+         "params": {"group_id": GROUP_ID, "nodes": [{"uuid": u, "score": 1.0} for u in uuids], "fan_out": 100}},
+        {"name": "visualize_ego_networks", "source": "visualize.fetch_ego_networks",
+         "query": EGO_NETWORKS_QUERY % 2,
+         "params": {"names": names, "group_id": GROUP_ID, "max_edges": 200}},
+        # Works/simple_KGRAG/app.py (copied: the script connects on import)
+        {"name": "simple_kgrag_search", "source": "simple_KGRAG/app.search_graph",
+         "query": """
+            MATCH (n:Entity) WHERE toLower(n.name) CONTAINS toLower($kw)
+            OPTIONAL MATCH (n)-[r:RELATES]->(m)
+            OPTIONAL MATCH (p)-[r2:RELATES]->(n)
+            RETURN n.name AS entity, n.type AS type,
+                   collect(DISTINCT {rel: r.type, target: m.name}) AS out,
+                   collect(DISTINCT {rel: r2.type, source: p.name}) AS inc
+         """, "params": {"kw": "entity1"}},
+        {"name": "simple_kgrag_store_edge", "source": "simple_KGRAG/app.store",
+         "query": "MATCH (a:Entity {name: $src}), (b:Entity {name: $tgt}) MERGE (a)-[:RELATES {type: $rel}]->(b)",
+         "params": {"src": names[0], "tgt": names[-1], "rel": "USES"}, "write": True},
+    ]
+
+
+def _operators(plan: Dict[str, Any], parent=None):
+    """Yield (operator, parent) pairs of a profiled plan, depth first."""
+    yield plan, parent
+    for child in plan.get("children", []):
+        yield from _operators(child, plan)
+
+
+def _operator_type(plan: Dict[str, Any]) -> str:
+    return plan["operatorType"].split("@")[0]
+
+
+def analyse_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Total db hits and flags for a profiled plan.
+
+    Returns:
+        Dictionary with db_hits, rows and flags
+    """
+    db_hits = 0
+    flags = []
+    for operator, parent in _operators(plan):
+        db_hits += operator.get("dbHits", 0)
+        kind = _operator_type(operator)
+        details = operator.get("args", {}).get("Details", "")
+
+        if kind == "AllNodesScan":
+            flags.append("full graph scan")
+        elif kind == "NodeByLabelScan":
+            predicate = parent.get("args", {}).get("Details", "") if parent and _operator_type(parent) == "Filter" else ""
+            match = re.search(r"\w+\.(\w+)\s*(?:=|IN\b|STARTS WITH)", predicate)
+            label = details.split(":")[-1] if ":" in details else details
+            if match:
+                flags.append(f"missing index? {label}({match.group(1)})")
+            else:
+                flags.append(f"label scan {label}")
+        elif kind in ("AllRelationshipsScan", "DirectedAllRelationshipsScan", "UndirectedAllRelationshipsScan"):
+            flags.append("full relationship scan")
+        elif kind == "CartesianProduct":
+            flags.append("cartesian product")
+
+    return {"db_hits": db_hits, "rows": plan.get("rows", 0), "flags": sorted(set(flags))}
+
+
+def profile_query(driver, entry: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """
+    Run one catalogue entry under PROFILE ``repeat`` times.
+
+    Returns:
+        Dictionary with db_hits, rows, time_ms (median) and flags
+    """
+    times = []
+    analysis = None
+    with driver.session() as session:
+        for _ in range(repeat):
+            tx = session.begin_transaction()
+            try:
+                start = time.perf_counter()
+                summary = tx.run("PROFILE " + entry["query"], **entry["params"]).consume()
+                times.append((time.perf_counter() - start) * 1000)
+                analysis = analyse_plan(summary.profile)
+            finally:
+                if entry.get("write"):
+                    tx.rollback()
+                else:
+                    tx.commit()
+    return {**analysis, "time_ms": statistics.median(times)}
+
+
+def seed(driver, n: int, degree: int) -> None:
+    """Write a synthetic graph of n entities with about ``degree`` outgoing edges each."""
+    with driver.session() as session:
+        for query in (SEED_ENTITIES, SEED_EDGES, SEED_EPISODES):
+            session.run(query, n=n, degree=degree, group_id=GROUP_ID).consume()
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+    time_tolerance: float
+) -> List[str]:
+    """
+    List queries that regressed past the baseline.
+
+    Args:
+        results: Mapping of size to query name to measurements
+        baseline: Same structure, loaded from the baseline file
+        tolerance: Allowed relative growth in db hits
+        time_tolerance: Allowed relative growth in wall time (plus 1 ms of noise)
+
+    Returns:
+        Regression descriptions (empty when nothing regressed)
+    """
+    regressions = []
+    for size, queries in results.items():
+        for name, measured in queries.items():
+            expected = baseline.get(size, {}).get(name)
+            if expected is None:
+                continue
+            if measured["db_hits"] > expected["db_hits"] * (1 + tolerance) + 10:
+                regressions.append(f"{name} @ {size}: db hits {expected['db_hits']} -> {measured['db_hits']}")
+            if measured["time_ms"] > expected["time_ms"] * (1 + time_tolerance) + 1.0:
+                regressions.append(
+                    f"{name} @ {size}: time {expected['time_ms']:.1f} -> {measured['time_ms']:.1f} ms"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--yes", action="store_true", help="Confirm writing the seeded graphs to Neo4j")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated entity counts")
+    parser.add_argument("--degree", type=int, default=4, help="Outgoing RELATES_TO edges per entity")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median time is kept)")
+    parser.add_argument("--baseline", default=None, help="Fail on regressions against this JSON file")
+    parser.add_argument("--save-baseline", default=None, help="Write the measurements to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative db hit growth")
+    parser.add_argument("--time-tolerance", type=float, default=1.0, help="Allowed relative time growth")
+    args = parser.parse_args()
+
+    if not args.yes:
+        console.print("[red]This writes synthetic data to Neo4j; re-run with --yes[/red]")
+        sys.exit(2)
+    settings = neo4j_settings()
+    if not settings:
+        console.print("[red]NEO4J_URI is not configured[/red]")
+        sys.exit(2)
+
+    store = Neo4jGraphStore(**settings)
+    driver = GraphDatabase.driver(settings["uri"], auth=(settings["user"], settings["password"]))
+    store.ensure_indexes()
+    with driver.session() as session:
+        session.run(FULLTEXT_INDEX).consume()
+        session.run("CALL db.awaitIndexes(300)").consume()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for n in [int(size) for size in args.sizes.split(",")]:
+            store.clear(group_id=GROUP_ID)
+            seed(driver, n, args.degree)
+            with driver.session() as session:
+                session.run("CALL db.awaitIndexes(300)").consume()
+            console.print(f"[green][OK][/green] Seeded {n} entities")
+
+            results[str(n)] = {}
+            for entry in catalogue(n):
+                measured = profile_query(driver, entry, args.repeat)
+                results[str(n)][entry["name"]] = {"source": entry["source"], **measured}
+    finally:
+        store.clear(group_id=GROUP_ID)
+        store.close()
+        driver.close()
+
+    for size, queries in results.items():
+        table = Table(title=f"Cypher Profile ({size} entities)", box=box.ROUNDED)
+        table.add_column("Query", style="cyan")
+        table.add_column("Source", style="white")
+        table.add_column("DB hits", style="magenta", justify="right")
+        table.add_column("Rows", style="magenta", justify="right")
+        table.add_column("Time", style="magenta", justify="right")
+        table.add_column("Flags", style="yellow")
+        for name, measured in queries.items():
+            table.add_row(
+                name,
+                measured["source"],
+                str(measured["db_hits"]),
+                str(measured["rows"]),
+                f"{measured['time_ms']:.1f} ms",
+                ", ".join(measured["flags"])
+            )
+        console.print(table)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        console.print(f"[green][OK] Baseline saved to: {args.save_baseline}[/green]")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.time_tolerance)
+        if regressions:
+            console.print(f"\n[bold red]{len(regressions)} regression(s):[/bold red]")
+            for regression in regressions:
+                console.print(f"  - {regression}")
+            sys.exit(1)
+        console.print("\n[bold green]No regressions against the baseline[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Offline evaluation of the query router against always querying both systems.
+
+Usage:
+    python -m benchmarks.router [--router-model gpt-4o-mini] [--references refs.json]
+
+Runs the demo questions through both systems on the graph that is already
+built (see demo.py) and reports the latency and LLM calls routing would
+have saved, and how much answer quality it keeps. Quality is token F1
+against reference answers ({"question": "answer", ...}) when given,
+otherwise an LLM grade.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+from rich.console import Console
+
+from traditional_rag import TraditionalRAG
+from knowledge_graph import KnowledgeGraphRAG
+from comparison.router import QueryRouter, evaluate_router, display_router_evaluation, reference_scorer, llm_judge
+from demo import DEMO_QUESTIONS
+
+console = Console()
+
+
+async def run(args) -> None:
+    load_dotenv()
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    model_name = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+
+    rag_system = TraditionalRAG(
+        openai_api_key=openai_api_key,
+        model_name=model_name,
+        embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+        base_url=os.getenv("OPENAI_BASE_URL")
+    )
+    rag_system.build_index(rag_system.load_documents(args.documents))
+
+    kg_system = KnowledgeGraphRAG(
+        neo4j_uri=os.getenv("NEO4J_URI"),
+        neo4j_user=os.getenv("NEO4J_USERNAME"),
+        neo4j_password=os.getenv("NEO4J_PASSWORD"),
+        openai_api_key=openai_api_key,
+        model_name=model_name,
+        backend=os.getenv("KG_BACKEND", "neo4j"),
+        sqlite_path=os.getenv("KG_SQLITE_PATH", "knowledge_graph.db"),
+        base_url=os.getenv("OPENAI_BASE_URL")
+    )
+
+    try:
+        if args.entity_index:
+            kg_system.enable_entity_index(embedding_model=None)
+
+        router_llm = None
+        if args.router_model:
+            router_llm = ChatOpenAI(
+                model=args.router_model, temperature=0, api_key=openai_api_key, base_url=os.getenv("OPENAI_BASE_URL")
+            )
+        router = QueryRouter(kg_system, llm=router_llm, log_path=None)
+
+        if args.references:
+            with open(args.references, "r", encoding="utf-8") as f:
+                quality_fn = reference_scorer(json.load(f))
+        else:
+            quality_fn = llm_judge(ChatOpenAI(
+                model=model_name, temperature=0, api_key=openai_api_key, base_url=os.getenv("OPENAI_BASE_URL")
+            ))
+
+        report = await evaluate_router(router, rag_system, kg_system, DEMO_QUESTIONS, quality_fn)
+    finally:
+        kg_system.close()
+
+    display_router_evaluation(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        console.print(f"\n[green][OK] Report saved to: {args.output}[/green]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", default="sample_data/py_best_practice.txt", help="Documents for the vector index")
+    parser.add_argument("--router-model", default=None, help="Small model for ambiguous questions (default: features only)")
+    parser.add_argument("--references", default=None, help="JSON file mapping questions to reference answers")
+    parser.add_argument("--no-entity-index", dest="entity_index", action="store_false",
+                        help="Count identifiers instead of graph entity hits")
+    parser.add_argument("--output", default=None, help="Write the report to this JSON file")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
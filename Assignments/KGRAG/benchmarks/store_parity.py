@@ -0,0 +1,121 @@
+"""
+Check that the SQLite and Neo4j graph stores return the same results.
+
+Usage:
+    python -m benchmarks.store_parity --yes
+
+Both stores are loaded with the sample data through the GraphStore
+interface, then statistics, relationship lookups, expansion and search are
+compared. The Neo4j database is cleared first, hence ``--yes``. Exits with
+status 1 on any mismatch.
+"""
+
+import argparse
+import sys
+
+from rich.console import Console
+
+from knowledge_graph import Neo4jGraphStore, SQLiteGraphStore
+from .common import SAMPLE_FILES, load_chunks, populate_store, neo4j_settings
+from .graph_store import top_entities
+
+console = Console()
+
+
+def relationship_set(store, entity):
+    return {
+        (r["source"], r["relationship"], r["target"])
+        for r in store.iter_entity_relationships([entity])
+    }
+
+
+def relationship_page(store, entities, skip, limit):
+    return [
+        (r["entity"], r["source"], r["relationship"], r["target"])
+        for r in store.iter_entity_relationships(entities, skip=skip, limit=limit)
+    ]
+
+
+def neighbor_set(store, entity_uuids):
+    return {
+        (r["edge"]["source"], r["edge"]["relation"], r["edge"]["target"], r["edge"]["fact"])
+        for r in store.expand_hop(entity_uuids, [], 1000)
+    }
+
+
+def check_parity(sqlite_store, neo4j_store, chunks) -> list:
+    """
+    Load both stores and compare their answers.
+
+    Returns:
+        List of mismatch descriptions (empty when the stores agree)
+    """
+    failures = []
+    for store in (sqlite_store, neo4j_store):
+        store.clear()
+        populate_store(store, chunks, "parity")
+
+    sqlite_stats = sqlite_store.get_statistics()
+    neo4j_stats = neo4j_store.get_statistics()
+    if sqlite_stats != neo4j_stats:
+        failures.append(f"statistics: sqlite={sqlite_stats} neo4j={neo4j_stats}")
+
+    entities = top_entities(chunks)
+    for entity in entities:
+        if relationship_set(sqlite_store, entity) != relationship_set(neo4j_store, entity):
+            failures.append(f"relationships differ for {entity!r}")
+
+    for skip in (0, 5, 15):
+        if relationship_page(sqlite_store, entities, skip, 10) != relationship_page(neo4j_store, entities, skip, 10):
+            failures.append(f"relationship page at skip={skip} differs")
+
+    # uuids differ between stores, so compare expansions keyed by entity name
+    for entity in entities[:5]:
+        sqlite_uuids = [e["source_uuid"] for e in sqlite_store.iter_edges() if e["source_name"] == entity]
+        neo4j_uuids = [e["source_uuid"] for e in neo4j_store.iter_edges() if e["source_name"] == entity]
+        if neighbor_set(sqlite_store, sqlite_uuids[:1]) != neighbor_set(neo4j_store, neo4j_uuids[:1]):
+            failures.append(f"expand_hop differs for {entity!r}")
+
+    if bool(sqlite_store.search_facts(entities[0])) != bool(neo4j_store.search_facts(entities[0])):
+        failures.append(f"search_facts disagrees on whether {entities[0]!r} has facts")
+
+    for store in (sqlite_store, neo4j_store):
+        store.clear()
+        if store.get_statistics()["total_nodes"] != 0:
+            failures.append(f"{store.backend_name} not empty after clear")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--yes", action="store_true", help="Allow clearing the Neo4j database")
+    args = parser.parse_args()
+
+    settings = neo4j_settings()
+    if not settings:
+        console.print("[bold red]NEO4J_URI is not configured; nothing to compare against[/bold red]")
+        sys.exit(2)
+    if not args.yes:
+        console.print("[bold red]This clears the Neo4j database. Re-run with --yes to continue.[/bold red]")
+        sys.exit(2)
+
+    chunks = [chunk for path in SAMPLE_FILES for chunk in load_chunks(path)]
+    sqlite_store = SQLiteGraphStore(":memory:")
+    neo4j_store = Neo4jGraphStore(settings["uri"], settings["user"], settings["password"])
+    try:
+        failures = check_parity(sqlite_store, neo4j_store, chunks)
+    finally:
+        sqlite_store.close()
+        neo4j_store.close()
+
+    if failures:
+        console.print("[bold red]Parity check failed:[/bold red]")
+        for failure in failures:
+            console.print(f"  - {failure}")
+        sys.exit(1)
+    console.print("[bold green]✓ SQLite and Neo4j stores agree[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark time-windowed versus unwindowed lookups as the graph's history grows.
+
+Usage:
+    python -m benchmarks.time_window [--periods 24] [--backend sqlite|neo4j]
+
+Each period re-ingests the sample chunks (heuristic extraction, no LLM calls)
+stamped with that period's date, so the same facts pile up month after
+month like a documentation set revised over time. At growing history sizes
+the benchmark times search plus one expansion hop with no window, with
+``between`` covering the latest period and with ``as_of`` at the first
+period. The neo4j backend uses its own group, which is cleared before and
+after the run, and needs Graphiti's fulltext index (run demo.py once).
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from knowledge_graph import Neo4jGraphStore, SQLiteGraphStore
+from knowledge_graph.graph_store import time_window
+from .common import SAMPLE_FILES, load_chunks, populate_store, neo4j_settings
+from .graph_store import top_entities
+
+console = Console()
+
+PERIOD = timedelta(days=30)
+
+
+def windowed_lookup(store, queries: List[str], window: Optional[Dict[str, datetime]]) -> Dict[str, float]:
+    """Median search + one-hop expansion latency in milliseconds, and facts returned per query."""
+    latencies = []
+    facts = 0
+    for query in queries:
+        start = time.perf_counter()
+        edges = store.search_facts(query, 10, window)
+        seeds = list(dict.fromkeys(u for e in edges for u in (e["source_uuid"], e["target_uuid"])))
+        expanded = store.expand_hop(seeds, [], 10, window) if seeds else []
+        latencies.append((time.perf_counter() - start) * 1000)
+        facts += len(edges) + len(expanded)
+    return {"ms": statistics.median(latencies), "facts": facts / len(queries)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--periods", type=int, default=24, help="Monthly periods of history to ingest")
+    parser.add_argument("--backend", choices=["sqlite", "neo4j"], default="sqlite", help="Graph store to use")
+    args = parser.parse_args()
+
+    chunks = [chunk for path in SAMPLE_FILES for chunk in load_chunks(path)]
+    queries = top_entities(chunks, 10)
+
+    if args.backend == "neo4j":
+        settings = neo4j_settings()
+        if not settings:
+            console.print("[red]NEO4J_URI is not configured[/red]")
+            return
+        store = Neo4jGraphStore(**settings)
+        store.ensure_indexes()
+        group_id = "benchmark_time_window"
+    else:
+        store = SQLiteGraphStore(":memory:")
+        group_id = ""
+
+    origin = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    checkpoints = {n for n in (1, 2, 4, 8, 16, 32, 64, 128) if n <= args.periods} | {args.periods}
+    rows: List[Dict[str, Any]] = []
+    store.clear(group_id=group_id)
+    try:
+        for period in range(args.periods):
+            period_start = origin + period * PERIOD
+            populate_store(store, chunks, f"history_{period}", group_id, reference_time=period_start)
+            if period + 1 not in checkpoints:
+                continue
+
+            stats = store.get_statistics()
+            windows = {
+                "none": None,
+                "between": time_window(between=(period_start, period_start + PERIOD)),
+                "as_of": time_window(as_of=origin + PERIOD / 2)
+            }
+            row = {"periods": period + 1, "relationships": stats["total_relationships"]}
+            for name, window in windows.items():
+                row[name] = windowed_lookup(store, queries, window)
+            rows.append(row)
+    finally:
+        store.clear(group_id=group_id)
+        store.close()
+
+    table = Table(title=f"Windowed vs Unwindowed Lookups ({args.backend})", box=box.ROUNDED)
+    table.add_column("Periods", style="cyan")
+    table.add_column("Relationships", style="magenta")
+    table.add_column("No window", style="yellow")
+    table.add_column("between (latest period)", style="green")
+    table.add_column("as_of (first period)", style="green")
+    for row in rows:
+        table.add_row(
+            str(row["periods"]),
+            str(row["relationships"]),
+            *(f"{row[name]['ms']:.2f} ms ({row[name]['facts']:.0f} facts)" for name in ("none", "between", "as_of"))
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Headless command-line interface for the comparison demo (for cron and CI).
+
+Usage:
+    python cli.py [--documents PATH] build [--rebuild]
+    python cli.py query "QUESTION" [--system both|rag|kg] [--kg-mode search]
+    python cli.py suite --questions questions.jsonl [--concurrency 4] [--output results.jsonl]
+        [--rpm N] [--tpm N] [--max-retries 3]
+    python cli.py stats
+    python cli.py visualize [--output knowledge_graph.html] [--max-nodes 2000] [--sample degree|pagerank]
+    python cli.py visualize --ego NAME [NAME ...] [--hops 1] [--output-dir ego_networks] [--combined]
+
+Configuration comes from .env as for demo.py. Every command writes JSON
+lines to stdout, each with a "type" ("result" per question, then
+"summary", or "build", "stats", "visualize", "error"); progress and logs
+go to stderr. A suite reuses the same two systems for every question.
+``--questions`` takes one JSON object with a "question" field (or a JSON
+string, or plain text) per line, so labelled evaluation files work as is.
+
+Exit status: 0 on success, 1 if any question failed, 2 for setup errors
+(missing configuration or documents, empty graph).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Callable
+
+from comparison import compare_systems, visualize_graph, create_ego_networks, SuiteScheduler
+from comparison.scheduler import to_record
+from demo import DOCUMENT_PATH, setup_environment, start_systems, build_graph
+
+EXIT_FAILED = 1
+EXIT_SETUP = 2
+
+
+def load_questions(path: str) -> List[str]:
+    """
+    Read questions from a JSONL file.
+
+    Args:
+        path: File with one question per line: {"question": ...}, a JSON string or plain text
+
+    Returns:
+        List of questions
+    """
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                item = line
+            questions.append(item["question"] if isinstance(item, dict) else str(item))
+    return questions
+
+
+async def run(args, emit: Callable[[Dict[str, Any]], None]) -> int:
+    """
+    Run one command.
+
+    Args:
+        args: Parsed command-line arguments
+        emit: Writes one JSON record to stdout
+
+    Returns:
+        Exit status
+    """
+    if not setup_environment():
+        emit({"type": "error", "error": "Missing required environment variables"})
+        return EXIT_SETUP
+
+    doc_path = Path(args.documents)
+    if not doc_path.exists():
+        emit({"type": "error", "error": f"Documents not found: {doc_path}"})
+        return EXIT_SETUP
+
+    needs_rag = args.command in ("build", "query", "suite")
+    startup = time.perf_counter()
+    try:
+        rag_system, kg_system, stats, timings = await start_systems(doc_path, rag=needs_rag)
+    except Exception as e:
+        emit({"type": "error", "error": f"Startup failed: {type(e).__name__}: {e}"})
+        return EXIT_SETUP
+    startup_record = {"stages": timings, "wall": time.perf_counter() - startup}
+
+    try:
+        if args.command == "build":
+            if args.rebuild:
+                kg_system.clear_graph()
+                stats = kg_system.get_graph_statistics()
+            built = stats["total_nodes"] == 0
+            if built:
+                stats = await build_graph(rag_system, kg_system, doc_path)
+            emit({"type": "build", "graph_built": built, "stats": stats, "startup": startup_record})
+            return 0
+
+        if args.command == "stats":
+            emit({"type": "stats", **stats, "startup": startup_record})
+            return 0
+
+        if args.command == "visualize":
+            if kg_system.backend != "neo4j":
+                emit({"type": "error", "error": f"Visualization reads from Neo4j, not the {kg_system.backend} backend"})
+                return EXIT_SETUP
+            credentials = (os.getenv("NEO4J_URI"), os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
+            if args.ego:
+                report = create_ego_networks(
+                    *credentials, args.ego, output_dir=args.output_dir, hops=args.hops, combined=args.combined
+                )
+                emit({"type": "visualize", "kind": "ego", **report})
+            else:
+                mirror = kg_system.enable_mirror() if args.sample == "pagerank" else None
+                report = visualize_graph(
+                    *credentials, output_file=args.output, max_nodes=args.max_nodes, sample=args.sample, mirror=mirror
+                )
+                emit({"type": "visualize", "kind": "graph", "file": args.output, "timings": report})
+            return 0
+
+        if stats["total_nodes"] == 0:
+            emit({"type": "error", "error": "The knowledge graph is empty; run `python cli.py build` first"})
+            return EXIT_SETUP
+
+        if args.command == "query":
+            result = await query_one(rag_system, kg_system, args.question, args.system, args.kg_mode)
+            emit({"type": "result", **result})
+            return EXIT_FAILED if result.get("errors") else 0
+
+        # suite
+        questions = load_questions(args.questions)
+        model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+        limits = {key: value for key, value in (("rpm", args.rpm), ("tpm", args.tpm)) if value}
+        scheduler = SuiteScheduler(
+            max_concurrency=args.concurrency,
+            rate_limits={model: limits} if limits else None,
+            models=[model, model],
+            max_retries=args.max_retries,
+            output_path=args.output
+        )
+
+        async def job(question: str) -> Dict[str, Any]:
+            return await compare_systems(rag_system, kg_system, question, verbose=False)
+
+        suite = await scheduler.run(questions, job, on_result=lambda record: emit({"type": "result", **record}))
+        emit({"type": "summary", **suite["summary"], "startup": startup_record})
+        return EXIT_FAILED if suite["summary"]["failed"] else 0
+    finally:
+        kg_system.close()
+
+
+async def query_one(rag_system, kg_system, question: str, system: str, kg_mode: str) -> Dict[str, Any]:
+    """
+    Ask one question of one or both systems.
+
+    Args:
+        rag_system: TraditionalRAG instance
+        kg_system: KnowledgeGraphRAG instance
+        question: Question to ask
+        system: "both" (a full comparison), "rag" or "kg"
+        kg_mode: Knowledge graph retrieval mode when ``system`` is "kg"
+
+    Returns:
+        JSON-serializable result with an "errors" dictionary
+    """
+    if system == "both":
+        return to_record(await compare_systems(rag_system, kg_system, question, verbose=False))
+
+    try:
+        if system == "rag":
+            result = await asyncio.to_thread(rag_system.query, question)
+        else:
+            result = await kg_system.query(question, mode=kg_mode)
+        errors = {}
+    except Exception as e:
+        result, errors = None, {system: f"{type(e).__name__}: {e}"}
+    return to_record({"question": question, "system": system, f"{system}_result": result, "errors": errors})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", default=DOCUMENT_PATH, help="Document the RAG index and graph are built from")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build (or load) the RAG index and the knowledge graph")
+    build_parser.add_argument("--rebuild", action="store_true", help="Clear the knowledge graph and build it again")
+
+    query_parser = subparsers.add_parser("query", help="Ask one question")
+    query_parser.add_argument("question", help="Question to ask")
+    query_parser.add_argument("--system", choices=["both", "rag", "kg"], default="both", help="System(s) to ask")
+    query_parser.add_argument("--kg-mode", default="search", help="Knowledge graph retrieval mode (--system kg)")
+
+    suite_parser = subparsers.add_parser("suite", help="Compare both systems on every question in a file")
+    suite_parser.add_argument("--questions", required=True, help="JSONL file of questions")
+    suite_parser.add_argument("--concurrency", type=int, default=4, help="Questions in flight at once")
+    suite_parser.add_argument("--output", help="Also append results to this JSONL file (rerun to resume)")
+    suite_parser.add_argument("--rpm", type=int, help="Requests-per-minute limit of the model")
+    suite_parser.add_argument("--tpm", type=int, help="Tokens-per-minute limit of the model")
+    suite_parser.add_argument("--max-retries", type=int, default=3, help="Retries per question for transient errors")
+
+    subparsers.add_parser("stats", help="Print knowledge graph statistics")
+
+    visualize_parser = subparsers.add_parser("visualize", help="Write the graph viewer or ego-network diagrams")
+    visualize_parser.add_argument("--output", default="knowledge_graph.html", help="Graph viewer HTML file")
+    visualize_parser.add_argument("--max-nodes", type=int, default=2000, help="Entities to sample")
+    visualize_parser.add_argument("--sample", choices=["degree", "pagerank"], default="degree", help="Sampling method")
+    visualize_parser.add_argument("--ego", nargs="+", help="Diagram the ego networks of these entities instead")
+    visualize_parser.add_argument("--hops", type=int, default=1, help="Ego network radius")
+    visualize_parser.add_argument("--output-dir", default="ego_networks", help="Directory for ego-network files")
+    visualize_parser.add_argument("--combined", action="store_true", help="One file for all ego networks")
+    args = parser.parse_args()
+
+    # Records go to stdout; everything the systems print goes to stderr
+    stdout = sys.stdout
+
+    def emit(record: Dict[str, Any]) -> None:
+        stdout.write(json.dumps(record, default=str) + "\n")
+        stdout.flush()
+
+    with contextlib.redirect_stdout(sys.stderr):
+        status = asyncio.run(run(args, emit))
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
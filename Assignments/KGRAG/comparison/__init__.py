@@ -1,11 +1,27 @@
 """Comparison tools for Traditional RAG vs Knowledge Graph RAG."""
 
 from .compare import compare_systems, run_comparison_suite
-from .visualize import visualize_graph, plot_comparison_metrics
+from .scheduler import SuiteScheduler, RateLimiter
+from .benchmark import run_benchmark, compare_to_baseline
+from .evaluation import load_labels, ranking_metrics, run_sweep, plot_pareto
+from .router import QueryRouter, evaluate_router
+from .visualize import visualize_graph, plot_comparison_metrics, plot_benchmark_distributions, create_ego_networks
 
 __all__ = [
     'compare_systems',
     'run_comparison_suite',
+    'SuiteScheduler',
+    'RateLimiter',
+    'run_benchmark',
+    'compare_to_baseline',
+    'load_labels',
+    'ranking_metrics',
+    'run_sweep',
+    'plot_pareto',
+    'QueryRouter',
+    'evaluate_router',
     'visualize_graph',
-    'plot_comparison_metrics'
+    'plot_comparison_metrics',
+    'plot_benchmark_distributions',
+    'create_ego_networks'
 ]
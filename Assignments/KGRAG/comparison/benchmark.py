@@ -0,0 +1,541 @@
+"""
+Latency benchmark harness for Traditional RAG vs Knowledge Graph RAG.
+
+Usage:
+    python -m comparison.benchmark run [--trials 5] [--warmup 2] [--output results/benchmark]
+        [--cassette cassettes/bench.jsonl --cassette-mode record|replay --latency recorded|sampled|zero]
+    python -m comparison.benchmark compare-to-baseline BASELINE.json CURRENT.json [--threshold 0.05]
+    python -m comparison.benchmark plot RESULTS.json [--output results/plots] [--format png svg] [--workers 4]
+
+``run`` queries both systems (built from .env as demo.py does, on the graph
+that is already built) with every question for ``--trials`` rounds after
+``--warmup`` untimed queries, alternating which system goes first. It
+reports p50/p90/p99 per system and the median speedup with a bootstrap
+confidence interval, and writes BASE.json (environment, config, samples,
+summary) and BASE.csv (one row per sample). With ``--cassette`` the OpenAI
+calls go through the record/replay server (comparison.replay); replaying
+with ``--latency zero`` and KG_BACKEND=sqlite measures the local retrieval,
+packing and parsing paths with no network at all.
+
+``compare-to-baseline`` compares two JSON results and exits with status 1
+when a system's median latency regressed by more than ``--threshold`` with
+the whole confidence interval above it.
+
+``plot`` renders latency CDFs, violin plots, per-stage timing, generation
+throughput and per-question panels from a results JSON (see
+comparison.visualize.plot_benchmark_distributions).
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from .replay import start_replay_server, LATENCY_MODES
+
+console = Console()
+
+SYSTEMS = ("rag", "kg")
+SYSTEM_NAMES = {"rag": "Traditional RAG", "kg": "Knowledge Graph RAG"}
+SAMPLE_FIELDS = [
+    "trial", "question_index", "question", "system", "seconds",
+    "retrieval_seconds", "generation_seconds", "answer_tokens", "error"
+]
+PACKAGES = ("langchain", "langchain-openai", "openai", "graphiti-core", "neo4j", "faiss-cpu", "numpy")
+
+
+def environment_metadata(rag_system=None, kg_system=None) -> Dict[str, Any]:
+    """
+    Describe where a benchmark ran, so results from different machines or commits are not mixed up.
+
+    Args:
+        rag_system: TraditionalRAG instance (for its model names)
+        kg_system: KnowledgeGraphRAG instance (for its model and backend)
+
+    Returns:
+        Dictionary with timestamp, host, platform, Python, package versions,
+        git commit and system configuration
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": sys.version.split()[0],
+        "packages": packages,
+        "git_commit": commit,
+        "rag_model": getattr(rag_system, "model_name", None),
+        "embedding_model": getattr(rag_system, "embedding_model", None),
+        "kg_model": getattr(kg_system, "model_name", None),
+        "kg_backend": getattr(kg_system, "backend", None)
+    }
+
+
+def bootstrap_ratio(
+    numerator: np.ndarray,
+    denominator: np.ndarray,
+    paired: bool = True,
+    n_resamples: int = 5000,
+    confidence: float = 0.95,
+    seed: int = 0
+) -> Tuple[float, float, float]:
+    """
+    Ratio of medians with a percentile bootstrap confidence interval.
+
+    Args:
+        numerator: Samples of the numerator
+        denominator: Samples of the denominator
+        paired: Resample both arrays with the same indices (same question and
+            trial); otherwise resample them independently
+        n_resamples: Bootstrap resamples
+        confidence: Confidence level of the interval
+        seed: Random seed, so reruns give the same interval
+
+    Returns:
+        (ratio, low, high)
+    """
+    rng = np.random.default_rng(seed)
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    idx_n = rng.integers(0, len(numerator), (n_resamples, len(numerator)))
+    idx_d = idx_n if paired else rng.integers(0, len(denominator), (n_resamples, len(denominator)))
+    ratios = np.median(numerator[idx_n], axis=1) / np.median(denominator[idx_d], axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(ratios, [alpha, 1 - alpha])
+    return float(np.median(numerator) / np.median(denominator)), float(low), float(high)
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    """Count, mean, standard deviation and p50/p90/p99/min/max of latencies in seconds."""
+    values = np.asarray(seconds, dtype=float)
+    if len(values) == 0:
+        return {"n": 0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "n": int(len(values)),
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "min": float(values.min()),
+        "max": float(values.max())
+    }
+
+
+async def _timed_query(system: str, rag_system, kg_system, question: str, kg_mode: str) -> Dict[str, Any]:
+    """Query one system, returning its client-side latency, stage times, answer tokens and any error."""
+    start = time.perf_counter()
+    metrics = {}
+    try:
+        if system == "rag":
+            result = await asyncio.to_thread(rag_system.query, question)
+        else:
+            result = await kg_system.query(question, mode=kg_mode)
+        metrics = result.get("metrics", {})
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "seconds": time.perf_counter() - start,
+        "retrieval_seconds": metrics.get("retrieval_time"),
+        "generation_seconds": metrics.get("generation_time"),
+        "answer_tokens": metrics.get("answer_tokens"),
+        "error": error
+    }
+
+
+async def run_benchmark(
+    rag_system,
+    kg_system,
+    questions: List[str],
+    trials: int = 5,
+    warmup: int = 2,
+    kg_mode: str = "search",
+    n_resamples: int = 5000,
+    confidence: float = 0.95
+) -> Dict[str, Any]:
+    """
+    Measure both systems' query latency over repeated trials.
+
+    Systems are queried one at a time so they do not contend. The system
+    that goes first alternates per question and trial to cancel ordering
+    effects (warm caches, connection reuse).
+
+    Args:
+        rag_system: TraditionalRAG instance
+        kg_system: KnowledgeGraphRAG instance
+        questions: Questions to ask
+        trials: Timed rounds over all questions
+        warmup: Untimed queries per system before the first trial
+        kg_mode: Retrieval mode for the knowledge graph queries
+        n_resamples: Bootstrap resamples for the speedup interval
+        confidence: Confidence level of the interval
+
+    Returns:
+        Dictionary with environment, config, samples and summary
+    """
+    console.print(f"[yellow]Warming up ({warmup} queries per system)...[/yellow]")
+    for i in range(warmup):
+        question = questions[i % len(questions)]
+        for system in SYSTEMS:
+            await _timed_query(system, rag_system, kg_system, question, kg_mode)
+
+    samples = []
+    for trial in range(trials):
+        console.print(f"[yellow]Trial {trial + 1}/{trials}...[/yellow]")
+        for index, question in enumerate(questions):
+            order = SYSTEMS if (trial + index) % 2 == 0 else SYSTEMS[::-1]
+            for system in order:
+                sample = await _timed_query(system, rag_system, kg_system, question, kg_mode)
+                samples.append({"trial": trial, "question_index": index, "question": question, "system": system, **sample})
+
+    results = {
+        "environment": environment_metadata(rag_system, kg_system),
+        "config": {
+            "trials": trials,
+            "warmup": warmup,
+            "kg_mode": kg_mode,
+            "questions": len(questions),
+            "n_resamples": n_resamples,
+            "confidence": confidence
+        },
+        "samples": samples
+    }
+    results["summary"] = summarize(samples, n_resamples, confidence)
+    return results
+
+
+def summarize(samples: List[Dict[str, Any]], n_resamples: int = 5000, confidence: float = 0.95) -> Dict[str, Any]:
+    """
+    Summarize benchmark samples.
+
+    Args:
+        samples: Samples from run_benchmark
+        n_resamples: Bootstrap resamples
+        confidence: Confidence level of the speedup interval
+
+    Returns:
+        Dictionary with per-system latency summaries and error counts, and
+        the KG speedup (RAG median / KG median) with its interval, computed
+        over (question, trial) pairs where both systems succeeded
+    """
+    summary: Dict[str, Any] = {}
+    ok: Dict[str, Dict[Tuple[int, int], float]] = {system: {} for system in SYSTEMS}
+    for system in SYSTEMS:
+        rows = [s for s in samples if s["system"] == system]
+        for s in rows:
+            if not s["error"]:
+                ok[system][(s["question_index"], s["trial"])] = s["seconds"]
+        summary[system] = {**latency_summary(list(ok[system].values())), "errors": sum(1 for s in rows if s["error"])}
+
+    pairs = sorted(set(ok["rag"]) & set(ok["kg"]))
+    if len(pairs) >= 2:
+        ratio, low, high = bootstrap_ratio(
+            [ok["rag"][p] for p in pairs], [ok["kg"][p] for p in pairs],
+            paired=True, n_resamples=n_resamples, confidence=confidence
+        )
+        summary["speedup"] = {"kg_vs_rag": ratio, "low": low, "high": high, "pairs": len(pairs)}
+    return summary
+
+
+def export_results(results: Dict[str, Any], base_path: str) -> Tuple[str, str]:
+    """
+    Write benchmark results to BASE.json and the samples to BASE.csv.
+
+    Args:
+        results: Results from run_benchmark
+        base_path: Output path without extension
+
+    Returns:
+        (json_path, csv_path)
+    """
+    base = Path(base_path)
+    base.parent.mkdir(parents=True, exist_ok=True)
+    json_path, csv_path = base.with_suffix(".json"), base.with_suffix(".csv")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SAMPLE_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results["samples"])
+    return str(json_path), str(csv_path)
+
+
+def display_benchmark(results: Dict[str, Any]) -> None:
+    """
+    Display latency percentiles and the speedup interval.
+
+    Args:
+        results: Results from run_benchmark (or a loaded JSON file)
+    """
+    summary = results["summary"]
+    config = results["config"]
+    table = Table(
+        title=f"Query Latency ({config['trials']} trials x {config['questions']} questions)",
+        box=box.ROUNDED
+    )
+    table.add_column("Metric", style="cyan")
+    table.add_column("Traditional RAG", style="blue")
+    table.add_column("Knowledge Graph RAG", style="magenta")
+    for key in ("p50", "p90", "p99", "mean", "std"):
+        table.add_row(key, *(f"{summary[s][key]:.2f}s" if key in summary[s] else "-" for s in SYSTEMS))
+    table.add_row("samples", *(str(summary[s]["n"]) for s in SYSTEMS))
+    table.add_row("errors", *(str(summary[s]["errors"]) for s in SYSTEMS))
+    console.print(table)
+
+    speedup = summary.get("speedup")
+    if speedup is None:
+        console.print("[red]Not enough successful pairs to estimate a speedup[/red]")
+        return
+    level = int(config["confidence"] * 100)
+    interval = f"{level}% CI [{speedup['low']:.2f}x, {speedup['high']:.2f}x]"
+    if speedup["low"] > 1:
+        verdict = f"[bold green]KG is faster: {speedup['kg_vs_rag']:.2f}x ({interval})[/bold green]"
+    elif speedup["high"] < 1:
+        verdict = f"[bold]RAG is faster: KG speedup {speedup['kg_vs_rag']:.2f}x ({interval})[/bold]"
+    else:
+        verdict = f"[yellow]No significant difference: KG speedup {speedup['kg_vs_rag']:.2f}x ({interval})[/yellow]"
+    console.print(f"\n{verdict}")
+
+
+def compare_to_baseline(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.05,
+    n_resamples: int = 5000,
+    confidence: float = 0.95
+) -> Dict[str, Any]:
+    """
+    Compare two benchmark results for latency regressions.
+
+    A system regressed when the lower bound of the bootstrap interval of
+    current median / baseline median is above 1 + threshold: the slowdown is
+    both larger than the threshold and unlikely to be noise.
+
+    Args:
+        baseline: Baseline results (loaded JSON)
+        current: Current results (loaded JSON)
+        threshold: Smallest relative slowdown treated as a regression
+        n_resamples: Bootstrap resamples
+        confidence: Confidence level of the interval
+
+    Returns:
+        Dictionary with one row per system (ratio, low, high, regressed)
+        and regressed (True if any system regressed)
+    """
+    rows = {}
+    for system in SYSTEMS:
+        before = [s["seconds"] for s in baseline["samples"] if s["system"] == system and not s["error"]]
+        after = [s["seconds"] for s in current["samples"] if s["system"] == system and not s["error"]]
+        if len(before) < 2 or len(after) < 2:
+            rows[system] = None
+            continue
+        ratio, low, high = bootstrap_ratio(after, before, paired=False, n_resamples=n_resamples, confidence=confidence)
+        rows[system] = {
+            "baseline_p50": float(np.median(before)),
+            "current_p50": float(np.median(after)),
+            "ratio": ratio,
+            "low": low,
+            "high": high,
+            "regressed": low > 1 + threshold,
+            "improved": high < 1 - threshold
+        }
+    return {"systems": rows, "regressed": any(row and row["regressed"] for row in rows.values())}
+
+
+def display_baseline_comparison(comparison: Dict[str, Any], confidence: float = 0.95) -> None:
+    """
+    Display the result of compare_to_baseline.
+
+    Args:
+        comparison: Dictionary from compare_to_baseline
+        confidence: Confidence level used, for the column header
+    """
+    table = Table(title="Current vs Baseline (median latency)", box=box.ROUNDED)
+    table.add_column("System", style="cyan")
+    table.add_column("Baseline p50", style="yellow")
+    table.add_column("Current p50", style="yellow")
+    table.add_column(f"Ratio ({int(confidence * 100)}% CI)", style="magenta")
+    table.add_column("Verdict", style="green")
+    for system, row in comparison["systems"].items():
+        if row is None:
+            table.add_row(SYSTEM_NAMES[system], "-", "-", "-", "not enough samples")
+            continue
+        if row["regressed"]:
+            verdict = "[red]regression[/red]"
+        elif row["improved"]:
+            verdict = "[green]improvement[/green]"
+        else:
+            verdict = "no significant change"
+        table.add_row(
+            SYSTEM_NAMES[system],
+            f"{row['baseline_p50']:.2f}s",
+            f"{row['current_p50']:.2f}s",
+            f"{row['ratio']:.2f}x [{row['low']:.2f}, {row['high']:.2f}]",
+            verdict
+        )
+    console.print(table)
+
+
+async def run(args) -> None:
+    from dotenv import load_dotenv
+    from traditional_rag import TraditionalRAG
+    from knowledge_graph import KnowledgeGraphRAG
+    from demo import DEMO_QUESTIONS
+
+    load_dotenv()
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    model_name = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+    base_url = os.getenv("OPENAI_BASE_URL")
+
+    replay_server = None
+    if args.cassette:
+        replay_server = start_replay_server(args.cassette, args.cassette_mode, args.latency)
+        base_url = replay_server.url
+        # The replay server ignores the key, but the clients require one
+        openai_api_key = openai_api_key or "offline"
+
+    if args.questions:
+        with open(args.questions, "r", encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+    else:
+        questions = DEMO_QUESTIONS
+
+    try:
+        rag_system = TraditionalRAG(
+            openai_api_key=openai_api_key,
+            model_name=model_name,
+            embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+            base_url=base_url
+        )
+        rag_system.build_index(rag_system.load_documents(args.documents))
+
+        kg_system = KnowledgeGraphRAG(
+            neo4j_uri=os.getenv("NEO4J_URI"),
+            neo4j_user=os.getenv("NEO4J_USERNAME"),
+            neo4j_password=os.getenv("NEO4J_PASSWORD"),
+            openai_api_key=openai_api_key,
+            model_name=model_name,
+            backend=os.getenv("KG_BACKEND", "neo4j"),
+            sqlite_path=os.getenv("KG_SQLITE_PATH", "knowledge_graph.db"),
+            base_url=base_url
+        )
+
+        try:
+            results = await run_benchmark(
+                rag_system, kg_system, questions,
+                trials=args.trials, warmup=args.warmup, kg_mode=args.kg_mode, confidence=args.confidence
+            )
+        finally:
+            kg_system.close()
+    finally:
+        if replay_server is not None:
+            replay_server.shutdown()
+            console.print(f"[dim]Replay server: {replay_server.counts}[/dim]")
+
+    if replay_server is not None:
+        results["config"]["cassette"] = {
+            "path": args.cassette,
+            "mode": args.cassette_mode,
+            "latency": args.latency,
+            **replay_server.counts
+        }
+
+    display_benchmark(results)
+    json_path, csv_path = export_results(results, args.output)
+    console.print(f"\n[green]Results saved to: {json_path} and {csv_path}[/green]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Benchmark both systems")
+    run_parser.add_argument("--trials", type=int, default=5, help="Timed rounds over all questions")
+    run_parser.add_argument("--warmup", type=int, default=2, help="Untimed queries per system before timing")
+    run_parser.add_argument("--questions", help="File with one question per line (default: the demo questions)")
+    run_parser.add_argument("--documents", default="sample_data/py_best_practice.txt", help="Documents for the RAG index")
+    run_parser.add_argument("--kg-mode", default="search", help="Knowledge graph retrieval mode")
+    run_parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    run_parser.add_argument("--output", default="results/benchmark", help="Output path without extension")
+    run_parser.add_argument("--cassette", help="Record/replay the OpenAI calls with this cassette file")
+    run_parser.add_argument("--cassette-mode", choices=["record", "replay"], default="replay", help="Cassette mode")
+    run_parser.add_argument("--latency", choices=LATENCY_MODES, default="recorded", help="Replay delay")
+
+    compare_parser = subparsers.add_parser("compare-to-baseline", help="Fail on a significant latency regression")
+    compare_parser.add_argument("baseline", help="Baseline results JSON")
+    compare_parser.add_argument("current", help="Current results JSON")
+    compare_parser.add_argument("--threshold", type=float, default=0.05, help="Smallest relative slowdown that counts")
+    compare_parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+
+    plot_parser = subparsers.add_parser("plot", help="Plot latency distributions from a results JSON")
+    plot_parser.add_argument("results", help="Results JSON from run")
+    plot_parser.add_argument("--output", default="results/plots", help="Output directory")
+    plot_parser.add_argument("--format", nargs="+", choices=["png", "svg", "pdf"], default=["png"], help="File formats")
+    plot_parser.add_argument("--workers", type=int, help="Rendering processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        asyncio.run(run(args))
+        return
+
+    if args.command == "plot":
+        from .visualize import plot_benchmark_distributions
+
+        with open(args.results, "r", encoding="utf-8") as f:
+            results = json.load(f)
+        manifest = plot_benchmark_distributions(results, args.output, tuple(args.format), args.workers)
+        console.print(f"[green]Manifest: {Path(args.output) / 'manifest.json'} "
+                      f"({len(manifest.get('artifacts', {}))} files)[/green]")
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+    for label, env in (("baseline", baseline["environment"]), ("current", current["environment"])):
+        console.print(f"[dim]{label}: commit {env.get('git_commit')} on {env.get('host')} ({env.get('timestamp')})[/dim]")
+    if baseline["environment"].get("host") != current["environment"].get("host"):
+        console.print("[yellow]Warning: results come from different hosts[/yellow]")
+
+    comparison = compare_to_baseline(baseline, current, args.threshold, confidence=args.confidence)
+    display_baseline_comparison(comparison, args.confidence)
+    if comparison["regressed"]:
+        console.print("[bold red]Significant latency regression[/bold red]")
+        sys.exit(1)
+    console.print("[green]No significant regression[/green]")
+
+
+if __name__ == "__main__":
+    main()
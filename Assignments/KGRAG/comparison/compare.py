@@ -1,56 +1,104 @@
 """Comparison module for Traditional RAG vs Knowledge Graph RAG."""
 
 import asyncio
-from typing import Dict, Any, List, Tuple
+import time
+from typing import Dict, Any, List, Tuple, Optional, Callable, Awaitable
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import box
 
+from .scheduler import SuiteScheduler, display_suite_summary, percentile
+
 console = Console()
 
 
+async def _run_timed(call: Callable[[], Awaitable[Dict[str, Any]]], origin: float) -> Dict[str, Any]:
+    """Await a system's query, recording start/end offsets and any error instead of raising."""
+    started = time.perf_counter() - origin
+    try:
+        result, error = await call(), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return {"result": result, "error": error, "start": started, "end": time.perf_counter() - origin}
+
+
 async def compare_systems(
     rag_system,
     kg_system,
     question: str,
-    verbose: bool = True
+    verbose: bool = True,
+    concurrent: bool = True
 ) -> Dict[str, Any]:
     """
     Compare Traditional RAG and Knowledge Graph RAG on a single question.
 
+    Both systems are queried at the same time: the synchronous RAG query
+    runs in a worker thread while the knowledge graph query runs on the
+    event loop. A failure in one system is recorded in ``errors`` and the
+    other system's result is kept.
+
     Args:
         rag_system: TraditionalRAG instance
         kg_system: KnowledgeGraphRAG instance
         question: Question to ask both systems
         verbose: Whether to print detailed comparison
+        concurrent: Set to False to query the systems one after the other
+            (uncontended per-system latency)
 
     Returns:
-        Dictionary with results from both systems and comparison
+        Dictionary with results from both systems (None for a system that
+        failed), errors and comparison metrics. rag_time/kg_time are the
+        systems' own query times; wall_time, rag_elapsed, kg_elapsed and
+        overlap are measured around the calls.
     """
     console.print(f"\n[bold cyan]Comparing systems on question:[/bold cyan] {question}\n")
 
-    # Query Traditional RAG
-    console.print("[yellow]Querying Traditional RAG...[/yellow]")
-    rag_result = rag_system.query(question)
+    def query_rag():
+        return asyncio.to_thread(rag_system.query, question)
 
-    # Query Knowledge Graph RAG
-    console.print("[yellow]Querying Knowledge Graph RAG...[/yellow]")
-    kg_result = await kg_system.query(question)
+    def query_kg():
+        return kg_system.query(question)
+
+    origin = time.perf_counter()
+    if concurrent:
+        console.print("[yellow]Querying Traditional RAG and Knowledge Graph RAG concurrently...[/yellow]")
+        rag_run, kg_run = await asyncio.gather(_run_timed(query_rag, origin), _run_timed(query_kg, origin))
+    else:
+        console.print("[yellow]Querying Traditional RAG...[/yellow]")
+        rag_run = await _run_timed(query_rag, origin)
+        console.print("[yellow]Querying Knowledge Graph RAG...[/yellow]")
+        kg_run = await _run_timed(query_kg, origin)
+    wall_time = time.perf_counter() - origin
+
+    rag_result, kg_result = rag_run["result"], kg_run["result"]
+    errors = {name: run["error"] for name, run in (("rag", rag_run), ("kg", kg_run)) if run["error"]}
+    for name, error in errors.items():
+        console.print(f"[red]{'Traditional RAG' if name == 'rag' else 'Knowledge Graph RAG'} failed: {error}[/red]")
+
+    rag_metrics = rag_result["metrics"] if rag_result else {}
+    kg_metrics = kg_result["metrics"] if kg_result else {}
+    rag_time = rag_metrics.get("query_time")
+    kg_time = kg_metrics.get("query_time")
 
     # Prepare comparison
     comparison = {
         "question": question,
         "rag_result": rag_result,
         "kg_result": kg_result,
+        "errors": errors,
         "comparison_metrics": {
-            "speedup": rag_result['metrics']['query_time'] / kg_result['metrics']['query_time'],
-            "rag_time": rag_result['metrics']['query_time'],
-            "kg_time": kg_result['metrics']['query_time'],
-            "rag_sources": rag_result['metrics']['num_source_chunks'],
-            "kg_facts": kg_result['metrics']['num_facts'],
-            "kg_entities": kg_result['metrics']['num_entities'],
-            "kg_relationships": kg_result['metrics']['num_relationships']
+            "speedup": rag_time / kg_time if rag_time and kg_time else None,
+            "rag_time": rag_time,
+            "kg_time": kg_time,
+            "rag_sources": rag_metrics.get("num_source_chunks"),
+            "kg_facts": kg_metrics.get("num_facts"),
+            "kg_entities": kg_metrics.get("num_entities"),
+            "kg_relationships": kg_metrics.get("num_relationships"),
+            "wall_time": wall_time,
+            "rag_elapsed": rag_run["end"] - rag_run["start"],
+            "kg_elapsed": kg_run["end"] - kg_run["start"],
+            "overlap": max(0.0, min(rag_run["end"], kg_run["end"]) - max(rag_run["start"], kg_run["start"]))
         }
     }
 
@@ -75,11 +123,30 @@ def display_comparison(comparison: Dict[str, Any]) -> None:
     console.print(f"\n[bold]Question:[/bold] {comparison['question']}")
 
     # Answers comparison
+    errors = comparison.get('errors', {})
     console.print("\n[bold cyan]Traditional RAG Answer:[/bold cyan]")
-    console.print(Panel(comparison['rag_result']['answer'], border_style="blue"))
+    if comparison['rag_result']:
+        console.print(Panel(comparison['rag_result']['answer'], border_style="blue"))
+    else:
+        console.print(Panel(f"Query failed: {errors.get('rag')}", border_style="red"))
 
     console.print("\n[bold magenta]Knowledge Graph RAG Answer:[/bold magenta]")
-    console.print(Panel(comparison['kg_result']['answer'], border_style="magenta"))
+    if comparison['kg_result']:
+        console.print(Panel(comparison['kg_result']['answer'], border_style="magenta"))
+    else:
+        console.print(Panel(f"Query failed: {errors.get('kg')}", border_style="red"))
+
+    metrics = comparison['comparison_metrics']
+    if 'wall_time' in metrics:
+        console.print(
+            f"\n[dim]Wall time {metrics['wall_time']:.2f}s "
+            f"(RAG {metrics['rag_elapsed']:.2f}s, KG {metrics['kg_elapsed']:.2f}s, "
+            f"overlap {metrics['overlap']:.2f}s)[/dim]"
+        )
+
+    if errors:
+        # Per-system metrics are not comparable when one side failed
+        return
 
     # Metrics table
     table = Table(title="Performance Metrics", box=box.ROUNDED, show_header=True)
@@ -147,31 +214,56 @@ def display_comparison(comparison: Dict[str, Any]) -> None:
 async def run_comparison_suite(
     rag_system,
     kg_system,
-    questions: List[str]
+    questions: List[str],
+    max_concurrency: int = 4,
+    rate_limits: Optional[Dict[str, Dict[str, int]]] = None,
+    output_path: Optional[str] = None,
+    max_retries: int = 3,
+    tokens_per_request: int = 2500
 ) -> List[Dict[str, Any]]:
     """
     Run a suite of comparison tests.
 
+    Questions run concurrently (see SuiteScheduler), paced against the
+    rate limits of both systems' models. Questions failing with transient
+    errors (rate limits, timeouts, connection errors) are retried.
+
     Args:
         rag_system: TraditionalRAG instance
         kg_system: KnowledgeGraphRAG instance
         questions: List of questions to test
+        max_concurrency: Questions in flight at once
+        rate_limits: Mapping of model name to {"rpm": ..., "tpm": ...},
+            e.g. {"gpt-4-turbo-preview": {"rpm": 500, "tpm": 30000}}
+        output_path: JSONL file results are streamed to; rerunning with the
+            same file resumes an interrupted suite
+        max_retries: Retries per question for transient failures
+        tokens_per_request: Estimated tokens per LLM request, for the TPM budget
 
     Returns:
-        List of comparison results
+        List of comparison results, in question order
     """
     console.print("\n[bold green]Running Comparison Suite[/bold green]")
-    console.print(f"Testing {len(questions)} questions...\n")
+    console.print(f"Testing {len(questions)} questions, up to {max_concurrency} at a time...\n")
+
+    scheduler = SuiteScheduler(
+        max_concurrency=max_concurrency,
+        rate_limits=rate_limits,
+        models=[getattr(rag_system, "model_name", None), getattr(kg_system, "model_name", None)],
+        tokens_per_request=tokens_per_request,
+        max_retries=max_retries,
+        output_path=output_path
+    )
+
+    async def job(question: str) -> Dict[str, Any]:
+        return await compare_systems(rag_system, kg_system, question, verbose=False)
 
-    results = []
-    for i, question in enumerate(questions, 1):
-        console.print(f"[bold]Test {i}/{len(questions)}[/bold]")
-        result = await compare_systems(rag_system, kg_system, question, verbose=False)
-        results.append(result)
-        console.print("[green]✓ Complete[/green]\n")
+    suite = await scheduler.run(questions, job)
+    results = suite["results"]
 
     # Summary statistics
     display_summary_statistics(results)
+    display_suite_summary(suite["summary"])
 
     return results
 
@@ -187,6 +279,14 @@ def display_summary_statistics(results: List[Dict[str, Any]]) -> None:
     console.print("[bold green]SUMMARY STATISTICS[/bold green]")
     console.print("=" * 100 + "\n")
 
+    # Only questions both systems answered are comparable
+    failed = [r for r in results if r.get('errors')]
+    results = [r for r in results if not r.get('errors')]
+    if failed:
+        console.print(f"[red]{len(failed)} question(s) had a failed system and are excluded from the averages[/red]\n")
+    if not results:
+        return
+
     # Calculate averages
     avg_rag_time = sum(r['comparison_metrics']['rag_time'] for r in results) / len(results)
     avg_kg_time = sum(r['comparison_metrics']['kg_time'] for r in results) / len(results)
@@ -202,12 +302,27 @@ def display_summary_statistics(results: List[Dict[str, Any]]) -> None:
     table.add_column("Knowledge Graph RAG", style="magenta")
 
     table.add_row("Avg Query Time", f"{avg_rag_time:.2f}s", f"{avg_kg_time:.2f}s")
+    table.add_row(
+        "P90 Query Time",
+        f"{percentile([r['comparison_metrics']['rag_time'] for r in results], 90):.2f}s",
+        f"{percentile([r['comparison_metrics']['kg_time'] for r in results], 90):.2f}s"
+    )
     table.add_row("Avg Retrieved Items", f"{avg_rag_sources:.1f} chunks", f"{avg_kg_facts:.1f} facts")
     table.add_row("Avg Entities", "N/A", f"{avg_kg_entities:.1f}")
     table.add_row("Avg Relationships", "N/A", f"{avg_kg_relationships:.1f}")
 
     console.print(table)
 
+    timed = [r['comparison_metrics'] for r in results if 'wall_time' in r['comparison_metrics']]
+    if timed:
+        avg_wall = sum(m['wall_time'] for m in timed) / len(timed)
+        avg_serial = sum(m['rag_elapsed'] + m['kg_elapsed'] for m in timed) / len(timed)
+        avg_overlap = sum(m['overlap'] for m in timed) / len(timed)
+        console.print(
+            f"\nAvg wall time per question: [bold]{avg_wall:.2f}s[/bold] "
+            f"(sequential would be {avg_serial:.2f}s, avg overlap {avg_overlap:.2f}s)"
+        )
+
     # Winner determination
     console.print("\n[bold yellow]Overall Assessment:[/bold yellow]")
     console.print(f"  • Knowledge Graph provides [bold]{avg_kg_entities:.1f}[/bold] entity references on average")
@@ -218,5 +333,6 @@ def display_summary_statistics(results: List[Dict[str, Any]]) -> None:
         console.print(f"  • Knowledge Graph is [bold green]{(avg_rag_time/avg_kg_time):.2f}x faster[/bold green] on average")
     else:
         console.print(f"  • Traditional RAG is [bold]{(avg_kg_time/avg_rag_time):.2f}x faster[/bold] on average")
+    console.print("    [dim](single run; use python -m comparison.benchmark for confidence intervals)[/dim]")
 
     console.print("\n[bold green]✓ Knowledge Graph provides richer, more structured context for answering questions[/bold green]")
@@ -0,0 +1,535 @@
+"""
+Retrieval quality vs latency and token cost, from labelled questions.
+
+Usage:
+    python -m comparison.evaluation [--labels sample_data/eval_questions.jsonl]
+        [--chunk-sizes 500,1000,1500] [--rag-k 2,4,8]
+        [--max-facts 5,10,20] [--kg-modes search,expand]
+        [--at-k 10] [--concurrency 4] [--metric ndcg] [--output results/sweep]
+
+Each label is one JSON line:
+
+    {"question": "...", "evidence": ["global variables", ...],
+     "chunk_ids": [5], "fact_ids": ["<edge uuid>"]}
+
+``evidence`` entries are phrases; a retrieved chunk or fact is relevant to
+one when it contains all of the phrase's words, so they stay valid across
+chunk sizes and graph rebuilds. ``chunk_ids`` (chunk_id metadata at the
+default chunk size) and ``fact_ids`` (edge uuids) are optional exact labels.
+Every id and phrase is one relevant target: recall@k is the share of
+targets covered by the top k, MRR uses the first relevant item, and nDCG
+gains 1 for each item covering a new target.
+
+The sweep scores the retrieval step only (no answer generation) for every
+parameter combination of both pipelines, several at a time, and plots the
+Pareto fronts of quality against latency and context tokens. The graph
+must already be built (run demo.py once).
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # Plots are only written to files
+import matplotlib.pyplot as plt
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+console = Console()
+
+METRICS = ("recall", "mrr", "ndcg")
+SYSTEM_COLORS = {"rag": "#3498db", "kg": "#9b59b6"}
+SYSTEM_NAMES = {"rag": "Traditional RAG", "kg": "Knowledge Graph RAG"}
+
+
+def _words(text: str) -> frozenset:
+    return frozenset(re.findall(r"\w+", text.lower()))
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token), as the KG pipeline packs its context."""
+    return len(text) // 4 + 1
+
+
+def load_labels(path: str) -> List[Dict[str, Any]]:
+    """
+    Load labelled questions from a JSONL file.
+
+    Args:
+        path: JSONL file with question, evidence, chunk_ids and/or fact_ids
+
+    Returns:
+        List of label dictionaries
+    """
+    labels = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            label = json.loads(line)
+            if not (label.get("evidence") or label.get("chunk_ids") or label.get("fact_ids")):
+                raise ValueError(f"{path}:{number} has no evidence, chunk_ids or fact_ids")
+            labels.append(label)
+    return labels
+
+
+def judge(items: List[Dict[str, Any]], label: Dict[str, Any], id_field: str) -> Tuple[List[set], int]:
+    """
+    Match retrieved items against a label's targets.
+
+    Args:
+        items: Ranked items with id and text
+        label: Label dictionary
+        id_field: "chunk_ids" or "fact_ids", the label's exact ids for this system
+
+    Returns:
+        (targets matched by each item, number of targets)
+    """
+    ids = list(label.get(id_field) or [])
+    phrases = [_words(phrase) for phrase in label.get("evidence") or []]
+    matches = []
+    for item in items:
+        words = _words(item["text"])
+        matched = {i for i, target in enumerate(ids) if item["id"] == target}
+        matched |= {len(ids) + i for i, phrase in enumerate(phrases) if phrase and phrase <= words}
+        matches.append(matched)
+    return matches, len(ids) + len(phrases)
+
+
+def _ideal_gains(matches: List[set], num_targets: int) -> List[int]:
+    """
+    Newly covered target counts of the best ordering, largest first.
+
+    Retrieved results are ordered greedily by how many uncovered targets they
+    cover; targets no result covers are assumed to take one rank each.
+    """
+    remaining = [matched for matched in matches if matched]
+    covered = set()
+    gains = []
+    while remaining:
+        best = max(remaining, key=lambda matched: len(matched - covered))
+        gain = len(best - covered)
+        if gain == 0:
+            break
+        gains.append(gain)
+        covered |= best
+        remaining.remove(best)
+    gains.extend([1] * (num_targets - len(covered)))
+    return sorted(gains, reverse=True)
+
+
+def relevance_matrices(
+    judged: List[Tuple[List[set], int]],
+    depth: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Turn judged rankings into padded relevance matrices.
+
+    Args:
+        judged: (matches, num_targets) per question, from judge
+        depth: Ranks to keep (shorter rankings are padded with misses)
+
+    Returns:
+        (new_hits, any_hits, num_targets, ideal_hits): new_hits[q, r] is the
+        number of targets rank r covers that no earlier rank covered,
+        any_hits[q, r] is True when it covers any target, and ideal_hits
+        holds new_hits of the best ordering (for nDCG normalisation)
+    """
+    new_hits = np.zeros((len(judged), depth))
+    any_hits = np.zeros((len(judged), depth), dtype=bool)
+    ideal_hits = np.zeros((len(judged), depth))
+    num_targets = np.zeros(len(judged))
+    for q, (matches, targets) in enumerate(judged):
+        covered = set()
+        for r, matched in enumerate(matches[:depth]):
+            any_hits[q, r] = bool(matched)
+            new_hits[q, r] = len(matched - covered)
+            covered |= matched
+        ideal = _ideal_gains(matches, targets)[:depth]
+        ideal_hits[q, :len(ideal)] = ideal
+        num_targets[q] = targets
+    return new_hits, any_hits, num_targets, ideal_hits
+
+
+def ranking_metrics(
+    new_hits: np.ndarray,
+    any_hits: np.ndarray,
+    num_targets: np.ndarray,
+    k: int,
+    ideal_hits: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """
+    Mean recall@k, MRR@k and nDCG@k over questions, computed on whole matrices.
+
+    Recall is the share of targets covered in the top k. The DCG gain of a
+    rank is the number of targets it newly covers; nDCG divides by the DCG of
+    the best ordering, so a perfect ranking scores 1.0 for any target count.
+
+    Args:
+        new_hits: Matrix of newly covered target counts (questions x ranks)
+        any_hits: Matrix of any-target hits (questions x ranks)
+        num_targets: Number of targets per question
+        k: Cut-off rank
+        ideal_hits: new_hits of the best ordering, from relevance_matrices
+            (None assumes every result covers at most one target)
+
+    Returns:
+        Dictionary with recall, mrr and ndcg
+    """
+    new_hits, any_hits = new_hits[:, :k], any_hits[:, :k]
+    targets = np.maximum(num_targets, 1)
+
+    recall = new_hits.sum(axis=1) / targets
+
+    first = any_hits.argmax(axis=1)
+    reciprocal_rank = np.where(any_hits.any(axis=1), 1.0 / (first + 1), 0.0)
+
+    if ideal_hits is None:
+        ideal_hits = (np.arange(k) < num_targets[:, None]).astype(float)
+    ideal_hits = ideal_hits[:, :k]
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+    dcg = (new_hits * discounts[:new_hits.shape[1]]).sum(axis=1)
+    ideal = (ideal_hits * discounts[:ideal_hits.shape[1]]).sum(axis=1)
+    # The greedy ideal can trail an optimal ordering slightly, hence the cap
+    ndcg = np.minimum(np.divide(dcg, ideal, out=np.zeros_like(dcg), where=ideal > 0), 1.0)
+
+    return {"recall": float(recall.mean()), "mrr": float(reciprocal_rank.mean()), "ndcg": float(ndcg.mean())}
+
+
+def pareto_front(costs: List[float], qualities: List[float]) -> List[int]:
+    """
+    Indices of the configurations no other configuration beats on both cost and quality.
+
+    Args:
+        costs: Cost per configuration (lower is better)
+        qualities: Quality per configuration (higher is better)
+
+    Returns:
+        Indices on the front, sorted by cost
+    """
+    order = sorted(range(len(costs)), key=lambda i: (costs[i], -qualities[i]))
+    front, best = [], -np.inf
+    for i in order:
+        if qualities[i] > best:
+            front.append(i)
+            best = qualities[i]
+    return front
+
+
+def parameter_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """All combinations of a parameter grid."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+async def _retrieve_rag(rag_system, question: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float]:
+    start = time.perf_counter()
+    documents = await asyncio.to_thread(rag_system.similarity_search, question, params["k"])
+    latency = time.perf_counter() - start
+    return [{"id": d.metadata.get("chunk_id"), "text": d.page_content} for d in documents], latency
+
+
+async def _retrieve_kg(kg_system, question: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float]:
+    start = time.perf_counter()
+    retrieved = await kg_system.retrieve(question, **params)
+    latency = time.perf_counter() - start
+    return [{"id": i, "text": f} for i, f in zip(retrieved["fact_ids"], retrieved["facts"])], latency
+
+
+async def evaluate_config(
+    system: str,
+    retriever,
+    params: Dict[str, Any],
+    labels: List[Dict[str, Any]],
+    at_k: int,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """
+    Score one configuration of one pipeline on all labelled questions.
+
+    Args:
+        system: "rag" or "kg"
+        retriever: TraditionalRAG (with its index built) or KnowledgeGraphRAG
+        params: Retrieval parameters (k for RAG; retrieve() arguments for KG)
+        labels: Labelled questions
+        at_k: Cut-off rank for the metrics
+        semaphore: Limits retrievals in flight across the sweep
+
+    Returns:
+        Row with system, params, recall, mrr, ndcg, latency percentiles (ms),
+        mean context tokens and errors
+    """
+    retrieve = _retrieve_rag if system == "rag" else _retrieve_kg
+    kg_params = {k: v for k, v in params.items() if k != "chunk_size"}
+
+    async def one(label: Dict[str, Any]):
+        async with semaphore:
+            try:
+                return await retrieve(retriever, label["question"], kg_params)
+            except Exception as e:
+                console.print(f"[red]{system} {params} failed on {label['question']!r}: {type(e).__name__}: {e}[/red]")
+                return None
+
+    outcomes = await asyncio.gather(*(one(label) for label in labels))
+    id_field = "chunk_ids" if system == "rag" else "fact_ids"
+    judged, latencies, tokens = [], [], []
+    for label, outcome in zip(labels, outcomes):
+        items, latency = outcome if outcome is not None else ([], None)
+        judged.append(judge(items, label, id_field))
+        if latency is not None:
+            latencies.append(latency * 1000)
+            tokens.append(sum(_estimate_tokens(item["text"]) for item in items))
+
+    new_hits, any_hits, num_targets, ideal_hits = relevance_matrices(judged, at_k)
+    metrics = ranking_metrics(new_hits, any_hits, num_targets, at_k, ideal_hits)
+    return {
+        "system": system,
+        "params": params,
+        **metrics,
+        "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies else None,
+        "latency_p90_ms": float(np.percentile(latencies, 90)) if latencies else None,
+        "context_tokens": float(np.mean(tokens)) if tokens else None,
+        "errors": sum(1 for outcome in outcomes if outcome is None)
+    }
+
+
+async def run_sweep(
+    labels: List[Dict[str, Any]],
+    rag_factory: Optional[Callable[[int], Any]],
+    kg_system,
+    rag_grid: Dict[str, List[Any]],
+    kg_grid: Dict[str, List[Any]],
+    at_k: int = 10,
+    max_concurrency: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    Score every parameter combination of both pipelines.
+
+    RAG indexes are built once per chunk size, in parallel threads; all
+    configurations then run concurrently, with at most ``max_concurrency``
+    retrievals in flight (use 1 for uncontended latencies).
+
+    Args:
+        labels: Labelled questions
+        rag_factory: Function chunk_size -> TraditionalRAG with its index
+            built (None skips the RAG pipeline)
+        kg_system: KnowledgeGraphRAG on a built graph (None skips the KG pipeline)
+        rag_grid: RAG parameters, {"chunk_size": [...], "k": [...]}
+        kg_grid: KG retrieve() parameters, e.g. {"max_facts": [...], "mode": [...]}
+        at_k: Cut-off rank for the metrics
+        max_concurrency: Retrievals in flight at once
+
+    Returns:
+        One row per configuration (see evaluate_config)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    jobs = []
+
+    if rag_factory is not None:
+        chunk_sizes = list(dict.fromkeys(rag_grid.get("chunk_size", [1000])))
+        console.print(f"[yellow]Building {len(chunk_sizes)} RAG index(es)...[/yellow]")
+        systems = await asyncio.gather(*(asyncio.to_thread(rag_factory, size) for size in chunk_sizes))
+        indexes = dict(zip(chunk_sizes, systems))
+        for params in parameter_grid({"chunk_size": chunk_sizes, **{k: v for k, v in rag_grid.items() if k != "chunk_size"}}):
+            jobs.append(evaluate_config("rag", indexes[params["chunk_size"]], params, labels, at_k, semaphore))
+
+    if kg_system is not None:
+        for params in parameter_grid(kg_grid):
+            jobs.append(evaluate_config("kg", kg_system, params, labels, at_k, semaphore))
+
+    console.print(f"[yellow]Evaluating {len(jobs)} configurations on {len(labels)} questions...[/yellow]")
+    return list(await asyncio.gather(*jobs))
+
+
+def _label(row: Dict[str, Any]) -> str:
+    return ", ".join(f"{k}={v}" for k, v in row["params"].items())
+
+
+def plot_pareto(rows: List[Dict[str, Any]], output_file: str = "pareto.png", metric: str = "ndcg", at_k: int = 10) -> None:
+    """
+    Plot quality against p50 latency and context tokens, with each pipeline's Pareto front.
+
+    Args:
+        rows: Rows from run_sweep
+        output_file: Output image file path
+        metric: Quality metric on the y axis ("recall", "mrr" or "ndcg")
+        at_k: Cut-off rank the metrics were computed at (for the label)
+    """
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    for ax, (cost_key, xlabel) in zip(axes, (("latency_p50_ms", "p50 retrieval latency (ms)"),
+                                             ("context_tokens", "Context tokens per question"))):
+        for system in ("rag", "kg"):
+            points = [r for r in rows if r["system"] == system and r[cost_key] is not None]
+            if not points:
+                continue
+            costs = [r[cost_key] for r in points]
+            qualities = [r[metric] for r in points]
+            ax.scatter(costs, qualities, color=SYSTEM_COLORS[system], alpha=0.5, label=SYSTEM_NAMES[system])
+            front = pareto_front(costs, qualities)
+            ax.step([costs[i] for i in front], [qualities[i] for i in front], where="post",
+                    color=SYSTEM_COLORS[system], linewidth=2)
+            for i in front:
+                ax.annotate(_label(points[i]), (costs[i], qualities[i]), fontsize=7,
+                            xytext=(4, 4), textcoords="offset points")
+        ax.set_xlabel(xlabel, fontsize=11)
+        ax.set_ylabel(f"{metric}@{at_k}", fontsize=11)
+        ax.grid(alpha=0.3)
+        ax.legend()
+    axes[0].set_title("Quality vs Latency", fontsize=13, fontweight='bold')
+    axes[1].set_title("Quality vs Token Cost", fontsize=13, fontweight='bold')
+
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+    print(f"Pareto plot saved to: {output_file}")
+
+
+def export_sweep(rows: List[Dict[str, Any]], base_path: str, config: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Write sweep rows to BASE.json (with the sweep config) and BASE.csv.
+
+    Args:
+        rows: Rows from run_sweep
+        base_path: Output path without extension
+        config: Sweep settings stored alongside the rows
+
+    Returns:
+        (json_path, csv_path)
+    """
+    base = Path(base_path)
+    base.parent.mkdir(parents=True, exist_ok=True)
+    json_path, csv_path = base.with_suffix(".json"), base.with_suffix(".csv")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"config": config, "rows": rows}, f, indent=2)
+    fields = ["system", "params", *METRICS, "latency_p50_ms", "latency_p90_ms", "context_tokens", "errors"]
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "params": _label(row)})
+    return str(json_path), str(csv_path)
+
+
+def display_sweep(rows: List[Dict[str, Any]], metric: str = "ndcg", at_k: int = 10) -> None:
+    """
+    Display sweep rows, best quality first, marking each pipeline's latency Pareto front.
+
+    Args:
+        rows: Rows from run_sweep
+        metric: Metric to sort by
+        at_k: Cut-off rank the metrics were computed at
+    """
+    on_front = set()
+    for system in ("rag", "kg"):
+        points = [i for i, r in enumerate(rows) if r["system"] == system and r["latency_p50_ms"] is not None]
+        front = pareto_front([rows[i]["latency_p50_ms"] for i in points], [rows[i][metric] for i in points])
+        on_front.update(points[i] for i in front)
+
+    table = Table(title=f"Retrieval Quality vs Cost (@{at_k})", box=box.ROUNDED)
+    table.add_column("System", style="cyan")
+    table.add_column("Parameters", style="white")
+    for name in METRICS:
+        table.add_column(name, style="magenta")
+    table.add_column("p50", style="yellow")
+    table.add_column("Tokens", style="yellow")
+    table.add_column("Front", style="green")
+    for i in sorted(range(len(rows)), key=lambda i: rows[i][metric], reverse=True):
+        row = rows[i]
+        table.add_row(
+            SYSTEM_NAMES[row["system"]],
+            _label(row),
+            *(f"{row[name]:.3f}" for name in METRICS),
+            f"{row['latency_p50_ms']:.0f} ms" if row["latency_p50_ms"] is not None else "-",
+            f"{row['context_tokens']:.0f}" if row["context_tokens"] is not None else "-",
+            "✓" if i in on_front else ""
+        )
+    console.print(table)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+async def run(args) -> None:
+    from dotenv import load_dotenv
+    from traditional_rag import TraditionalRAG
+    from knowledge_graph import KnowledgeGraphRAG
+
+    load_dotenv()
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    model_name = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+    base_url = os.getenv("OPENAI_BASE_URL")
+    labels = load_labels(args.labels)
+
+    def rag_factory(chunk_size: int):
+        rag_system = TraditionalRAG(
+            openai_api_key=openai_api_key,
+            model_name=model_name,
+            embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+            chunk_size=chunk_size,
+            chunk_overlap=min(200, chunk_size // 5),
+            base_url=base_url
+        )
+        rag_system.build_index(rag_system.load_documents(args.documents))
+        return rag_system
+
+    kg_system = KnowledgeGraphRAG(
+        neo4j_uri=os.getenv("NEO4J_URI"),
+        neo4j_user=os.getenv("NEO4J_USERNAME"),
+        neo4j_password=os.getenv("NEO4J_PASSWORD"),
+        openai_api_key=openai_api_key,
+        model_name=model_name,
+        backend=os.getenv("KG_BACKEND", "neo4j"),
+        sqlite_path=os.getenv("KG_SQLITE_PATH", "knowledge_graph.db"),
+        base_url=base_url
+    )
+
+    rag_grid = {"chunk_size": _int_list(args.chunk_sizes), "k": _int_list(args.rag_k)}
+    kg_grid = {"max_facts": _int_list(args.max_facts), "mode": [m for m in args.kg_modes.split(",") if m]}
+    try:
+        rows = await run_sweep(labels, rag_factory, kg_system, rag_grid, kg_grid, args.at_k, args.concurrency)
+    finally:
+        kg_system.close()
+
+    display_sweep(rows, args.metric, args.at_k)
+    config = {
+        "labels": args.labels,
+        "questions": len(labels),
+        "at_k": args.at_k,
+        "concurrency": args.concurrency,
+        "rag_grid": rag_grid,
+        "kg_grid": kg_grid,
+        "kg_backend": kg_system.backend
+    }
+    json_path, csv_path = export_sweep(rows, args.output, config)
+    plot_pareto(rows, f"{args.output}_pareto.png", args.metric, args.at_k)
+    console.print(f"\n[green]Results saved to: {json_path} and {csv_path}[/green]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--labels", default="sample_data/eval_questions.jsonl", help="Labelled questions (JSONL)")
+    parser.add_argument("--documents", default="sample_data/py_best_practice.txt", help="Documents for the RAG index")
+    parser.add_argument("--chunk-sizes", default="500,1000,1500", help="RAG chunk sizes")
+    parser.add_argument("--rag-k", default="2,4,8", help="RAG chunks retrieved")
+    parser.add_argument("--max-facts", default="5,10,20", help="KG facts searched")
+    parser.add_argument("--kg-modes", default="search,expand", help="KG retrieval modes")
+    parser.add_argument("--at-k", type=int, default=10, help="Cut-off rank for the metrics")
+    parser.add_argument("--concurrency", type=int, default=4, help="Retrievals in flight at once")
+    parser.add_argument("--metric", choices=METRICS, default="ndcg", help="Quality metric for sorting and plots")
+    parser.add_argument("--output", default="results/sweep", help="Output path without extension")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Record/replay of OpenAI API traffic for offline, deterministic benchmarking.
+
+Usage:
+    python -m comparison.replay --cassette cassettes/demo.jsonl --mode record [--port 8765]
+    python -m comparison.replay --cassette cassettes/demo.jsonl --mode replay [--latency recorded|sampled|zero]
+
+The server speaks the OpenAI REST API (chat completions and embeddings).
+In record mode it forwards every request to the real API and appends the
+exchange, with its latency, to the cassette. In replay mode it answers
+from the cassette only, so no network or API key is needed. Point both
+systems at it with ``base_url`` (or OPENAI_BASE_URL for demo.py and the
+benchmark scripts), e.g. OPENAI_BASE_URL=http://127.0.0.1:8765/v1.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+OPENAI_API = "https://api.openai.com/v1"
+# Request headers passed through to the real API when recording
+FORWARDED_HEADERS = ("Authorization", "Content-Type", "OpenAI-Organization", "OpenAI-Project")
+LATENCY_MODES = ("recorded", "sampled", "zero")
+
+
+class Cassette:
+    """
+    Recorded API exchanges in a JSONL file, looked up by endpoint and request body.
+
+    Identical requests recorded several times (e.g. sampled completions)
+    are replayed in recorded order, cycling when the recording runs out.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load a cassette, or start an empty one.
+
+        Args:
+            path: JSONL file of exchanges
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.latencies: Dict[str, List[float]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line))
+
+    @staticmethod
+    def make_key(endpoint: str, body: Dict[str, Any]) -> str:
+        """Stable key of a request: endpoint plus the canonical JSON body."""
+        payload = json.dumps({"endpoint": endpoint, "body": body}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        self.entries.setdefault(entry["key"], []).append(entry)
+        self.latencies.setdefault(entry["endpoint"], []).append(entry["latency"])
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+    def lookup(self, endpoint: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Find the next recorded exchange for a request.
+
+        Args:
+            endpoint: API path, e.g. "/chat/completions"
+            body: Request JSON
+
+        Returns:
+            Entry with response and latency, or None if the request was never recorded
+        """
+        key = self.make_key(endpoint, body)
+        with self._lock:
+            entries = self.entries.get(key)
+            if not entries:
+                return None
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            return entries[cursor % len(entries)]
+
+    def record(self, endpoint: str, body: Dict[str, Any], response: Dict[str, Any], latency: float) -> None:
+        """
+        Append an exchange to the cassette file.
+
+        Args:
+            endpoint: API path
+            body: Request JSON
+            response: Response JSON
+            latency: Seconds the real API took
+        """
+        entry = {
+            "key": self.make_key(endpoint, body),
+            "endpoint": endpoint,
+            "request": body,
+            "response": response,
+            "latency": latency
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._add(entry)
+
+
+def synthetic_response(endpoint: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Deterministic stand-in for an unrecorded request.
+
+    Embeddings are unit vectors seeded by a hash of each input, so equal
+    texts get equal vectors; completions return a fixed message.
+
+    Args:
+        endpoint: API path
+        body: Request JSON
+
+    Returns:
+        Response JSON, or None for unsupported endpoints
+    """
+    if endpoint == "/embeddings":
+        inputs = body.get("input")
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dimensions = body.get("dimensions") or 1536
+        data = []
+        for i, item in enumerate(inputs or []):
+            seed = int(hashlib.sha256(json.dumps(item).encode("utf-8")).hexdigest()[:16], 16)
+            vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+            vector /= np.linalg.norm(vector)
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode("ascii")
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model"),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0}
+        }
+    if endpoint == "/chat/completions":
+        return {
+            "id": "chatcmpl-replay",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "No recorded response for this request."},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }
+    return None
+
+
+def start_replay_server(
+    cassette_path: str,
+    mode: str = "replay",
+    latency: str = "recorded",
+    strict: bool = True,
+    upstream: str = OPENAI_API,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    seed: int = 0
+) -> ThreadingHTTPServer:
+    """
+    Serve a fake OpenAI-compatible API in a background thread.
+
+    Args:
+        cassette_path: JSONL cassette to record to or replay from
+        mode: "record" (forward to ``upstream`` and save) or "replay" (cassette only)
+        latency: Replay delay: "recorded" (each exchange's own latency),
+            "sampled" (drawn from the endpoint's recorded latencies) or "zero"
+        strict: In replay mode, answer unrecorded requests with HTTP 404
+            instead of a synthetic response
+        upstream: Real API base URL for record mode
+        host: Interface to bind
+        port: Port to listen on (0 picks a free port)
+        seed: Random seed for sampled latencies
+
+    Returns:
+        The running server; ``server.url`` is the base_url to give the
+        clients, ``server.counts`` holds hits, misses and recorded, and
+        shutdown() stops it
+    """
+    if mode not in ("record", "replay"):
+        raise ValueError(f"Unknown mode: {mode}")
+    if latency not in LATENCY_MODES:
+        raise ValueError(f"Unknown latency mode: {latency}")
+
+    cassette = Cassette(cassette_path)
+    rng = random.Random(seed)
+    counts = {"hits": 0, "misses": 0, "recorded": 0}
+    counts_lock = threading.Lock()
+
+    def count(name: str) -> None:
+        with counts_lock:
+            counts[name] += 1
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _error(self, status: int, message: str) -> None:
+            self._send_json(status, {"error": {"message": message, "type": "replay_error", "code": None}})
+
+        def do_POST(self):
+            path = self.path.split("?")[0]
+            endpoint = path[len("/v1"):] if path.startswith("/v1/") else path
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._error(400, "Request body is not JSON")
+                return
+            if body.get("stream"):
+                self._error(400, "Streaming is not supported by the replay server")
+                return
+
+            if mode == "record":
+                self._forward(endpoint, body)
+                return
+
+            entry = cassette.lookup(endpoint, body)
+            if entry is None:
+                count("misses")
+                response = None if strict else synthetic_response(endpoint, body)
+                if response is None:
+                    self._error(404, f"No recorded response for {endpoint} in {cassette_path}")
+                else:
+                    self._send_json(200, response)
+                return
+
+            count("hits")
+            if latency == "recorded":
+                time.sleep(entry["latency"])
+            elif latency == "sampled":
+                time.sleep(rng.choice(cassette.latencies[endpoint]))
+            self._send_json(200, entry["response"])
+
+        def _forward(self, endpoint: str, body: Dict[str, Any]) -> None:
+            headers = {name: self.headers[name] for name in FORWARDED_HEADERS if self.headers.get(name)}
+            request = urllib.request.Request(
+                upstream.rstrip("/") + endpoint, data=json.dumps(body).encode("utf-8"), headers=headers, method="POST"
+            )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=600) as response:
+                    payload = json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                # Errors (rate limits, bad requests) are passed through, not recorded
+                data = e.read()
+                self.send_response(e.code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+            except urllib.error.URLError as e:
+                self._error(502, f"Upstream unreachable: {e.reason}")
+                return
+            cassette.record(endpoint, body, payload, time.perf_counter() - start)
+            count("recorded")
+            self._send_json(200, payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    server.url = f"http://{host}:{server.server_address[1]}/v1"
+    server.counts = counts
+    server.cassette = cassette
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"Replay server ({mode}, {len(cassette)} recorded exchanges) running at {server.url}")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cassette", required=True, help="JSONL cassette file")
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay", help="Record or replay")
+    parser.add_argument("--latency", choices=LATENCY_MODES, default="recorded", help="Replay delay")
+    parser.add_argument("--lenient", action="store_true", help="Answer unrecorded requests with synthetic responses")
+    parser.add_argument("--upstream", default=OPENAI_API, help="Real API base URL for record mode")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    args = parser.parse_args()
+
+    server = start_replay_server(
+        args.cassette, args.mode, args.latency, strict=not args.lenient,
+        upstream=args.upstream, host=args.host, port=args.port
+    )
+    print(f"Set OPENAI_BASE_URL={server.url} and run the demo or benchmarks; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"Stopped: {server.counts}")
+
+
+if __name__ == "__main__":
+    main()
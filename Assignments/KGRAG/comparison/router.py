@@ -0,0 +1,381 @@
+"""Cost-aware routing of questions between Traditional RAG and Knowledge Graph RAG."""
+
+import asyncio
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+console = Console()
+
+ROUTES = ("vector", "kg", "both")
+
+# Questions about how things connect favour the graph
+RELATIONAL_CUES = [
+    "relationship", "relate", "related", "depend", "connect", "between", "interact",
+    "affect", "impact", "which", "who uses", "used by", "calls", "compare", "difference"
+]
+# Broad questions favour the graph's community summaries / multi-hop facts
+GLOBAL_CUES = ["overview", "summarise", "summarize", "overall", "across", "all the", "architecture"]
+# Definitions and how-to questions are answered well by a single passage
+PASSAGE_CUES = [
+    "what is", "what are", "how do i", "how to", "example", "syntax", "define",
+    "meaning", "recommended", "why should", "when should"
+]
+
+ROUTER_PROMPT = """Decide which retriever should answer this question about technical documentation.
+"vector": the answer is in one passage (definitions, how-tos, single facts).
+"kg": the answer needs relationships between several concepts or a broad overview.
+"both": unsure.
+
+Question: {question}
+
+Reply with exactly one word: vector, kg or both."""
+
+_IDENTIFIER = re.compile(r"\b(?:[A-Z][a-z0-9]+){2,}\b|\b[A-Z]{2,}\b")
+
+
+class QueryRouter:
+    """
+    Send each question to the vector path, the knowledge graph path, or both.
+
+    Classification is lexical (cue phrases, identifiers) plus entity hits in
+    the graph, which are a local name lookup when the knowledge graph has an
+    entity index (see KnowledgeGraphRAG.enable_entity_index). Only questions
+    in the ambiguous band go to the optional LLM classifier; without one they
+    are sent to both systems.
+    """
+
+    def __init__(
+        self,
+        kg_system=None,
+        llm=None,
+        log_path: Optional[str] = "logs/router_decisions.jsonl",
+        margin: float = 1.0
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            kg_system: KnowledgeGraphRAG instance used for entity hits
+            llm: Optional small LangChain chat model for ambiguous questions
+            log_path: JSONL file decisions are appended to (None disables logging)
+            margin: Score margin needed to pick a single system without the LLM
+        """
+        self.kg_system = kg_system
+        self.llm = llm
+        self.log_path = log_path
+        self.margin = margin
+
+    def features(self, question: str) -> Dict[str, Any]:
+        """
+        Compute the cheap routing features of a question.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Dictionary of feature values
+        """
+        text = question.lower()
+        entity_index = getattr(self.kg_system, "entity_index", None)
+        if entity_index is not None:
+            entity_hits = len(entity_index.match_names(question))
+        else:
+            entity_hits = len(set(_IDENTIFIER.findall(question)))
+
+        return {
+            "words": len(text.split()),
+            "relational_cues": sum(cue in text for cue in RELATIONAL_CUES),
+            "global_cues": sum(cue in text for cue in GLOBAL_CUES),
+            "passage_cues": sum(cue in text for cue in PASSAGE_CUES),
+            "entity_hits": entity_hits
+        }
+
+    def classify(self, question: str) -> Dict[str, Any]:
+        """
+        Route a question using only the cheap features.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Dictionary with route ("vector", "kg", "both" or None when
+            ambiguous), score and features
+        """
+        features = self.features(question)
+        score = (
+            features["relational_cues"]
+            + 1.5 * features["global_cues"]
+            + 0.5 * min(features["entity_hits"], 4)
+            - features["passage_cues"]
+        )
+        if score >= self.margin:
+            route = "kg"
+        elif score <= -self.margin:
+            route = "vector"
+        else:
+            route = None
+        return {"route": route, "score": score, "features": features}
+
+    async def route(self, question: str) -> Dict[str, Any]:
+        """
+        Decide where to send a question.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Decision dictionary with route, reason, score, features,
+            classify_ms and llm_calls
+        """
+        start = time.perf_counter()
+        decision = self.classify(question)
+        decision["llm_calls"] = 0
+        decision["reason"] = "features"
+
+        if decision["route"] is None and self.llm is not None:
+            response = await self.llm.ainvoke(ROUTER_PROMPT.format(question=question))
+            answer = response.content.strip().lower()
+            decision["route"] = next((r for r in ROUTES if answer.startswith(r)), "both")
+            decision["llm_calls"] = 1
+            decision["reason"] = "llm"
+        elif decision["route"] is None:
+            decision["route"] = "both"
+            decision["reason"] = "ambiguous"
+
+        decision["classify_ms"] = (time.perf_counter() - start) * 1000
+        return decision
+
+    async def answer(self, rag_system, kg_system, question: str) -> Dict[str, Any]:
+        """
+        Answer a question with the routed system(s) and log the decision.
+
+        When both systems run they run concurrently; the knowledge graph
+        answer is preferred when it retrieved any facts.
+
+        Args:
+            rag_system: TraditionalRAG instance
+            kg_system: KnowledgeGraphRAG instance
+            question: User's question
+
+        Returns:
+            Dictionary with answer, route, decision, rag_result, kg_result
+            and latencies
+        """
+        start = time.perf_counter()
+        decision = await self.route(question)
+        route = decision["route"]
+
+        async def run_rag():
+            started = time.perf_counter()
+            result = await asyncio.to_thread(rag_system.query, question)
+            return result, time.perf_counter() - started
+
+        async def run_kg():
+            started = time.perf_counter()
+            result = await kg_system.query(question)
+            return result, time.perf_counter() - started
+
+        rag_result = kg_result = None
+        latencies = {}
+        if route == "both":
+            (rag_result, latencies["rag"]), (kg_result, latencies["kg"]) = await asyncio.gather(run_rag(), run_kg())
+        elif route == "vector":
+            rag_result, latencies["rag"] = await run_rag()
+        else:
+            kg_result, latencies["kg"] = await run_kg()
+        latencies["total"] = time.perf_counter() - start
+
+        if kg_result is not None and (rag_result is None or kg_result["metrics"]["num_facts"] > 0):
+            answer = kg_result["answer"]
+        else:
+            answer = rag_result["answer"]
+
+        self.log(question, decision, latencies)
+        return {
+            "answer": answer,
+            "route": route,
+            "decision": decision,
+            "rag_result": rag_result,
+            "kg_result": kg_result,
+            "latencies": latencies
+        }
+
+    def log(self, question: str, decision: Dict[str, Any], latencies: Dict[str, float]) -> None:
+        """Append a routing decision and the observed latencies to the JSONL log."""
+        if not self.log_path:
+            return
+        Path(self.log_path).parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "question": question,
+            "route": decision["route"],
+            "reason": decision["reason"],
+            "score": decision["score"],
+            "features": decision["features"],
+            "classify_ms": decision["classify_ms"],
+            "llm_calls": decision["llm_calls"] + (2 if decision["route"] == "both" else 1),
+            "latencies": latencies
+        }
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def reference_scorer(references: Dict[str, str]) -> Callable[[str, str], float]:
+    """
+    Build a quality function scoring answers by token F1 against reference answers.
+
+    Args:
+        references: Mapping of question to reference answer
+
+    Returns:
+        Function (question, answer) -> score in [0, 1]
+    """
+    def tokens(text: str) -> List[str]:
+        return re.findall(r"\w+", text.lower())
+
+    def score(question: str, answer: str) -> float:
+        reference = tokens(references.get(question, ""))
+        predicted = tokens(answer)
+        if not reference or not predicted:
+            return 0.0
+        remaining = list(reference)
+        overlap = 0
+        for token in predicted:
+            if token in remaining:
+                remaining.remove(token)
+                overlap += 1
+        if overlap == 0:
+            return 0.0
+        precision = overlap / len(predicted)
+        recall = overlap / len(reference)
+        return 2 * precision * recall / (precision + recall)
+
+    return score
+
+
+def llm_judge(llm) -> Callable[[str, str], float]:
+    """
+    Build a quality function that asks an LLM to grade answers from 1 to 5.
+
+    Args:
+        llm: LangChain chat model
+
+    Returns:
+        Function (question, answer) -> score in [0, 1]
+    """
+    def score(question: str, answer: str) -> float:
+        response = llm.invoke(
+            "Grade how well this answer addresses the question, from 1 (useless) to 5 (complete "
+            f"and correct). Reply with the number only.\n\nQuestion: {question}\n\nAnswer: {answer}"
+        )
+        match = re.search(r"[1-5]", response.content)
+        return (int(match.group()) - 1) / 4 if match else 0.0
+
+    return score
+
+
+async def evaluate_router(
+    router: QueryRouter,
+    rag_system,
+    kg_system,
+    questions: List[str],
+    quality_fn: Callable[[str, str], float]
+) -> Dict[str, Any]:
+    """
+    Compare routing against always querying both systems.
+
+    Every question is answered by both systems, then the router's choice is
+    scored from those results: latency and LLM calls of the routed
+    system(s) versus both, and answer quality versus the better of the two.
+    As for a routed "both", the baseline's latency is that of the two
+    systems queried concurrently, i.e. the slower of the two.
+
+    Args:
+        router: QueryRouter to evaluate (its log is not written)
+        rag_system: TraditionalRAG instance
+        kg_system: KnowledgeGraphRAG instance
+        questions: Questions to evaluate on
+        quality_fn: Function (question, answer) -> score in [0, 1]
+
+    Returns:
+        Dictionary with per-question rows and aggregate savings
+    """
+    rows = []
+    for question in questions:
+        decision = await router.route(question)
+        rag_result = await asyncio.to_thread(rag_system.query, question)
+        kg_result = await kg_system.query(question)
+
+        rag_time = rag_result["metrics"]["query_time"]
+        kg_time = kg_result["metrics"]["query_time"]
+        rag_quality = quality_fn(question, rag_result["answer"])
+        kg_quality = quality_fn(question, kg_result["answer"])
+
+        route = decision["route"]
+        if route == "vector":
+            latency, calls, quality = rag_time, 1, rag_quality
+        elif route == "kg":
+            latency, calls, quality = kg_time, 1, kg_quality
+        else:
+            latency, calls = max(rag_time, kg_time), 2
+            quality = kg_quality if kg_result["metrics"]["num_facts"] > 0 else rag_quality
+
+        rows.append({
+            "question": question,
+            "route": route,
+            "reason": decision["reason"],
+            "routed_latency": latency + decision["classify_ms"] / 1000,
+            "both_latency": max(rag_time, kg_time),
+            "routed_calls": calls + decision["llm_calls"],
+            "both_calls": 2,
+            "routed_quality": quality,
+            "both_quality": max(rag_quality, kg_quality)
+        })
+
+    def total(key):
+        return sum(row[key] for row in rows)
+
+    both_quality = total("both_quality")
+    return {
+        "rows": rows,
+        "routes": {route: sum(row["route"] == route for row in rows) for route in ROUTES},
+        "latency_saved": 1 - total("routed_latency") / total("both_latency") if rows else 0.0,
+        "calls_saved": 1 - total("routed_calls") / total("both_calls") if rows else 0.0,
+        "quality_retained": total("routed_quality") / both_quality if both_quality else 1.0
+    }
+
+
+def display_router_evaluation(report: Dict[str, Any]) -> None:
+    """
+    Display the result of evaluate_router.
+
+    Args:
+        report: Dictionary from evaluate_router
+    """
+    table = Table(title="Router Decisions", box=box.ROUNDED)
+    table.add_column("Question", style="white")
+    table.add_column("Route", style="cyan")
+    table.add_column("Latency (routed / both)", style="magenta")
+    table.add_column("Quality (routed / both)", style="green")
+    for row in report["rows"]:
+        table.add_row(
+            row["question"][:60],
+            f"{row['route']} ({row['reason']})",
+            f"{row['routed_latency']:.2f}s / {row['both_latency']:.2f}s",
+            f"{row['routed_quality']:.2f} / {row['both_quality']:.2f}"
+        )
+    console.print(table)
+
+    routes = ", ".join(f"{route}: {count}" for route, count in report["routes"].items())
+    console.print(f"\n[bold yellow]Routes:[/bold yellow] {routes}")
+    console.print(f"  • Latency saved: [bold]{report['latency_saved']:.0%}[/bold]")
+    console.print(f"  • LLM calls saved: [bold]{report['calls_saved']:.0%}[/bold]")
+    console.print(f"  • Answer quality retained: [bold]{report['quality_retained']:.0%}[/bold]")
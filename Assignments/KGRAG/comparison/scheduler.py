@@ -0,0 +1,292 @@
+"""Concurrent, rate-limit-aware scheduling of comparison suites."""
+
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+console = Console()
+
+# Exception class names (as recorded in compare_systems errors) worth retrying
+TRANSIENT_ERRORS = (
+    "RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+    "ServiceUnavailableError", "TimeoutError", "ConnectionError", "ServiceUnavailable",
+    "SessionExpired", "TransientError"
+)
+
+
+def is_transient(error: str) -> bool:
+    """Whether an error string of the form "ExceptionName: message" is worth retrying."""
+    return error.split(":", 1)[0].strip() in TRANSIENT_ERRORS
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in [0, 100]) of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budgets for one model.
+
+    Both budgets are token buckets refilled continuously at limit / 60 per
+    second, starting full. Waiters are served in order.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rpm: Requests per minute (None for no request limit)
+            tpm: Tokens per minute (None for no token limit)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm or 0)
+        self._tokens = float(tpm or 0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, requests: int = 1, tokens: int = 0) -> float:
+        """
+        Wait until the budgets allow the given requests and tokens, then spend them.
+
+        Args:
+            requests: Requests about to be sent
+            tokens: Estimated tokens those requests consume
+
+        Returns:
+            Seconds spent waiting
+        """
+        requests = min(requests, self.rpm) if self.rpm else 0
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                waits = []
+                if requests > self._requests:
+                    waits.append((requests - self._requests) * 60 / self.rpm)
+                if tokens > self._tokens:
+                    waits.append((tokens - self._tokens) * 60 / self.tpm)
+                if not waits:
+                    break
+                await asyncio.sleep(max(waits))
+                waited += max(waits)
+            self._requests -= requests
+            self._tokens -= tokens
+        return waited
+
+
+def to_record(comparison: Dict[str, Any]) -> Dict[str, Any]:
+    """Make a comparison JSON-serializable (LangChain source documents become dictionaries)."""
+    rag_result = comparison.get("rag_result")
+    if rag_result and rag_result.get("source_documents"):
+        documents = [
+            {"page_content": d.page_content, "metadata": d.metadata} if hasattr(d, "page_content") else d
+            for d in rag_result["source_documents"]
+        ]
+        comparison = {**comparison, "rag_result": {**rag_result, "source_documents": documents}}
+    return comparison
+
+
+class SuiteScheduler:
+    """
+    Run a question suite concurrently, paced against per-model rate limits.
+
+    Each question is one job (compare_systems for a comparison suite) whose
+    result carries an "errors" dictionary. Jobs with transient errors are
+    retried with exponential backoff and jitter. Finished results are
+    appended to a JSONL file as they complete; a rerun with the same file
+    skips questions that already completed without errors.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        rate_limits: Optional[Dict[str, Dict[str, int]]] = None,
+        models: Optional[List[str]] = None,
+        tokens_per_request: int = 2500,
+        max_retries: int = 3,
+        backoff: float = 2.0,
+        output_path: Optional[str] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Questions in flight at once
+            rate_limits: Mapping of model name to {"rpm": ..., "tpm": ...}
+            models: Model of every LLM request a job sends (e.g. the RAG and
+                KG models for a comparison); models without limits are not paced
+            tokens_per_request: Estimated prompt + completion tokens per request
+            max_retries: Retries per question for transient failures
+            backoff: Base delay in seconds, doubled on every retry
+            output_path: JSONL file results are streamed to (None disables)
+        """
+        self.max_concurrency = max_concurrency
+        self.limiters = {
+            model: RateLimiter(limits.get("rpm"), limits.get("tpm"))
+            for model, limits in (rate_limits or {}).items()
+        }
+        self.requests = Counter(models or [])
+        self.tokens_per_request = tokens_per_request
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.output_path = output_path
+
+    def load_completed(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read results from a previous run of the output file.
+
+        Returns:
+            Mapping of question to its latest record that finished without errors
+        """
+        if not self.output_path or not Path(self.output_path).exists():
+            return {}
+        latest = {}
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    latest[record["question"]] = record
+        return {question: record for question, record in latest.items() if not record.get("errors")}
+
+    async def _pace(self) -> float:
+        """Wait for every model's budget to cover one job's requests."""
+        waited = 0.0
+        for model, count in self.requests.items():
+            limiter = self.limiters.get(model)
+            if limiter is not None:
+                waited += await limiter.acquire(count, count * self.tokens_per_request)
+        return waited
+
+    async def run(
+        self,
+        questions: List[str],
+        job: Callable[[str], Awaitable[Dict[str, Any]]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a job for every question.
+
+        Args:
+            questions: Questions to run
+            job: Async function question -> result dictionary with "errors"
+            on_result: Called with each finished result (JSON-serializable,
+                as written to the output file) in completion order
+
+        Returns:
+            Dictionary with results (in question order, each with a
+            "schedule" entry of attempts, latency and paced seconds) and
+            summary (throughput and latency percentiles for this run)
+        """
+        completed = self.load_completed()
+        pending = [(i, q) for i, q in enumerate(questions) if q not in completed]
+        if completed:
+            console.print(f"[cyan]Resuming: {len(questions) - len(pending)} question(s) already completed[/cyan]")
+
+        output = None
+        if self.output_path:
+            Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+            output = open(self.output_path, "a", encoding="utf-8")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results: Dict[int, Dict[str, Any]] = {}
+        done = 0
+
+        async def run_one(index: int, question: str) -> None:
+            nonlocal done
+            async with semaphore:
+                started = time.perf_counter()
+                paced = 0.0
+                for attempt in range(1, self.max_retries + 2):
+                    paced += await self._pace()
+                    result = await job(question)
+                    transient = [e for e in result.get("errors", {}).values() if is_transient(e)]
+                    if not transient or attempt > self.max_retries:
+                        break
+                    delay = random.uniform(0, self.backoff * 2 ** (attempt - 1))
+                    console.print(f"[yellow]Retrying question {index + 1} in {delay:.1f}s ({transient[0]})[/yellow]")
+                    await asyncio.sleep(delay)
+                result["schedule"] = {
+                    "index": index,
+                    "attempts": attempt,
+                    "latency": time.perf_counter() - started,
+                    "paced": paced
+                }
+            results[index] = result
+            if output is not None:
+                output.write(json.dumps(to_record(result), default=str) + "\n")
+                output.flush()
+            if on_result is not None:
+                on_result(to_record(result))
+            done += 1
+            status = "[red]✗ Failed[/red]" if result.get("errors") else "[green]✓ Complete[/green]"
+            console.print(f"{status} ({done}/{len(pending)}) {question}")
+
+        suite_start = time.perf_counter()
+        try:
+            await asyncio.gather(*(run_one(i, q) for i, q in pending))
+        finally:
+            if output is not None:
+                output.close()
+        elapsed = time.perf_counter() - suite_start
+
+        ran = [results[i] for i, _ in pending]
+        latencies = [r["schedule"]["latency"] for r in ran]
+        summary = {
+            "questions": len(questions),
+            "resumed": len(questions) - len(pending),
+            "ran": len(ran),
+            "failed": sum(1 for r in ran if r.get("errors")),
+            "retries": sum(r["schedule"]["attempts"] - 1 for r in ran),
+            "paced_seconds": sum(r["schedule"]["paced"] for r in ran),
+            "elapsed": elapsed,
+            "questions_per_minute": len(ran) / elapsed * 60 if elapsed > 0 else 0.0,
+            "latency": {
+                name: percentile(latencies, q) for name, q in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+            } if latencies else {}
+        }
+        ordered = [results[i] if i in results else completed[q] for i, q in enumerate(questions)]
+        return {"results": ordered, "summary": summary}
+
+
+def display_suite_summary(summary: Dict[str, Any]) -> None:
+    """
+    Display throughput and tail latency of a scheduled suite run.
+
+    Args:
+        summary: Summary dictionary from SuiteScheduler.run
+    """
+    table = Table(title="Suite Throughput", box=box.ROUNDED)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="magenta")
+    table.add_row("Questions run", f"{summary['ran']} ({summary['resumed']} resumed)")
+    table.add_row("Failed", str(summary["failed"]))
+    table.add_row("Retries", str(summary["retries"]))
+    table.add_row("Rate-limit waits", f"{summary['paced_seconds']:.1f}s")
+    table.add_row("Elapsed", f"{summary['elapsed']:.1f}s")
+    table.add_row("Throughput", f"{summary['questions_per_minute']:.1f} questions/min")
+    for name, value in summary["latency"].items():
+        table.add_row(f"Latency {name}", f"{value:.2f}s")
+    console.print("\n", table)
@@ -1,21 +1,266 @@
 """Visualization tools for Knowledge Graph and comparison metrics."""
 
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")  # Plots are only written to files
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import List, Dict, Any
-from pyvis.network import Network
+from typing import List, Dict, Any, Optional, Tuple
 from neo4j import GraphDatabase
 
+# Highest-degree entities with their current outgoing edges, streamed in one call
+SAMPLE_BY_DEGREE_QUERY = """
+MATCH (n:Entity)
+WHERE $group_id IS NULL OR n.group_id = $group_id
+WITH n, COUNT { (n)-[r:RELATES_TO]-() WHERE r.expired_at IS NULL } AS degree
+ORDER BY degree DESC
+LIMIT $max_nodes
+RETURN elementId(n) AS id, n.name AS name, degree, degree AS score,
+       [(n)-[r:RELATES_TO]->(m) WHERE r.expired_at IS NULL | [elementId(m), r.name]][..$fan_out] AS edges
+"""
+
+# The same rows for entities ranked elsewhere (e.g. PageRank on the graph mirror)
+SAMPLE_BY_UUID_QUERY = """
+UNWIND $nodes AS node
+MATCH (n:Entity {uuid: node.uuid})
+WHERE $group_id IS NULL OR n.group_id = $group_id
+RETURN elementId(n) AS id, n.name AS name,
+       COUNT { (n)-[r:RELATES_TO]-() WHERE r.expired_at IS NULL } AS degree, node.score AS score,
+       [(n)-[r:RELATES_TO]->(m) WHERE r.expired_at IS NULL | [elementId(m), r.name]][..$fan_out] AS edges
+"""
+
+# k-hop ego networks of many entities; %d is the hop count (Cypher cannot parameterize it)
+EGO_NETWORKS_QUERY = """
+UNWIND $names AS entity_name
+MATCH (e:Entity {name: entity_name})
+WHERE $group_id IS NULL OR e.group_id = $group_id
+CALL {
+    WITH e
+    MATCH (e)-[rels:RELATES_TO*1..%d]-()
+    WHERE all(r IN rels WHERE r.expired_at IS NULL)
+    UNWIND rels AS r
+    WITH DISTINCT r
+    LIMIT $max_edges
+    WITH startNode(r) AS a, r, endNode(r) AS b
+    RETURN collect([elementId(a), a.name, elementId(b), b.name, r.name]) AS edges
+}
+RETURN entity_name, elementId(e) AS center, edges
+"""
+
+SAMPLE_METHODS = ("degree", "pagerank")
+
+# Nodes drawn at the default zoom; each zoom level in shows four times as many
+LOD_BASE_NODES = 2000
+
+GRAPH_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<script src="https://cdn.jsdelivr.net/npm/graphology@0.25.4/dist/graphology.umd.min.js"></script>
+<script src="https://cdn.jsdelivr.net/npm/graphology-library@0.8.0/dist/graphology-library.min.js"></script>
+<script src="https://cdn.jsdelivr.net/npm/sigma@2.4.0/build/sigma.min.js"></script>
+<style>
+  html, body { margin: 0; height: 100%; background: #222222; color: white; font-family: sans-serif; }
+  #graph { position: absolute; inset: 0; }
+  #panel { position: absolute; top: 10px; left: 10px; padding: 8px 12px; background: rgba(0, 0, 0, 0.6);
+           border-radius: 4px; font-size: 13px; max-width: 360px; }
+  #panel button { margin-top: 6px; }
+</style>
+</head>
+<body>
+<div id="graph"></div>
+<div id="panel">
+  <b>__TITLE__</b>
+  <div id="stats"></div>
+  <div id="lod"></div>
+  <div id="info">Click a node for details</div>
+  <button id="layout">Run layout</button>
+</div>
+<script id="graph-data" type="application/json">__DATA__</script>
+<script>
+  const data = JSON.parse(document.getElementById("graph-data").textContent);
+  const nodes = data.nodes, edges = data.edges;
+  const n = nodes.id.length;
+  const graph = new graphology.MultiDirectedGraph();
+  for (let i = 0; i < n; i++) {
+    graph.addNode(i, {label: nodes.name[i], x: nodes.x[i], y: nodes.y[i], size: nodes.size[i], color: "#fb7e81"});
+  }
+  for (let i = 0; i < edges.source.length; i++) {
+    graph.addEdge(edges.source[i], edges.target[i], {label: data.types[edges.type[i]], size: 0.5, color: "#666666"});
+  }
+
+  // Level of detail: nodes are stored by rank, so only the top ranks are drawn
+  // when zoomed out; edges of hidden nodes are skipped by sigma
+  const LOD_BASE = __LOD_BASE__;
+  let visible = Math.min(n, LOD_BASE);
+  const renderer = new Sigma(graph, document.getElementById("graph"), {
+    defaultEdgeType: "arrow",
+    hideEdgesOnMove: true,
+    hideLabelsOnMove: true,
+    labelRenderedSizeThreshold: 8,
+    nodeReducer: (node, attrs) => (Number(node) < visible ? attrs : {...attrs, hidden: true})
+  });
+  function showLevel() {
+    document.getElementById("lod").textContent = `Showing top ${visible} of ${n} nodes (zoom in for more)`;
+  }
+  renderer.getCamera().on("updated", (state) => {
+    const level = Math.max(0, Math.ceil(Math.log2(1 / state.ratio)));
+    const next = Math.min(n, LOD_BASE * 4 ** level);
+    if (next !== visible) {
+      visible = next;
+      showLevel();
+      renderer.refresh();
+    }
+  });
+  document.getElementById("stats").textContent =
+    `${n} nodes, ${edges.source.length} edges, sampled by ${data.sample}`;
+  showLevel();
+
+  renderer.on("clickNode", ({node}) => {
+    const i = Number(node);
+    document.getElementById("info").textContent =
+      `${nodes.name[i]} | degree ${nodes.degree[i]} | score ${nodes.score[i]} | rank ${i + 1}`;
+  });
+
+  // ForceAtlas2 refines the initial spiral one iteration per frame until stopped
+  const forceAtlas2 = graphologyLibrary.layoutForceAtlas2;
+  const settings = forceAtlas2.inferSettings(graph);
+  let running = false;
+  function step() {
+    if (!running) return;
+    forceAtlas2.assign(graph, {iterations: 1, settings: settings});
+    requestAnimationFrame(step);
+  }
+  const button = document.getElementById("layout");
+  button.onclick = () => {
+    running = !running;
+    button.textContent = running ? "Stop layout" : "Run layout";
+    step();
+  };
+  if (n <= 5000) button.onclick();
+</script>
+</body>
+</html>
+"""
+
+
+def sample_subgraph(
+    driver,
+    max_nodes: int = 2000,
+    sample: str = "degree",
+    mirror=None,
+    group_id: Optional[str] = None,
+    fan_out: int = 100
+) -> Dict[str, Any]:
+    """
+    Sample the most central entities and the edges among them in one streamed query.
+
+    Nodes are returned in rank order (most central first) as parallel
+    arrays; edges refer to nodes by their position in those arrays.
+
+    Args:
+        driver: Neo4j driver
+        max_nodes: Number of entities to sample
+        sample: "degree" (ranked in Cypher) or "pagerank" (ranked on ``mirror``)
+        mirror: GraphMirror of the same graph, required for PageRank sampling
+        group_id: Restrict to one group (None for all)
+        fan_out: Maximum outgoing edges read per entity
+
+    Returns:
+        Dictionary with sample, nodes (id, name, degree, score), edges
+        (source, target, type) and types (relation names)
+    """
+    if sample not in SAMPLE_METHODS:
+        raise ValueError(f"Unknown sample method: {sample}")
+
+    params = {"group_id": group_id, "fan_out": fan_out}
+    if sample == "pagerank":
+        if mirror is None:
+            raise ValueError("PageRank sampling needs a GraphMirror (see KnowledgeGraphRAG.enable_mirror)")
+        ranks = mirror.pagerank()
+        top = np.argsort(-ranks, kind="stable")[:max_nodes]
+        query = SAMPLE_BY_UUID_QUERY
+        params["nodes"] = [{"uuid": mirror.uuids[i], "score": float(ranks[i])} for i in top]
+    else:
+        query = SAMPLE_BY_DEGREE_QUERY
+        params["max_nodes"] = max_nodes
+
+    nodes = {"id": [], "name": [], "degree": [], "score": []}
+    index: Dict[str, int] = {}
+    pending = []
+    with driver.session() as session:
+        for record in session.run(query, params):
+            index[record["id"]] = len(nodes["id"])
+            nodes["id"].append(record["id"])
+            nodes["name"].append(record["name"] or "")
+            nodes["degree"].append(record["degree"])
+            nodes["score"].append(record["score"])
+            pending.append(record["edges"])
+
+    # Keep only edges whose target was sampled too
+    edges = {"source": [], "target": [], "type": []}
+    type_ids: Dict[str, int] = {}
+    for source, node_edges in enumerate(pending):
+        for target_id, relation in node_edges:
+            target = index.get(target_id)
+            if target is None:
+                continue
+            edges["source"].append(source)
+            edges["target"].append(target)
+            edges["type"].append(type_ids.setdefault(relation or "RELATES_TO", len(type_ids)))
+
+    return {"sample": sample, "nodes": nodes, "edges": edges, "types": list(type_ids)}
+
+
+def _layout(graph: Dict[str, Any]) -> None:
+    """Add spiral positions (most central nodes in the middle) and sizes to a sampled graph."""
+    count = len(graph["nodes"]["id"])
+    ranks = np.arange(count)
+    radius = np.sqrt(ranks + 1.0)
+    angle = ranks * np.pi * (3.0 - np.sqrt(5.0))
+    scores = np.asarray(graph["nodes"]["score"], dtype=np.float64)
+    top = scores.max() if count and scores.max() > 0 else 1.0
+    graph["nodes"]["x"] = np.round(radius * np.cos(angle), 2).tolist()
+    graph["nodes"]["y"] = np.round(radius * np.sin(angle), 2).tolist()
+    graph["nodes"]["size"] = np.round(2 + 10 * np.sqrt(scores / top), 1).tolist()
+
+
+def _write_viewer(payload: str, output_file: str, title: str) -> None:
+    """Write the WebGL viewer page with a graph JSON payload embedded."""
+    html = (
+        GRAPH_HTML_TEMPLATE
+        .replace("__TITLE__", title.replace("<", "&lt;"))
+        .replace("__LOD_BASE__", str(LOD_BASE_NODES))
+        .replace("__DATA__", payload.replace("</", "<\\/"))
+    )
+    Path(output_file).write_text(html, encoding="utf-8")
+
 
 def visualize_graph(
     neo4j_uri: str,
     neo4j_user: str,
     neo4j_password: str,
     output_file: str = "knowledge_graph.html",
-    max_nodes: int = 100
-) -> None:
+    max_nodes: int = 100,
+    sample: str = "degree",
+    mirror=None,
+    group_id: Optional[str] = None,
+    fan_out: int = 100
+) -> Dict[str, float]:
     """
-    Visualize the knowledge graph using pyvis.
+    Visualize a sample of the knowledge graph in a WebGL viewer.
+
+    The most central entities are exported to compact JSON next to the
+    HTML file and drawn with sigma.js, which shows only the top-ranked
+    nodes when zoomed out, so samples of 100k+ nodes stay responsive.
 
     Args:
         neo4j_uri: Neo4j URI
@@ -23,102 +268,40 @@ def visualize_graph(
         neo4j_password: Neo4j password
         output_file: Output HTML file path
         max_nodes: Maximum number of nodes to visualize
+        sample: "degree" or "pagerank" (needs ``mirror``)
+        mirror: GraphMirror for PageRank sampling
+        group_id: Restrict to one group (None for all)
+        fan_out: Maximum outgoing edges read per entity
+
+    Returns:
+        Timings in seconds: export (query and stream), json and html
     """
     print(f"Generating knowledge graph visualization...")
 
-    # Connect to Neo4j
+    start_time = time.time()
     driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
-
-    # Create network
-    net = Network(
-        height="750px",
-        width="100%",
-        bgcolor="#222222",
-        font_color="white",
-        directed=True
-    )
-
-    net.barnes_hut(
-        gravity=-80000,
-        central_gravity=0.3,
-        spring_length=250,
-        spring_strength=0.001,
-        damping=0.09,
-        overlap=0
-    )
-
-    # Query graph data
-    with driver.session() as session:
-        # Get nodes
-        node_query = f"""
-        MATCH (n)
-        RETURN id(n) as id, labels(n) as labels, properties(n) as properties
-        LIMIT {max_nodes}
-        """
-        nodes = session.run(node_query)
-
-        node_ids = set()
-        for record in nodes:
-            node_id = str(record["id"])
-            labels = record["labels"]
-            props = record["properties"]
-
-            # Determine node properties
-            label = labels[0] if labels else "Node"
-            title = f"{label}\n" + "\n".join([f"{k}: {v}" for k, v in props.items()][:5])
-
-            # Color by type
-            color = "#97c2fc"  # Default blue
-            if "Entity" in labels:
-                color = "#fb7e81"  # Red for entities
-            elif "Episode" in labels:
-                color = "#7be141"  # Green for episodes
-            elif "Fact" in labels:
-                color = "#ffa500"  # Orange for facts
-
-            # Get display name
-            name = props.get("name", props.get("title", f"Node {node_id}"))
-            if len(name) > 30:
-                name = name[:27] + "..."
-
-            net.add_node(
-                node_id,
-                label=name,
-                title=title,
-                color=color,
-                size=20
-            )
-            node_ids.add(node_id)
-
-        # Get relationships
-        if node_ids:
-            rel_query = f"""
-            MATCH (a)-[r]->(b)
-            WHERE id(a) IN {list(range(max_nodes))} AND id(b) IN {list(range(max_nodes))}
-            RETURN id(a) as source, id(b) as target, type(r) as type, properties(r) as properties
-            LIMIT {max_nodes * 2}
-            """
-            relationships = session.run(rel_query)
-
-            for record in relationships:
-                source = str(record["source"])
-                target = str(record["target"])
-                rel_type = record["type"]
-
-                if source in node_ids and target in node_ids:
-                    net.add_edge(
-                        source,
-                        target,
-                        title=rel_type,
-                        label=rel_type[:20],
-                        arrows="to"
-                    )
-
-    driver.close()
-
-    # Save visualization
-    net.show(output_file)
-    print(f"Knowledge graph visualization saved to: {output_file}")
+    try:
+        graph = sample_subgraph(driver, max_nodes, sample, mirror, group_id, fan_out)
+    finally:
+        driver.close()
+    timings = {"export": time.time() - start_time}
+
+    start_time = time.time()
+    _layout(graph)
+    payload = json.dumps(graph, separators=(",", ":"))
+    json_file = Path(output_file).with_suffix(".json")
+    json_file.write_text(payload, encoding="utf-8")
+    timings["json"] = time.time() - start_time
+
+    start_time = time.time()
+    _write_viewer(payload, output_file, "Knowledge Graph")
+    timings["html"] = time.time() - start_time
+
+    print(f"Exported {len(graph['nodes']['id'])} nodes and {len(graph['edges']['source'])} edges "
+          f"(sampled by {sample}) in {timings['export']:.2f}s; "
+          f"JSON {timings['json']:.2f}s, HTML {timings['html']:.2f}s")
+    print(f"Knowledge graph visualization saved to: {output_file} (data: {json_file})")
+    return timings
 
 
 def plot_comparison_metrics(
@@ -132,6 +315,8 @@ def plot_comparison_metrics(
         results: List of comparison results from compare_systems
         output_file: Output image file path
     """
+    # Questions where either system failed have no comparable metrics
+    results = [r for r in results if not r.get('errors')]
     if not results:
         print("No results to plot")
         return
@@ -216,10 +401,413 @@ def plot_comparison_metrics(
 
     plt.tight_layout()
     plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.close(fig)
     print(f"Comparison metrics plot saved to: {output_file}")
+    print("For latency distributions over repeated runs see plot_benchmark_distributions")
+
+
+SYSTEM_COLORS = {"rag": "#3498db", "kg": "#e74c3c"}
+SYSTEM_LABELS = {"rag": "Traditional RAG", "kg": "Knowledge Graph RAG"}
+STAGE_COLORS = {"retrieval": "#2ecc71", "generation": "#f39c12", "other": "#95a5a6"}
+
+
+def _draw_cdf(ax, series: Dict[str, List[float]], title: str) -> None:
+    """Empirical latency CDF per system, with p50 and p90 marked."""
+    for system, values in series.items():
+        if not values:
+            continue
+        x = np.sort(values)
+        y = np.arange(1, len(x) + 1) / len(x)
+        color = SYSTEM_COLORS[system]
+        ax.step(x, y, where="post", color=color, label=f"{SYSTEM_LABELS[system]} (n={len(x)})")
+        for q, style in ((50, "--"), (90, ":")):
+            ax.axvline(np.percentile(x, q), color=color, linestyle=style, alpha=0.6)
+    ax.set_xlabel("Latency (seconds)")
+    ax.set_ylabel("Fraction of queries")
+    ax.set_ylim(0, 1.02)
+    ax.set_title(f"{title}\n(dashed p50, dotted p90)")
+    ax.legend(loc="lower right")
+    ax.grid(alpha=0.3)
+
+
+def _draw_violin(ax, series: Dict[str, List[float]], title: str, ylabel: str) -> None:
+    """Violin per system; systems with fewer than two distinct values are drawn as points."""
+    positions = np.arange(1, len(series) + 1)
+    for position, (system, values) in zip(positions, series.items()):
+        color = SYSTEM_COLORS[system]
+        if len(set(values)) > 1:
+            parts = ax.violinplot([values], positions=[position], showmedians=True)
+            for body in parts["bodies"]:
+                body.set_facecolor(color)
+                body.set_alpha(0.6)
+            for name in ("cbars", "cmins", "cmaxes", "cmedians"):
+                parts[name].set_color(color)
+        elif values:
+            ax.scatter([position] * len(values), values, color=color)
+    ax.set_xticks(positions)
+    ax.set_xticklabels([SYSTEM_LABELS[s] for s in series])
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.grid(axis="y", alpha=0.3)
+
+
+def _draw_stages(ax, stages: Dict[str, Any]) -> None:
+    """Median retrieval, generation and remaining time per question, stacked, one bar per system."""
+    x = np.arange(len(stages["questions"]))
+    width = 0.38
+    for offset, system, hatch in ((-width / 2, "rag", ""), (width / 2, "kg", "//")):
+        bottom = np.zeros(len(x))
+        for stage, color in STAGE_COLORS.items():
+            values = np.asarray(stages[system][stage], dtype=float)
+            ax.bar(x + offset, values, width, bottom=bottom, color=color, hatch=hatch, edgecolor="white")
+            bottom += values
+    handles = [plt.Rectangle((0, 0), 1, 1, color=color) for color in STAGE_COLORS.values()]
+    handles += [plt.Rectangle((0, 0), 1, 1, facecolor="white", edgecolor="black", hatch=h) for h in ("", "//")]
+    ax.legend(handles, [*STAGE_COLORS, SYSTEM_LABELS["rag"], SYSTEM_LABELS["kg"]], loc="upper left")
+    ax.set_xticks(x)
+    ax.set_xticklabels(stages["questions"])
+    ax.set_xlabel("Questions")
+    ax.set_ylabel("Median time (seconds)")
+    ax.set_title("Per-Stage Timing (median over trials)")
+    ax.grid(axis="y", alpha=0.3)
+
+
+def _render_panel(job: Tuple[str, str, Dict[str, Any], Tuple[str, ...], Dict[str, str]]) -> List[str]:
+    """
+    Render one figure to files; runs in a worker process.
+
+    Args:
+        job: (kind, output path without extension, data, formats, file metadata)
+
+    Returns:
+        Paths written
+    """
+    kind, base, data, formats, metadata = job
+    with plt.rc_context({"svg.hashsalt": "kgrag", "font.size": 10}):
+        if kind == "question":
+            fig, axes = plt.subplots(1, 2, figsize=(12, 4.5))
+            fig.suptitle(data["title"], fontsize=11)
+            _draw_cdf(axes[0], data["series"], "Latency CDF")
+            _draw_violin(axes[1], data["series"], "Latency Distribution", "Latency (seconds)")
+        else:
+            fig, ax = plt.subplots(figsize=(10, 6))
+            if kind == "cdf":
+                _draw_cdf(ax, data["series"], "Latency CDF (all questions)")
+            elif kind == "violin":
+                _draw_violin(ax, data["series"], "Latency Distribution (all questions)", "Latency (seconds)")
+            elif kind == "stages":
+                _draw_stages(ax, data)
+            elif kind == "throughput":
+                _draw_violin(ax, data["series"], "Generation Throughput", "Answer tokens per second")
+            else:
+                raise ValueError(f"Unknown panel: {kind}")
+        fig.tight_layout()
+
+        paths = []
+        for fmt in formats:
+            path = f"{base}.{fmt}"
+            # Fixed metadata (no timestamps) keeps reruns on the same input byte-identical
+            if fmt == "png":
+                file_metadata = {"Software": None, **metadata}
+            elif fmt == "pdf":
+                file_metadata = {"Creator": None, "Producer": None, "CreationDate": None, "Title": metadata["Title"]}
+            else:
+                file_metadata = {"Creator": None, "Date": None, "Title": metadata["Title"]}
+            fig.savefig(path, dpi=150, metadata=file_metadata)
+            paths.append(path)
+        plt.close(fig)
+    return paths
+
+
+def _median(values: List[float]) -> float:
+    return float(np.median(values)) if values else 0.0
+
+
+def plot_benchmark_distributions(
+    results: Dict[str, Any],
+    output_dir: str = "results/plots",
+    formats: Tuple[str, ...] = ("png",),
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Plot latency distributions from repeated benchmark runs.
+
+    Writes a latency CDF, a violin plot, per-stage stacked timing, the
+    generation throughput and one CDF + violin panel per question. Figures
+    render in parallel worker processes on the Agg backend and carry no
+    timestamps, so the same results always give the same files; a
+    manifest.json lists every file with its SHA-256.
+
+    Args:
+        results: Results from comparison.benchmark.run_benchmark
+        output_dir: Directory for the figures and manifest
+        formats: File formats to write ("png", "svg" and/or "pdf")
+        max_workers: Worker processes (None for one per CPU; 1 renders in-process)
+
+    Returns:
+        The manifest: source (benchmark environment and config) and
+        artifacts (name to path and sha256)
+    """
+    samples = [s for s in results["samples"] if not s.get("error")]
+    if not samples:
+        print("No successful samples to plot")
+        return {}
+
+    print(f"Generating benchmark distribution plots...")
+    start_time = time.time()
+    systems = [s for s in SYSTEM_COLORS if any(x["system"] == s for x in samples)]
+    questions = sorted({s["question_index"]: s["question"] for s in samples}.items())
+
+    def seconds(system: str, index: Optional[int] = None) -> List[float]:
+        return [s["seconds"] for s in samples
+                if s["system"] == system and (index is None or s["question_index"] == index)]
+
+    # Retrieval and generation are reported by the systems; "other" is the rest of the client-side latency
+    stages = {"questions": [f"Q{index + 1}" for index, _ in questions]}
+    for system in ("rag", "kg"):
+        stages[system] = {stage: [] for stage in STAGE_COLORS}
+        for index, _ in questions:
+            rows = [s for s in samples if s["system"] == system and s["question_index"] == index]
+            retrieval = _median([s["retrieval_seconds"] for s in rows if s.get("retrieval_seconds") is not None])
+            generation = _median([s["generation_seconds"] for s in rows if s.get("generation_seconds") is not None])
+            stages[system]["retrieval"].append(retrieval)
+            stages[system]["generation"].append(generation)
+            stages[system]["other"].append(max(_median([s["seconds"] for s in rows]) - retrieval - generation, 0.0))
+
+    throughput = {
+        system: [s["answer_tokens"] / s["generation_seconds"] for s in samples
+                 if s["system"] == system and s.get("answer_tokens") and s.get("generation_seconds")]
+        for system in systems
+    }
+
+    environment = results.get("environment", {})
+    config = results.get("config", {})
+    metadata = {
+        "Source": f"commit {environment.get('git_commit')} on {environment.get('host')}",
+        "Description": f"{config.get('trials')} trials x {config.get('questions')} questions, "
+                       f"kg_mode={config.get('kg_mode')}, run at {environment.get('timestamp')}"
+    }
+
+    directory = Path(output_dir)
+    (directory / "questions").mkdir(parents=True, exist_ok=True)
+    all_seconds = {system: seconds(system) for system in systems}
+    jobs = [
+        ("cdf", str(directory / "latency_cdf"), {"series": all_seconds}),
+        ("violin", str(directory / "latency_violin"), {"series": all_seconds}),
+        ("stages", str(directory / "stage_timing"), stages),
+        ("throughput", str(directory / "tokens_per_second"), {"series": throughput}),
+    ]
+    for index, question in questions:
+        jobs.append((
+            "question",
+            str(directory / "questions" / f"q{index + 1:03d}"),
+            {"title": f"Q{index + 1}: {question}", "series": {system: seconds(system, index) for system in systems}}
+        ))
+    jobs = [(kind, base, data, tuple(formats), {"Title": Path(base).name, **metadata}) for kind, base, data in jobs]
+
+    if max_workers == 1:
+        rendered = [_render_panel(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            rendered = list(pool.map(_render_panel, jobs))
+
+    artifacts = {}
+    for paths in rendered:
+        for path in paths:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            artifacts[os.path.relpath(path, directory)] = {"path": path, "sha256": digest}
+    manifest = {
+        "source": {"environment": environment, "config": config, "samples": len(samples)},
+        "artifacts": artifacts
+    }
+    with open(directory / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"Rendered {len(artifacts)} plot file(s) in {time.time() - start_time:.2f}s to: {output_dir}")
+    return manifest
+
+
+def fetch_ego_networks(
+    driver,
+    entity_names: List[str],
+    hops: int = 1,
+    group_id: Optional[str] = None,
+    max_edges: int = 200,
+    batch_size: int = 100,
+    max_workers: int = 8
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, Any]]]:
+    """
+    Fetch the k-hop ego networks of many entities.
+
+    Names are sent in batches of one UNWIND query each; batches run in
+    parallel sessions of the same driver, so they share its connection pool.
+
+    Args:
+        driver: Neo4j driver
+        entity_names: Entities to expand
+        hops: Radius of each ego network
+        group_id: Restrict to one group (None for all)
+        max_edges: Maximum distinct edges per entity
+        batch_size: Entity names per query
+        max_workers: Queries in flight at once
+
+    Returns:
+        Tuple of (node names by element id, shared by all ego networks;
+        mapping of entity name to its centers and edges). Entities not
+        found in the graph are absent from the mapping.
+    """
+    if hops < 1:
+        raise ValueError("hops must be at least 1")
+    query = EGO_NETWORKS_QUERY % int(hops)
+    names = list(dict.fromkeys(entity_names))
+    batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+
+    def run_batch(batch: List[str]) -> List[Dict[str, Any]]:
+        with driver.session() as session:
+            return session.run(query, names=batch, group_id=group_id, max_edges=max_edges).data()
+
+    nodes: Dict[str, str] = {}
+    egos: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for records in pool.map(run_batch, batches):
+            for record in records:
+                name = record["entity_name"]
+                # Entities sharing a name are merged into one ego network
+                ego = egos.setdefault(name, {"centers": [], "edges": {}})
+                ego["centers"].append(record["center"])
+                nodes.setdefault(record["center"], name)
+                for source, source_name, target, target_name, relation in record["edges"]:
+                    nodes.setdefault(source, source_name or "")
+                    nodes.setdefault(target, target_name or "")
+                    ego["edges"][(source, target, relation or "RELATES_TO")] = None
+
+    return nodes, egos
+
+
+def _ego_graph(nodes: Dict[str, str], centers: List[str], edges: List[tuple], label: str) -> Dict[str, Any]:
+    """Build a viewer graph with the centers first and the rest ranked by degree within the ego network."""
+    degree: Dict[str, int] = {}
+    for source, target, _ in edges:
+        degree[source] = degree.get(source, 0) + 1
+        degree[target] = degree.get(target, 0) + 1
+    center_set = set(centers)
+    others = sorted((n for n in degree if n not in center_set), key=lambda n: -degree[n])
+    order = list(dict.fromkeys(centers)) + others
+    index = {node_id: i for i, node_id in enumerate(order)}
+
+    top = max(degree.values(), default=0) + 1
+    type_ids: Dict[str, int] = {}
+    graph = {
+        "sample": label,
+        "nodes": {
+            "id": order,
+            "name": [nodes[n] for n in order],
+            "degree": [degree.get(n, 0) for n in order],
+            # Centers get the largest score so they are drawn largest
+            "score": [top if n in center_set else degree[n] for n in order]
+        },
+        "edges": {"source": [], "target": [], "type": []},
+        "types": []
+    }
+    for source, target, relation in edges:
+        graph["edges"]["source"].append(index[source])
+        graph["edges"]["target"].append(index[target])
+        graph["edges"]["type"].append(type_ids.setdefault(relation, len(type_ids)))
+    graph["types"] = list(type_ids)
+    _layout(graph)
+    return graph
+
+
+def _slug(name: str) -> str:
+    """File-name-safe version of an entity name."""
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_")[:60] or "entity"
+
 
-    # Also display the plot
-    plt.show()
+def create_ego_networks(
+    neo4j_uri: str,
+    neo4j_user: str,
+    neo4j_password: str,
+    entity_names: List[str],
+    output_dir: str = "ego_networks",
+    hops: int = 1,
+    combined: bool = False,
+    group_id: Optional[str] = None,
+    max_edges: int = 200,
+    batch_size: int = 100,
+    max_workers: int = 8,
+    driver=None
+) -> Dict[str, Any]:
+    """
+    Create ego-network diagrams for many entities at once.
+
+    Args:
+        neo4j_uri: Neo4j URI
+        neo4j_user: Neo4j username
+        neo4j_password: Neo4j password
+        entity_names: Entities to diagram
+        output_dir: Directory for the HTML files
+        hops: Radius of each ego network
+        combined: Write one file with all ego networks (shared nodes drawn
+            once) instead of one file per entity
+        group_id: Restrict to one group (None for all)
+        max_edges: Maximum distinct edges per entity
+        batch_size: Entity names per query
+        max_workers: Parallel queries and file writes
+        driver: Existing Neo4j driver to reuse (the URI and credentials
+            are ignored when given)
+
+    Returns:
+        Dictionary with files (entity name, or "combined", to path),
+        missing (entities not found), nodes, edges and timings
+        (query and write seconds)
+    """
+    print(f"Creating {hops}-hop ego networks for {len(entity_names)} entities...")
+
+    start_time = time.time()
+    owns_driver = driver is None
+    if owns_driver:
+        driver = GraphDatabase.driver(
+            neo4j_uri, auth=(neo4j_user, neo4j_password), max_connection_pool_size=max(max_workers, 1)
+        )
+    try:
+        nodes, egos = fetch_ego_networks(driver, entity_names, hops, group_id, max_edges, batch_size, max_workers)
+    finally:
+        if owns_driver:
+            driver.close()
+    timings = {"query": time.time() - start_time}
+
+    start_time = time.time()
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    found = [name for name in dict.fromkeys(entity_names) if name in egos]
+    all_edges = {edge: None for ego in egos.values() for edge in ego["edges"]}
+
+    if combined:
+        centers = [center for name in found for center in egos[name]["centers"]]
+        graph = _ego_graph(nodes, centers, list(all_edges), f"{hops}-hop ego networks")
+        path = str(directory / "ego_networks.html")
+        _write_viewer(json.dumps(graph, separators=(",", ":")), path, f"Ego networks ({len(found)} entities)")
+        files = {"combined": path}
+    else:
+        def write_one(item: Tuple[int, str]) -> Tuple[str, str]:
+            i, name = item
+            ego = egos[name]
+            graph = _ego_graph(nodes, ego["centers"], list(ego["edges"]), f"{hops}-hop ego network")
+            path = str(directory / f"{i:04d}_{_slug(name)}.html")
+            _write_viewer(json.dumps(graph, separators=(",", ":")), path, name)
+            return name, path
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            files = dict(pool.map(write_one, enumerate(found)))
+    timings["write"] = time.time() - start_time
+
+    missing = [name for name in dict.fromkeys(entity_names) if name not in egos]
+    print(f"Fetched {len(found)} ego networks ({len(nodes)} unique nodes, {len(all_edges)} edges) "
+          f"in {timings['query']:.2f}s; wrote {len(files)} file(s) in {timings['write']:.2f}s")
+    if missing:
+        print(f"Entities not found: {', '.join(missing[:10])}{' ...' if len(missing) > 10 else ''}")
+    return {"files": files, "missing": missing, "nodes": len(nodes), "edges": len(all_edges), "timings": timings}
 
 
 def create_entity_relationship_diagram(
@@ -242,49 +830,12 @@ def create_entity_relationship_diagram(
     print(f"Creating entity relationship diagram for: {entity_name}")
 
     driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
-
-    net = Network(
-        height="600px",
-        width="100%",
-        bgcolor="#ffffff",
-        font_color="black",
-        directed=True
-    )
-
-    with driver.session() as session:
-        # Get entity and connected nodes
-        query = """
-        MATCH (e:Entity {name: $entity_name})-[r]-(connected)
-        RETURN e, r, connected
-        LIMIT 50
-        """
-        results = session.run(query, entity_name=entity_name)
-
-        nodes_added = set()
-
-        for record in results:
-            entity = record["e"]
-            relationship = record["r"]
-            connected = record["connected"]
-
-            # Add entity node
-            entity_id = str(id(entity))
-            if entity_id not in nodes_added:
-                net.add_node(entity_id, label=entity["name"], color="#e74c3c", size=30)
-                nodes_added.add(entity_id)
-
-            # Add connected node
-            connected_id = str(id(connected))
-            if connected_id not in nodes_added:
-                label = connected.get("name", connected.get("title", "Node"))
-                net.add_node(connected_id, label=label[:30], color="#3498db", size=20)
-                nodes_added.add(connected_id)
-
-            # Add relationship
-            rel_type = type(relationship).__name__
-            net.add_edge(entity_id, connected_id, label=rel_type, arrows="to")
-
-    driver.close()
-
-    net.show(output_file)
+    try:
+        nodes, egos = fetch_ego_networks(driver, [entity_name], hops=1, max_edges=50)
+    finally:
+        driver.close()
+
+    ego = egos.get(entity_name, {"centers": [], "edges": {}})
+    graph = _ego_graph(nodes, ego["centers"], list(ego["edges"]), "1-hop ego network")
+    _write_viewer(json.dumps(graph, separators=(",", ":")), output_file, entity_name)
     print(f"Entity relationship diagram saved to: {output_file}")
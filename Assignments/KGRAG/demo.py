@@ -8,8 +8,10 @@ using the CloudStore API documentation as sample data.
 import os
 import asyncio
 import random
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 from dotenv import load_dotenv
 from rich.console import Console
@@ -19,12 +21,14 @@ from rich.table import Table
 from rich import box
 
 from traditional_rag import TraditionalRAG
-from knowledge_graph import KnowledgeGraphRAG
+from knowledge_graph import KnowledgeGraphRAG, LLMCache
 from comparison import compare_systems, run_comparison_suite, plot_comparison_metrics, visualize_graph
 
 console = Console()
 
 
+DOCUMENT_PATH = "sample_data/py_best_practice.txt"
+
 # Sample questions that highlight KG advantages
 DEMO_QUESTIONS = [
     "What is PEP 8 and why is it important in Python projects?",
@@ -55,17 +59,31 @@ def display_comparison_interactive(comparison: Dict[str, Any]) -> None:
 
     console.print(Panel(comparison["question"], title="[bold]Question[/bold]", border_style="yellow"))
 
+    errors = comparison["errors"]
     console.print("\n[bold cyan]Traditional RAG Answer:[/bold cyan]")
-    console.print(Panel(comparison["rag_result"]["answer"], border_style="blue"))
+    if comparison["rag_result"]:
+        console.print(Panel(comparison["rag_result"]["answer"], border_style="blue"))
+    else:
+        console.print(Panel(f"Query failed: {errors['rag']}", border_style="red"))
 
     console.input("\n[dim]Press Enter to see Knowledge Graph answer...[/dim]")
 
     console.print("\n[bold magenta]Knowledge Graph RAG Answer:[/bold magenta]")
-    console.print(Panel(comparison["kg_result"]["answer"], border_style="magenta"))
+    if comparison["kg_result"]:
+        console.print(Panel(comparison["kg_result"]["answer"], border_style="magenta"))
+    else:
+        console.print(Panel(f"Query failed: {errors['kg']}", border_style="red"))
+
+    m = comparison["comparison_metrics"]
+    console.print(
+        f"\n[dim]Both systems queried concurrently: wall time {m['wall_time']:.2f}s, "
+        f"overlap {m['overlap']:.2f}s[/dim]"
+    )
+    if errors:
+        return
 
     console.input("\n[dim]Press Enter to see metrics...[/dim]")
 
-    m = comparison["comparison_metrics"]
     rag_time, kg_time = m["rag_time"], m["kg_time"]
     speedup = m["speedup"]
     time_diff = "RAG faster" if speedup < 1 else f"KG faster ({speedup:.2f}x)"
@@ -99,12 +117,9 @@ def setup_environment():
     """Load and validate environment variables."""
     load_dotenv()
 
-    required_vars = [
-        "OPENAI_API_KEY",
-        "NEO4J_URI",
-        "NEO4J_USERNAME",
-        "NEO4J_PASSWORD"
-    ]
+    required_vars = ["OPENAI_API_KEY"]
+    if os.getenv("KG_BACKEND", "neo4j") == "neo4j":
+        required_vars += ["NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD"]
 
     missing_vars = [var for var in required_vars if not os.getenv(var)]
 
@@ -118,51 +133,139 @@ def setup_environment():
     return True
 
 
+async def _timed(timings: Dict[str, float], stage: str, awaitable):
+    """Await a startup stage, recording how long it took."""
+    start = time.perf_counter()
+    result = await awaitable
+    timings[stage] = time.perf_counter() - start
+    return result
+
+
+def display_startup_timings(timings: Dict[str, float], wall: float) -> None:
+    """Display how long each startup stage took."""
+    table = Table(title="Startup Timing", box=box.ROUNDED)
+    table.add_column("Stage", style="cyan")
+    table.add_column("Seconds", style="magenta", justify="right")
+    for stage, seconds in timings.items():
+        table.add_row(stage, f"{seconds:.3f}")
+    table.add_row("[bold]Total (wall)[/bold]", f"[bold]{wall:.3f}[/bold]")
+    console.print(table)
+    console.print(f"[dim]RAG and KG start concurrently; the stages sum to {sum(timings.values()):.3f}s[/dim]\n")
+
+
+def create_rag_system() -> TraditionalRAG:
+    """Create the Traditional RAG system from the environment (no index yet)."""
+    return TraditionalRAG(
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        model_name=os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
+        embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+        base_url=os.getenv("OPENAI_BASE_URL")
+    )
+
+
+def create_kg_system() -> KnowledgeGraphRAG:
+    """Create the Knowledge Graph RAG system from the environment."""
+    return KnowledgeGraphRAG(
+        neo4j_uri=os.getenv("NEO4J_URI"),
+        neo4j_user=os.getenv("NEO4J_USERNAME"),
+        neo4j_password=os.getenv("NEO4J_PASSWORD"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        model_name=os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
+        backend=os.getenv("KG_BACKEND", "neo4j"),
+        sqlite_path=os.getenv("KG_SQLITE_PATH", "knowledge_graph.db"),
+        llm_cache=LLMCache(
+            path=os.getenv("LLM_CACHE_PATH", "llm_cache/responses.db"),
+            max_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "512")) * 1024 * 1024
+        ),
+        base_url=os.getenv("OPENAI_BASE_URL")
+    )
+
+
+async def start_systems(doc_path: Path, rag: bool = True) -> Tuple[Any, Any, Dict[str, Any], Dict[str, float]]:
+    """
+    Start both systems concurrently.
+
+    Args:
+        doc_path: Document the RAG index is built from
+        rag: Also start the Traditional RAG system (False for graph-only tasks)
+
+    Returns:
+        Tuple of (rag_system or None, kg_system, graph statistics, stage timings)
+    """
+    timings: Dict[str, float] = {}
+
+    async def init_rag():
+        rag_system = await _timed(timings, "RAG: create clients", asyncio.to_thread(create_rag_system))
+        # The FAISS index is reused while the document and settings are unchanged
+        index_dir = os.getenv("VECTOR_INDEX_DIR", "vector_index")
+        start = time.perf_counter()
+        loaded = await asyncio.to_thread(rag_system.load_or_build_index, str(doc_path), index_dir)
+        timings["RAG: load index" if loaded else "RAG: chunk, embed and save index"] = time.perf_counter() - start
+        console.print("[green][OK] Traditional RAG initialized[/green]")
+        return rag_system
+
+    async def init_kg():
+        kg_system = await _timed(timings, "KG: connect", asyncio.to_thread(create_kg_system))
+
+        # Build required Neo4j indexes and constraints while reading the statistics
+        setup = []
+        if kg_system.graphiti is not None:
+            setup.append(_timed(timings, "KG: indexes and constraints",
+                                kg_system.graphiti.build_indices_and_constraints()))
+        setup.append(_timed(timings, "KG: graph statistics", asyncio.to_thread(kg_system.get_graph_statistics)))
+        stats = (await asyncio.gather(*setup))[-1]
+        console.print("[green][OK] Knowledge Graph RAG connected[/green]")
+        return kg_system, stats
+
+    rag_result, kg_result = await asyncio.gather(
+        init_rag() if rag else asyncio.sleep(0), init_kg(), return_exceptions=True
+    )
+    if isinstance(rag_result, BaseException):
+        if not isinstance(kg_result, BaseException):
+            kg_result[0].close()
+        raise rag_result
+    if isinstance(kg_result, BaseException):
+        raise kg_result
+    kg_system, stats = kg_result
+    return rag_result, kg_system, stats, timings
+
+
+async def build_graph(rag_system, kg_system, doc_path: Path) -> Dict[str, Any]:
+    """
+    Ingest a document into the knowledge graph, chunked as for the RAG index.
+
+    Args:
+        rag_system: TraditionalRAG instance (for its text splitter)
+        kg_system: KnowledgeGraphRAG instance
+        doc_path: Document to ingest
+
+    Returns:
+        Graph statistics after the build
+    """
+    doc_texts = [doc.page_content for doc in rag_system.load_documents(str(doc_path))]
+    # The file's modification time stands in for the document date
+    written_at = datetime.fromtimestamp(doc_path.stat().st_mtime)
+    await kg_system.add_documents_to_graph(
+        doc_texts, source=doc_path.stem, timestamps=[written_at] * len(doc_texts)
+    )
+    return kg_system.get_graph_statistics()
+
+
 async def initialize_systems():
     """Initialize both RAG systems."""
     console.print("\n[bold cyan]Initializing Systems...[/bold cyan]\n")
 
-    # Load configuration
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    neo4j_uri = os.getenv("NEO4J_URI")
-    neo4j_username = os.getenv("NEO4J_USERNAME")
-    neo4j_password = os.getenv("NEO4J_PASSWORD")
-    model_name = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
-    embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
-
-    # Initialize Traditional RAG
-    console.print("[yellow]1. Initializing Traditional RAG...[/yellow]")
-    rag_system = TraditionalRAG(
-        openai_api_key=openai_api_key,
-        model_name=model_name,
-        embedding_model=embedding_model
-    )
-
-    # Load and index documents
-    doc_path = Path("sample_data/py_best_practice.txt")
+    doc_path = Path(DOCUMENT_PATH)
     if not doc_path.exists():
         console.print(f"[bold red]Error: Sample data not found at {doc_path}[/bold red]")
         return None, None
 
-    documents = rag_system.load_documents(str(doc_path))
-    rag_system.build_index(documents)
-    console.print("[green][OK] Traditional RAG initialized[/green]\n")
-
-    # Initialize Knowledge Graph RAG
-    console.print("[yellow]2. Initializing Knowledge Graph RAG...[/yellow]")
-    kg_system = KnowledgeGraphRAG(
-        neo4j_uri=neo4j_uri,
-        neo4j_user=neo4j_username,
-        neo4j_password=neo4j_password,
-        openai_api_key=openai_api_key,
-        model_name=model_name
-    )
-
-    # Build required Neo4j indexes and constraints
-    await kg_system.graphiti.build_indices_and_constraints()
+    console.print("[yellow]Initializing Traditional RAG and Knowledge Graph RAG...[/yellow]")
+    startup = time.perf_counter()
+    rag_system, kg_system, stats, timings = await start_systems(doc_path)
+    display_startup_timings(timings, time.perf_counter() - startup)
 
     # Check if we should rebuild the graph
-    stats = kg_system.get_graph_statistics()
     if stats['total_nodes'] > 0:
         console.print(f"[yellow]Found existing graph with {stats['total_nodes']} nodes[/yellow]")
         rebuild = Confirm.ask("Do you want to rebuild the knowledge graph?", default=False)
@@ -173,11 +276,7 @@ async def initialize_systems():
     # Build knowledge graph if needed
     if stats['total_nodes'] == 0:
         console.print("[yellow]Building knowledge graph (this may take a few minutes)...[/yellow]")
-        # Split documents for KG
-        doc_texts = [doc.page_content for doc in documents]
-        await kg_system.add_documents_to_graph(doc_texts, source="py_best_practice")
-
-        stats = kg_system.get_graph_statistics()
+        stats = await build_graph(rag_system, kg_system, doc_path)
         console.print(f"[green][OK] Knowledge Graph initialized[/green]")
         console.print(f"  - Nodes: {stats['total_nodes']}")
         console.print(f"  - Relationships: {stats['total_relationships']}")
@@ -251,12 +350,20 @@ def visualize_knowledge_graph(kg_system):
     """Generate knowledge graph visualization."""
     console.print("\n[bold cyan]Generating Knowledge Graph Visualization[/bold cyan]\n")
 
+    if kg_system.backend != "neo4j":
+        console.print("[yellow]Visualization reads from Neo4j; it is not available for the "
+                      f"{kg_system.backend} backend[/yellow]")
+        return
+
     visualize_graph(
         neo4j_uri=os.getenv("NEO4J_URI"),
         neo4j_user=os.getenv("NEO4J_USERNAME"),
         neo4j_password=os.getenv("NEO4J_PASSWORD"),
         output_file="knowledge_graph.html",
-        max_nodes=100
+        max_nodes=2000,
+        # Rank by PageRank when the in-process mirror is available, else by degree
+        sample="pagerank" if kg_system.mirror is not None else "degree",
+        mirror=kg_system.mirror
     )
 
     console.print("[green][OK] Visualization saved to: knowledge_graph.html[/green]")
@@ -337,6 +444,11 @@ async def main():
             console.print(f"  - Total Relationships: {stats['total_relationships']}")
             console.print(f"  - Entities: {stats['num_entities']}")
             console.print(f"  - Episodes: {stats['num_episodes']}")
+            types = ", ".join(f"{name}: {count}" for name, count in stats['relationship_types'].items())
+            console.print(f"  - Relationship types: {types}")
+            degree = stats['degree']
+            console.print(f"  - Entity degree: p50 {degree['p50']}, p90 {degree['p90']}, "
+                          f"p99 {degree['p99']}, max {degree['max']}")
         elif choice == "6":
             console.print("\n[bold green]Thank you for using the demo![/bold green]")
             kg_system.close()
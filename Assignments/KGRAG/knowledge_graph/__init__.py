@@ -2,5 +2,28 @@
 
 from .kg_pipeline import KnowledgeGraphRAG
 from .query import query_kg
+from .graph_mirror import GraphMirror
+from .graph_store import GraphStore
+from .neo4j_store import Neo4jGraphStore
+from .sqlite_store import SQLiteGraphStore
+from .llm_cache import LLMCache
+from .communities import CommunityIndex
+from .entity_index import EntityIndex
+from .metrics import render_metrics, start_metrics_server
+from .bulk_load import extract_to_jsonl, load_jsonl
 
-__all__ = ['KnowledgeGraphRAG', 'query_kg']
+__all__ = [
+    'KnowledgeGraphRAG',
+    'query_kg',
+    'GraphMirror',
+    'GraphStore',
+    'Neo4jGraphStore',
+    'SQLiteGraphStore',
+    'LLMCache',
+    'CommunityIndex',
+    'EntityIndex',
+    'render_metrics',
+    'start_metrics_server',
+    'extract_to_jsonl',
+    'load_jsonl'
+]
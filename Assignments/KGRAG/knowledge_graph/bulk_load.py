@@ -0,0 +1,214 @@
+"""Two-phase bulk load: extract a corpus to JSONL offline, then write it to a store in large batches."""
+
+import asyncio
+import json
+import time
+import uuid as uuid_lib
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Callable, Awaitable
+
+from .graph_store import GraphStore, to_utc
+
+# Extraction function: chunk texts -> one {"entities", "relations"} dictionary per chunk
+ExtractFn = Callable[[List[str]], Awaitable[List[Dict[str, List[Dict[str, Any]]]]]]
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of an extraction file.
+
+    Args:
+        path: JSONL file written by extract_to_jsonl
+
+    Returns:
+        Iterator over one dictionary per chunk
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+async def _embed(embeddings, graphs: List[Dict[str, List[Dict[str, Any]]]]) -> None:
+    """Add name_embedding to entities and fact_embedding to relations, in two batched calls."""
+    names = list(dict.fromkeys(e["name"] for g in graphs for e in g["entities"]))
+    facts = list(dict.fromkeys(r["fact"] for g in graphs for r in g["relations"] if r.get("fact")))
+    name_vectors = dict(zip(names, await embeddings.aembed_documents(names))) if names else {}
+    fact_vectors = dict(zip(facts, await embeddings.aembed_documents(facts))) if facts else {}
+    for graph in graphs:
+        for entity in graph["entities"]:
+            entity["name_embedding"] = name_vectors.get(entity["name"])
+        for relation in graph["relations"]:
+            relation["fact_embedding"] = fact_vectors.get(relation.get("fact"))
+
+
+async def extract_to_jsonl(
+    extract: ExtractFn,
+    episodes: List[Dict[str, Any]],
+    path: str,
+    source: str = "",
+    batch_size: int = 10,
+    max_concurrency: int = 4,
+    embeddings=None
+) -> Dict[str, Any]:
+    """
+    Phase one: extract entities and relations for every chunk and append them to a JSONL file.
+
+    Chunks already in the file (by episode name) are skipped, so an
+    interrupted extraction resumes where it stopped. Batches are extracted
+    concurrently; lines are written as batches finish.
+
+    Args:
+        extract: Async function extracting a batch of chunk texts
+        episodes: Dictionaries with name, content, source_description and reference_time
+        path: JSONL file to append to
+        source: Source identifier stored with every record
+        batch_size: Chunks per extraction call
+        max_concurrency: Extraction calls in flight at once
+        embeddings: Optional LangChain embeddings; entity names and facts
+            are embedded here so the load needs no API calls
+
+    Returns:
+        Dictionary with chunks, skipped, seconds and chunks_per_second
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    done = {record["name"] for record in read_records(path)} if path.exists() else set()
+    pending = [episode for episode in episodes if episode["name"] not in done]
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    print(f"Extracting {len(pending)} chunks to {path} ({len(episodes) - len(pending)} already extracted)...")
+    start_time = time.time()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    written = 0
+
+    with open(path, "a", encoding="utf-8") as f:
+        async def run(batch: List[Dict[str, Any]]) -> None:
+            nonlocal written
+            async with semaphore:
+                graphs = await extract([episode["content"] for episode in batch])
+                if embeddings is not None:
+                    await _embed(embeddings, graphs)
+            for episode, graph in zip(batch, graphs):
+                record = {
+                    "name": episode["name"],
+                    "source": source,
+                    "content": episode["content"],
+                    "source_description": episode["source_description"],
+                    "reference_time": episode["reference_time"].isoformat(),
+                    "entities": graph["entities"],
+                    "relations": graph["relations"]
+                }
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            written += len(batch)
+            print(f"  Extracted {written}/{len(pending)} chunks...")
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+
+    seconds = time.time() - start_time
+    return {
+        "chunks": written,
+        "skipped": len(episodes) - len(pending),
+        "seconds": seconds,
+        "chunks_per_second": written / seconds if seconds > 0 else 0.0
+    }
+
+
+def stage_records(records: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Turn extraction records into the row lists GraphStore.bulk_write takes.
+
+    Entities are deduplicated by name. Mentions and edges refer to entities
+    by name because the store may already hold them under another uuid.
+
+    Args:
+        records: Records from read_records
+
+    Returns:
+        Dictionary with episodes, entities, mentions and edges rows
+    """
+    episodes, mentions, edges = [], [], []
+    entities: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        episode_uuid = str(uuid_lib.uuid4())
+        reference_time = to_utc(datetime.fromisoformat(record["reference_time"]))
+        episodes.append({
+            "uuid": episode_uuid,
+            "name": record["name"],
+            "content": record["content"],
+            "source_description": record["source_description"],
+            "reference_time": reference_time
+        })
+
+        names = set()
+        for entity in record["entities"]:
+            names.add(entity["name"])
+            entities.setdefault(entity["name"], {
+                "uuid": str(uuid_lib.uuid4()),
+                "name": entity["name"],
+                "type": entity.get("type", "Entity"),
+                "summary": entity.get("summary", ""),
+                "name_embedding": entity.get("name_embedding")
+            })
+        mentions.extend({"episode_uuid": episode_uuid, "entity_name": name} for name in sorted(names))
+
+        for relation in record["relations"]:
+            if relation["source"] not in names or relation["target"] not in names:
+                continue
+            edges.append({
+                "uuid": str(uuid_lib.uuid4()),
+                "source_name": relation["source"],
+                "target_name": relation["target"],
+                "relation": relation["relation"],
+                "fact": relation["fact"],
+                "episode_uuid": episode_uuid,
+                "valid_at": reference_time,
+                "fact_embedding": relation.get("fact_embedding")
+            })
+
+    return {"episodes": episodes, "entities": list(entities.values()), "mentions": mentions, "edges": edges}
+
+
+def load_jsonl(store: GraphStore, path: str, group_id: str = "", batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Phase two: write an extraction file to a store, ``batch_size`` chunks per bulk write.
+
+    Indexes are created first so entity merges and edge lookups are seeks.
+
+    Args:
+        store: Graph store to load into
+        path: JSONL file written by extract_to_jsonl
+        group_id: Graph partition for the loaded data
+        batch_size: Chunks staged and written per bulk write
+
+    Returns:
+        Dictionary with episodes, entities, edges, seconds, nodes_per_second
+        and edges_per_second
+    """
+    store.ensure_indexes()
+    print(f"Bulk loading {path} into {store.backend_name}...")
+    start_time = time.time()
+    totals = {"episodes": 0, "entities": 0, "edges": 0}
+
+    records = read_records(path)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        counts = store.bulk_write(stage_records(batch), group_id)
+        for key in totals:
+            totals[key] += counts[key]
+        print(f"  Loaded {totals['episodes']} chunks, {totals['entities']} entities, {totals['edges']} edges...")
+
+    seconds = time.time() - start_time
+    nodes = totals["episodes"] + totals["entities"]
+    print(f"Bulk load finished in {seconds:.2f}s ({nodes / seconds if seconds > 0 else 0:.0f} nodes/s)")
+    return {
+        **totals,
+        "seconds": seconds,
+        "nodes_per_second": nodes / seconds if seconds > 0 else 0.0,
+        "edges_per_second": totals["edges"] / seconds if seconds > 0 else 0.0
+    }
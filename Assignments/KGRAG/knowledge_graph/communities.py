@@ -0,0 +1,259 @@
+"""Precomputed community summaries for global questions over the entity graph."""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import networkx as nx
+
+from .extraction import _load_json
+from .graph_store import GraphStore
+
+
+SUMMARY_PROMPT = """You are summarising one community of closely related entities from the CloudStore API documentation knowledge graph.
+
+Entities: {entities}
+
+Facts:
+{facts}
+
+Return ONLY valid JSON like:
+{{"title": "Short community title", "summary": "3-5 sentences describing what these entities are, how they relate and why they matter"}}"""
+
+
+def _terms(text: str) -> set:
+    return {term for term in re.findall(r"\w+", text.lower()) if len(term) > 2}
+
+
+class CommunityIndex:
+    """
+    Louvain communities of the entity graph with one LLM summary each.
+
+    Every community carries a signature hashed from its member and edge
+    uuids. On refresh the graph is re-partitioned and only communities whose
+    signature changed are summarised again; the rest reuse their stored
+    summary, so adding a few documents costs a handful of LLM calls.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        resolution: float = 1.0,
+        max_facts: int = 40,
+        max_concurrency: int = 4,
+        seed: int = 42
+    ):
+        """
+        Initialize the community index.
+
+        Args:
+            path: JSON file the summaries are loaded from and saved to
+            resolution: Louvain resolution (higher gives smaller communities)
+            max_facts: Maximum facts per community shown to the summariser
+            max_concurrency: Maximum concurrent summarisation calls
+            seed: Random seed, so unchanged graphs keep the same partition
+        """
+        self.path = path
+        self.resolution = resolution
+        self.max_facts = max_facts
+        self.max_concurrency = max_concurrency
+        self.seed = seed
+        self.communities: List[Dict[str, Any]] = []
+
+        if path and Path(path).exists():
+            with open(path, "r", encoding="utf-8") as f:
+                self.communities = json.load(f)["communities"]
+
+    def detect(self, edges: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Partition the entity graph into communities.
+
+        Args:
+            edges: Edges from GraphStore.iter_edges
+
+        Returns:
+            Communities (largest first) with members, names, edges and signature
+        """
+        graph = nx.Graph()
+        names = {}
+        for edge in edges:
+            names[edge["source_uuid"]] = edge["source_name"]
+            names[edge["target_uuid"]] = edge["target_name"]
+            if edge["source_uuid"] == edge["target_uuid"]:
+                continue
+            if graph.has_edge(edge["source_uuid"], edge["target_uuid"]):
+                graph[edge["source_uuid"]][edge["target_uuid"]]["weight"] += 1
+            else:
+                graph.add_edge(edge["source_uuid"], edge["target_uuid"], weight=1)
+        graph.add_nodes_from(names)
+
+        partition = nx.community.louvain_communities(
+            graph, weight="weight", resolution=self.resolution, seed=self.seed
+        )
+
+        membership = {}
+        for index, members in enumerate(partition):
+            for member in members:
+                membership[member] = index
+        community_edges = [[] for _ in partition]
+        for edge in edges:
+            index = membership[edge["source_uuid"]]
+            if membership[edge["target_uuid"]] == index:
+                community_edges[index].append(edge)
+
+        communities = []
+        for members, inner in zip(partition, community_edges):
+            # Singletons without any edge carry nothing worth summarising
+            if not inner:
+                continue
+            members = sorted(members)
+            digest = hashlib.sha256()
+            for uuid in members + sorted(edge["uuid"] for edge in inner):
+                digest.update(uuid.encode("utf-8"))
+            communities.append({
+                "signature": digest.hexdigest(),
+                "members": members,
+                "names": sorted({names[uuid] for uuid in members}),
+                "edges": inner
+            })
+
+        communities.sort(key=lambda c: len(c["members"]), reverse=True)
+        return communities
+
+    async def _summarize(self, llm, community: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict[str, str]:
+        """Summarise one community with a single LLM call."""
+        # Newest facts first, de-duplicated
+        facts = list(dict.fromkeys(
+            edge["fact"] for edge in reversed(community["edges"]) if edge.get("fact")
+        ))[:self.max_facts]
+        prompt = SUMMARY_PROMPT.format(
+            entities=", ".join(community["names"]),
+            facts="\n".join(f"- {fact}" for fact in facts)
+        )
+        async with semaphore:
+            response = await llm.ainvoke(prompt)
+
+        data = _load_json(response.content)
+        if isinstance(data, dict) and data.get("summary"):
+            return {"title": data.get("title") or community["names"][0], "summary": data["summary"]}
+        return {"title": community["names"][0], "summary": response.content.strip()}
+
+    async def refresh(self, store: GraphStore, llm) -> Dict[str, Any]:
+        """
+        Re-detect communities and summarise those that changed.
+
+        Args:
+            store: Graph store to read edges from
+            llm: LangChain chat model used for the summaries
+
+        Returns:
+            Dictionary with communities, summarized, reused, llm_calls and seconds
+        """
+        start_time = time.time()
+        edges = await asyncio.to_thread(lambda: list(store.iter_edges()))
+        detected = await asyncio.to_thread(self.detect, edges)
+
+        previous = {c["signature"]: c for c in self.communities}
+        changed = [c for c in detected if c["signature"] not in previous]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        summaries = await asyncio.gather(*(self._summarize(llm, c, semaphore) for c in changed))
+        new_summaries = {c["signature"]: s for c, s in zip(changed, summaries)}
+
+        communities = []
+        for index, community in enumerate(detected):
+            summary = new_summaries.get(community["signature"]) or previous[community["signature"]]
+            communities.append({
+                "id": index,
+                "signature": community["signature"],
+                "title": summary["title"],
+                "summary": summary["summary"],
+                "size": len(community["members"]),
+                "members": community["members"],
+                "names": community["names"]
+            })
+        self.communities = communities
+        if self.path:
+            self.save(self.path)
+
+        elapsed = time.time() - start_time
+        print(f"Communities refreshed: {len(communities)} communities, "
+              f"{len(changed)} summarised, {len(communities) - len(changed)} reused ({elapsed:.2f}s)")
+        return {
+            "communities": len(communities),
+            "summarized": len(changed),
+            "reused": len(communities) - len(changed),
+            "llm_calls": len(changed),
+            "seconds": elapsed
+        }
+
+    def select(self, question: str, token_budget: int = 2000) -> List[Dict[str, Any]]:
+        """
+        Pick the community summaries to answer a global question with.
+
+        Communities are ranked by term overlap with the question, then by
+        size, and packed greedily into the token budget.
+
+        Args:
+            question: User's question
+            token_budget: Approximate token budget for the summaries
+
+        Returns:
+            Selected communities, most relevant first
+        """
+        question_terms = _terms(question)
+
+        def rank(community):
+            text = " ".join([community["title"], community["summary"]] + community["names"])
+            return (len(question_terms & _terms(text)), community["size"])
+
+        selected = []
+        used_tokens = 0
+        for community in sorted(self.communities, key=rank, reverse=True):
+            cost = len(self.render(community)) // 4 + 1
+            if selected and used_tokens + cost > token_budget:
+                continue
+            selected.append(community)
+            used_tokens += cost
+        return selected
+
+    @staticmethod
+    def render(community: Dict[str, Any]) -> str:
+        """Format a community summary for a prompt."""
+        return f"{community['title']}: {community['summary']}"
+
+    def save(self, path: str) -> None:
+        """
+        Persist the summaries as JSON.
+
+        Args:
+            path: File to write to
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"communities": self.communities}, f, indent=2)
+
+    def reset(self) -> None:
+        """Forget all communities (e.g. after the graph was cleared)."""
+        self.communities = []
+
+    def prune(self, entity_uuids: set) -> int:
+        """
+        Drop communities with members that no longer exist (e.g. after one group was cleared).
+
+        Args:
+            entity_uuids: Uuids of the entities still in the graph
+
+        Returns:
+            Number of communities dropped
+        """
+        kept = [c for c in self.communities if all(uuid in entity_uuids for uuid in c["members"])]
+        dropped = len(self.communities) - len(kept)
+        for index, community in enumerate(kept):
+            community["id"] = index
+        self.communities = kept
+        return dropped
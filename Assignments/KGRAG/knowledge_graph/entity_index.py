@@ -0,0 +1,263 @@
+"""In-process entity index for linking question mentions to graph entities."""
+
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import faiss
+import numpy as np
+
+
+def _normalize(text: str) -> str:
+    """Lower-case and drop separators, so "Authentication Service" matches "AuthenticationService"."""
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+class EntityIndex:
+    """
+    Entity linker backed by an exact name table and a FAISS HNSW index.
+
+    Question n-grams are matched against normalised entity names first; this
+    needs no network call and takes microseconds. Only when no name matches
+    is the question embedded and looked up in the HNSW index built over
+    "name: summary" embeddings. New entities are added incrementally from
+    the graph store, and both structures can be persisted to disk. FAISS
+    vectors carry their entity id explicitly, so the two stay aligned even
+    if an embedding request fails halfway through a refresh.
+    """
+
+    def __init__(self, embeddings=None, m: int = 32, ef_search: int = 64, max_ngram: int = 4):
+        """
+        Initialize an empty entity index.
+
+        Args:
+            embeddings: LangChain Embeddings for the semantic fallback (None = names only)
+            m: HNSW graph degree
+            ef_search: HNSW search breadth (higher is more accurate, slower)
+            max_ngram: Longest question n-gram (in words) matched against names
+        """
+        self.embeddings = embeddings
+        self.m = m
+        self.ef_search = ef_search
+        self.max_ngram = max_ngram
+
+        self.uuids: List[str] = []
+        self.names: List[str] = []
+        self.watermark: Optional[datetime] = None
+        self.index = None
+
+        self._ids: Dict[str, int] = {}
+        self._name_ids: Dict[str, List[int]] = {}
+
+    @property
+    def num_entities(self) -> int:
+        """Number of indexed entities."""
+        return len(self.uuids)
+
+    def reset(self) -> None:
+        """Drop all indexed entities (e.g. after the graph was cleared)."""
+        self.__init__(self.embeddings, self.m, self.ef_search, self.max_ngram)
+
+    def _add_vectors(self, vectors: List[List[float]], entity_ids: List[int]) -> None:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        faiss.normalize_L2(matrix)
+        if self.index is None:
+            # Inner product on unit vectors is cosine similarity
+            hnsw = faiss.IndexHNSWFlat(matrix.shape[1], self.m, faiss.METRIC_INNER_PRODUCT)
+            hnsw.hnsw.efSearch = self.ef_search
+            self.index = faiss.IndexIDMap(hnsw)
+        self.index.add_with_ids(matrix, np.asarray(entity_ids, dtype=np.int64))
+
+    def _embed(self, entities: List[Dict[str, Any]], entity_ids: List[int]) -> None:
+        """Embed entities as "name: summary" and add them under the given ids."""
+        texts = [f"{e['name']}: {e['summary']}" if e.get("summary") else e["name"] for e in entities]
+        self._add_vectors(self.embeddings.embed_documents(texts), entity_ids)
+
+    def _register(self, entity: Dict[str, Any]) -> None:
+        """Add an entity to the name table."""
+        self._ids[entity["uuid"]] = len(self.uuids)
+        self._name_ids.setdefault(_normalize(entity["name"]), []).append(len(self.uuids))
+        self.uuids.append(entity["uuid"])
+        self.names.append(entity["name"])
+        if entity["created_at"] is not None:
+            self.watermark = entity["created_at"]
+
+    def refresh(self, store, batch_size: int = 256) -> int:
+        """
+        Index entities created since the last refresh.
+
+        Entities are registered one batch at a time, after their vectors
+        were added, so a failed embedding request leaves them to the next
+        refresh. Entities indexed before embeddings were configured are
+        embedded first.
+
+        Args:
+            store: GraphStore to read from
+            batch_size: Entities embedded per embedding request
+
+        Returns:
+            Number of entities added
+        """
+        start_time = time.time()
+        new_entities = []
+        seen = set()
+        for entity in store.iter_entities(since=self.watermark):
+            if entity["uuid"] in self._ids or entity["uuid"] in seen:
+                continue
+            seen.add(entity["uuid"])
+            new_entities.append(entity)
+
+        if self.embeddings is not None and self.num_entities:
+            embedded = set()
+            if self.index is not None:
+                embedded = set(faiss.vector_to_array(self.index.id_map).tolist())
+            missing = [entity_id for entity_id in range(self.num_entities) if entity_id not in embedded]
+            if missing:
+                summaries = {e["uuid"]: e.get("summary") for e in store.iter_entities()}
+                for start in range(0, len(missing), batch_size):
+                    batch = missing[start:start + batch_size]
+                    self._embed([
+                        {"name": self.names[i], "summary": summaries.get(self.uuids[i])} for i in batch
+                    ], batch)
+
+        for start in range(0, len(new_entities), batch_size):
+            batch = new_entities[start:start + batch_size]
+            if self.embeddings is not None:
+                self._embed(batch, list(range(self.num_entities, self.num_entities + len(batch))))
+            for entity in batch:
+                self._register(entity)
+
+        print(f"Entity index refreshed: +{len(new_entities)} entities in "
+              f"{time.time() - start_time:.3f}s ({self.num_entities} total)")
+        return len(new_entities)
+
+    def match_names(self, question: str) -> List[int]:
+        """
+        Find entities whose normalised name equals a question n-gram.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Entity ids, longest mentions first
+        """
+        tokens = re.findall(r"\w+", question)
+        matches = []
+        for size in range(min(self.max_ngram, len(tokens)), 0, -1):
+            for start in range(len(tokens) - size + 1):
+                key = _normalize("".join(tokens[start:start + size]))
+                # Plural mentions ("rate limits") link to singular names
+                candidates = self._name_ids.get(key) or self._name_ids.get(key[:-1] if key.endswith("s") else key, [])
+                for entity_id in candidates:
+                    if entity_id not in matches:
+                        matches.append(entity_id)
+        return matches
+
+    def search_vector(self, vector: List[float], k: int = 5) -> List[tuple]:
+        """
+        Nearest entities to an embedding.
+
+        Args:
+            vector: Query embedding
+            k: Number of neighbours
+
+        Returns:
+            List of (entity id, cosine similarity) pairs
+        """
+        if self.index is None or self.index.ntotal == 0:
+            return []
+        query = np.asarray([vector], dtype=np.float32)
+        faiss.normalize_L2(query)
+        scores, ids = self.index.search(query, k)
+        return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
+
+    def link(
+        self,
+        question: str,
+        k: int = 5,
+        query_vector: Optional[List[float]] = None,
+        embed_fallback: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Link a question to graph entities.
+
+        Args:
+            question: User's question
+            k: Maximum number of entities returned
+            query_vector: Precomputed question embedding for the semantic lookup
+            embed_fallback: Embed the question when no entity name matches
+
+        Returns:
+            Dictionaries with uuid, name and score (1.0 for exact name matches)
+        """
+        scored = {entity_id: 1.0 for entity_id in self.match_names(question)[:k]}
+
+        if query_vector is None and not scored and embed_fallback and self.embeddings is not None:
+            query_vector = self.embeddings.embed_query(question)
+        if query_vector is not None:
+            for entity_id, score in self.search_vector(query_vector, k):
+                scored.setdefault(entity_id, score)
+
+        ranked = sorted(scored.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            {"uuid": self.uuids[entity_id], "name": self.names[entity_id], "score": score}
+            for entity_id, score in ranked
+        ]
+
+    def save(self, path: str) -> None:
+        """
+        Persist the index as a FAISS file plus metadata.
+
+        Args:
+            path: Directory to write to
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        if self.index is not None:
+            faiss.write_index(self.index, str(directory / "entities.faiss"))
+
+        meta = {
+            "uuids": self.uuids,
+            "names": self.names,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+        }
+        with open(directory / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        print(f"Entity index saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, embeddings=None, **kwargs) -> "EntityIndex":
+        """
+        Load an index persisted with ``save``.
+
+        Args:
+            path: Directory written by ``save``
+            embeddings: LangChain Embeddings used when the index was built
+            **kwargs: Passed to the constructor
+
+        Returns:
+            Loaded EntityIndex
+        """
+        directory = Path(path)
+        entity_index = cls(embeddings, **kwargs)
+
+        with open(directory / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        entity_index.uuids = meta["uuids"]
+        entity_index.names = meta["names"]
+        for entity_id, (uuid, name) in enumerate(zip(meta["uuids"], meta["names"])):
+            entity_index._ids[uuid] = entity_id
+            entity_index._name_ids.setdefault(_normalize(name), []).append(entity_id)
+        if meta["watermark"]:
+            entity_index.watermark = datetime.fromisoformat(meta["watermark"])
+
+        if (directory / "entities.faiss").exists():
+            entity_index.index = faiss.read_index(str(directory / "entities.faiss"))
+            faiss.downcast_index(entity_index.index.index).hnsw.efSearch = entity_index.ef_search
+
+        print(f"Entity index loaded from {path} ({entity_index.num_entities} entities)")
+        return entity_index
@@ -0,0 +1,110 @@
+"""LLM entity and relation extraction for graph stores that don't use Graphiti."""
+
+import json
+from typing import Dict, Any, List
+
+
+EXTRACTION_PROMPT = """Extract entities and relations from this text.
+Return ONLY valid JSON like:
+{{"entities": [{{"name": "AuthenticationService", "type": "Service", "summary": "Issues access tokens"}}],
+ "relations": [{{"source": "AuthenticationService", "relation": "USES", "target": "UserManager",
+                "fact": "AuthenticationService uses UserManager to validate credentials"}}]}}
+
+Text: {text}"""
+
+BATCH_EXTRACTION_PROMPT = """Extract entities and relations from each of the numbered texts below.
+Return ONLY valid JSON with one object per text, in order:
+{{"texts": [{{"index": 0, "entities": [{{"name": "...", "type": "...", "summary": "..."}}],
+             "relations": [{{"source": "...", "relation": "...", "target": "...", "fact": "..."}}]}}]}}
+Use the same name for an entity every time it appears, across all texts.
+
+{texts}"""
+
+
+def parse_extraction(text: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Parse the JSON returned by the extraction prompt.
+
+    Args:
+        text: Raw LLM output, optionally wrapped in a markdown code block
+
+    Returns:
+        Dictionary with entities and relations (empty on malformed output)
+    """
+    data = _load_json(text)
+    if not isinstance(data, dict):
+        return {"entities": [], "relations": []}
+    return _normalize(data)
+
+
+def _load_json(text: str) -> Any:
+    """Load JSON from LLM output, stripping markdown code fences."""
+    text = text.strip()
+    if "```" in text:
+        text = text.split("```")[1].removeprefix("json").strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+
+def _normalize(data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Drop incomplete items and add entities referenced only by relations."""
+    entities = [e for e in data.get("entities", []) if e.get("name")]
+    relations = [
+        r for r in data.get("relations", [])
+        if r.get("source") and r.get("target") and r.get("relation")
+    ]
+    for relation in relations:
+        relation.setdefault(
+            "fact", f"{relation['source']} {relation['relation']} {relation['target']}"
+        )
+
+    # Relations may reference entities the model forgot to list
+    names = {e["name"] for e in entities}
+    for relation in relations:
+        for name in (relation["source"], relation["target"]):
+            if name not in names:
+                entities.append({"name": name, "type": "Entity", "summary": ""})
+                names.add(name)
+
+    return {"entities": entities, "relations": relations}
+
+
+async def extract_graph(llm, text: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Extract entities and relations from a chunk of text.
+
+    Args:
+        llm: LangChain chat model
+        text: Document chunk
+
+    Returns:
+        Dictionary with entities and relations
+    """
+    response = await llm.ainvoke(EXTRACTION_PROMPT.format(text=text))
+    return parse_extraction(response.content)
+
+
+async def extract_graph_batch(llm, texts: List[str]) -> List[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Extract entities and relations from several chunks with a single LLM call.
+
+    Args:
+        llm: LangChain chat model
+        texts: Document chunks
+
+    Returns:
+        One extraction dictionary per chunk, in order
+    """
+    numbered = "\n\n".join(f"Text {i}:\n{text}" for i, text in enumerate(texts))
+    response = await llm.ainvoke(BATCH_EXTRACTION_PROMPT.format(texts=numbered))
+    data = _load_json(response.content)
+
+    results = [{"entities": [], "relations": []} for _ in texts]
+    if isinstance(data, dict):
+        for position, item in enumerate(data.get("texts", [])):
+            index = item.get("index", position)
+            if isinstance(index, int) and 0 <= index < len(texts):
+                results[index] = _normalize(item)
+    return results
@@ -0,0 +1,352 @@
+"""In-process CSR mirror of the entity graph for fast neighbourhood lookups."""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+
+import numpy as np
+
+
+class GraphMirror:
+    """
+    Read-only snapshot of the Entity/RELATES_TO graph held in CSR arrays.
+
+    Node names and relation types are interned once; adjacency lives in two
+    NumPy arrays (``offsets`` and ``neighbors``) covering both edge
+    directions, so 1- and 2-hop lookups are array slices instead of Bolt
+    round trips.
+    """
+
+    def __init__(self):
+        """Initialize an empty mirror."""
+        self.names: List[str] = []
+        self.uuids: List[str] = []
+        self.relation_names: List[str] = []
+        self.watermark: Optional[datetime] = None
+
+        self._node_ids: Dict[str, int] = {}
+        self._name_ids: Dict[str, List[int]] = {}
+        self._relation_ids: Dict[str, int] = {}
+        self._edge_uuids = set()
+
+        self._src = np.zeros(0, dtype=np.int32)
+        self._dst = np.zeros(0, dtype=np.int32)
+        self._rel = np.zeros(0, dtype=np.int32)
+        self._pending: List[tuple] = []
+
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.neighbors = np.zeros(0, dtype=np.int32)
+        self.neighbor_relations = np.zeros(0, dtype=np.int32)
+        self.out_degree = np.zeros(0, dtype=np.int32)
+        self.in_degree = np.zeros(0, dtype=np.int32)
+
+        # Directory the current arrays were loaded from or saved to (None once changed)
+        self._saved_path: Optional[str] = None
+
+    @property
+    def num_nodes(self) -> int:
+        """Number of entities in the mirror."""
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        """Number of directed edges in the mirror."""
+        return len(self._src) + len(self._pending)
+
+    def reset(self) -> None:
+        """Drop all mirrored data (e.g. after the graph was cleared)."""
+        self.__init__()
+
+    def _intern_node(self, uuid: str, name: str) -> int:
+        node_id = self._node_ids.get(uuid)
+        if node_id is None:
+            node_id = len(self.names)
+            self._node_ids[uuid] = node_id
+            self.uuids.append(uuid)
+            self.names.append(name)
+            self._name_ids.setdefault(name, []).append(node_id)
+        return node_id
+
+    def _intern_relation(self, relation: str) -> int:
+        rel_id = self._relation_ids.get(relation)
+        if rel_id is None:
+            rel_id = len(self.relation_names)
+            self._relation_ids[relation] = rel_id
+            self.relation_names.append(relation)
+        return rel_id
+
+    def apply_edges(self, edges: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply ingestion events to the mirror.
+
+        Args:
+            edges: Records with source/target uuid and name, edge uuid and relation
+
+        Returns:
+            Number of new edges added
+        """
+        added = 0
+        for edge in edges:
+            edge_uuid = edge.get("uuid")
+            if edge_uuid is not None:
+                if edge_uuid in self._edge_uuids:
+                    continue
+                self._edge_uuids.add(edge_uuid)
+
+            src = self._intern_node(edge["source_uuid"], edge["source_name"])
+            dst = self._intern_node(edge["target_uuid"], edge["target_name"])
+            rel = self._intern_relation(edge.get("relation") or "RELATES_TO")
+            self._pending.append((src, dst, rel))
+            added += 1
+        return added
+
+    def refresh(self, store) -> int:
+        """
+        Pull edges created since the last refresh from the graph store.
+
+        Args:
+            store: GraphStore to read from
+
+        Returns:
+            Number of new edges added
+        """
+        start_time = time.time()
+        edges = []
+        for edge in store.iter_edges(since=self.watermark):
+            edges.append(edge)
+            if edge["created_at"] is not None:
+                self.watermark = edge["created_at"]
+
+        added = self.apply_edges(edges)
+        self._compact()
+        print(f"Graph mirror refreshed: +{added} edges in {time.time() - start_time:.3f}s "
+              f"({self.num_nodes} nodes, {self.num_edges} edges)")
+        return added
+
+    def _compact(self) -> None:
+        """Merge pending edges and rebuild the CSR arrays."""
+        if not self._pending and len(self.offsets) == self.num_nodes + 1:
+            return
+
+        self._saved_path = None
+        if self._pending:
+            pending = np.asarray(self._pending, dtype=np.int32).reshape(-1, 3)
+            self._src = np.concatenate([self._src, pending[:, 0]])
+            self._dst = np.concatenate([self._dst, pending[:, 1]])
+            self._rel = np.concatenate([self._rel, pending[:, 2]])
+            self._pending = []
+
+        n = self.num_nodes
+        # Store both directions so neighbourhoods are undirected
+        heads = np.concatenate([self._src, self._dst])
+        tails = np.concatenate([self._dst, self._src])
+        rels = np.concatenate([self._rel, self._rel])
+
+        order = np.argsort(heads, kind="stable")
+        self.neighbors = tails[order].astype(np.int32)
+        self.neighbor_relations = rels[order].astype(np.int32)
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(heads, minlength=n), out=self.offsets[1:])
+        self.out_degree = np.bincount(self._src, minlength=n).astype(np.int32)
+        self.in_degree = np.bincount(self._dst, minlength=n).astype(np.int32)
+
+    def _ids_for(self, entity: str) -> np.ndarray:
+        """Resolve an entity name or uuid to node ids."""
+        if entity in self._node_ids:
+            return np.asarray([self._node_ids[entity]], dtype=np.int64)
+        return np.asarray(self._name_ids.get(entity, []), dtype=np.int64)
+
+    def _expand(self, frontier: np.ndarray) -> np.ndarray:
+        """Return the concatenated neighbour lists of all frontier nodes."""
+        starts = self.offsets[frontier]
+        lengths = self.offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int32)
+        shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.neighbors[shifts + np.arange(total)]
+
+    def neighborhood(self, entity: str, hops: int = 1) -> Dict[int, List[str]]:
+        """
+        Get the neighbourhood of an entity, grouped by hop distance.
+
+        Args:
+            entity: Entity name or uuid
+            hops: Number of hops to expand (1 or 2 are typical)
+
+        Returns:
+            Mapping of hop distance to neighbour names
+        """
+        self._compact()
+        seeds = self._ids_for(entity)
+        seen = np.zeros(self.num_nodes, dtype=bool)
+        seen[seeds] = True
+        frontier = seeds
+        result = {}
+
+        for hop in range(1, hops + 1):
+            if len(frontier) == 0:
+                break
+            candidates = np.unique(self._expand(frontier))
+            frontier = candidates[~seen[candidates]]
+            seen[frontier] = True
+            result[hop] = [self.names[i] for i in frontier]
+
+        return result
+
+    def neighbors_of(self, entity: str, hops: int = 1) -> List[str]:
+        """
+        Get all entity names within ``hops`` of an entity.
+
+        Args:
+            entity: Entity name or uuid
+            hops: Number of hops to expand
+
+        Returns:
+            List of neighbour names
+        """
+        names = []
+        for hop_names in self.neighborhood(entity, hops).values():
+            names.extend(hop_names)
+        return names
+
+    def degree(self, entity: str) -> Dict[str, int]:
+        """
+        Get the degree of an entity.
+
+        Args:
+            entity: Entity name or uuid
+
+        Returns:
+            Dictionary with in, out and total degree
+        """
+        self._compact()
+        ids = self._ids_for(entity)
+        out_degree = int(self.out_degree[ids].sum())
+        in_degree = int(self.in_degree[ids].sum())
+        return {"out": out_degree, "in": in_degree, "total": out_degree + in_degree}
+
+    def pagerank(self, damping: float = 0.85, iterations: int = 100, tol: float = 1e-8) -> np.ndarray:
+        """
+        PageRank of every node by power iteration over the directed edges.
+
+        Args:
+            damping: Probability of following an edge instead of teleporting
+            iterations: Maximum number of iterations
+            tol: Stop once the L1 change between iterations drops below this
+
+        Returns:
+            Array of scores indexed by node id (sums to 1)
+        """
+        self._compact()
+        n = self.num_nodes
+        if n == 0:
+            return np.zeros(0, dtype=np.float64)
+
+        out_degree = self.out_degree.astype(np.float64)
+        dangling = out_degree == 0
+        # Edge weight from src is 1 / out_degree(src); dangling nodes spread uniformly
+        weights = 1.0 / np.where(dangling, 1.0, out_degree)
+        ranks = np.full(n, 1.0 / n)
+        for _ in range(iterations):
+            spread = np.bincount(self._dst, weights=(ranks * weights)[self._src], minlength=n)
+            updated = damping * (spread + ranks[dangling].sum() / n) + (1.0 - damping) / n
+            change = np.abs(updated - ranks).sum()
+            ranks = updated
+            if change < tol:
+                break
+        return ranks
+
+    def save(self, path: str) -> None:
+        """
+        Persist the mirror as memory-mappable ``.npy`` files plus metadata.
+
+        Nothing is written if the mirror is unchanged since it was loaded
+        from or saved to the same directory. Files are written next to the
+        old ones and swapped in, so arrays memory-mapped from them stay valid.
+
+        Args:
+            path: Directory to write to
+        """
+        self._compact()
+        directory = Path(path)
+        if self._saved_path == str(directory.resolve()):
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+
+        arrays = {
+            "src": self._src,
+            "dst": self._dst,
+            "rel": self._rel,
+            "offsets": self.offsets,
+            "neighbors": self.neighbors,
+            "neighbor_relations": self.neighbor_relations,
+            "out_degree": self.out_degree,
+            "in_degree": self.in_degree,
+        }
+        for name, array in arrays.items():
+            target = directory / f"{name}.npy"
+            temp = directory / f"{name}.tmp.npy"
+            np.save(temp, np.array(array))
+            os.replace(temp, target)
+
+        meta = {
+            "names": self.names,
+            "uuids": self.uuids,
+            "relation_names": self.relation_names,
+            "edge_uuids": sorted(self._edge_uuids),
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+        }
+        temp = directory / "meta.tmp.json"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp, directory / "meta.json")
+
+        self._saved_path = str(directory.resolve())
+        print(f"Graph mirror saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "GraphMirror":
+        """
+        Load a mirror persisted with ``save``.
+
+        Args:
+            path: Directory written by ``save``
+            mmap: Memory-map the arrays instead of reading them into RAM
+
+        Returns:
+            Loaded GraphMirror
+        """
+        directory = Path(path)
+        mirror = cls()
+        mmap_mode = "r" if mmap else None
+
+        with open(directory / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        for node_id, (uuid, name) in enumerate(zip(meta["uuids"], meta["names"])):
+            mirror._node_ids[uuid] = node_id
+            mirror._name_ids.setdefault(name, []).append(node_id)
+        mirror.uuids = meta["uuids"]
+        mirror.names = meta["names"]
+        mirror.relation_names = meta["relation_names"]
+        mirror._relation_ids = {name: i for i, name in enumerate(mirror.relation_names)}
+        mirror._edge_uuids = set(meta["edge_uuids"])
+        if meta["watermark"]:
+            mirror.watermark = datetime.fromisoformat(meta["watermark"])
+
+        mirror._src = np.load(directory / "src.npy", mmap_mode=mmap_mode)
+        mirror._dst = np.load(directory / "dst.npy", mmap_mode=mmap_mode)
+        mirror._rel = np.load(directory / "rel.npy", mmap_mode=mmap_mode)
+        mirror.offsets = np.load(directory / "offsets.npy", mmap_mode=mmap_mode)
+        mirror.neighbors = np.load(directory / "neighbors.npy", mmap_mode=mmap_mode)
+        mirror.neighbor_relations = np.load(directory / "neighbor_relations.npy", mmap_mode=mmap_mode)
+        mirror.out_degree = np.load(directory / "out_degree.npy", mmap_mode=mmap_mode)
+        mirror.in_degree = np.load(directory / "in_degree.npy", mmap_mode=mmap_mode)
+        mirror._saved_path = str(directory.resolve())
+
+        print(f"Graph mirror loaded from {path} ({mirror.num_nodes} nodes, {mirror.num_edges} edges)")
+        return mirror
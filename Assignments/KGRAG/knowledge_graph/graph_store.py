@@ -0,0 +1,324 @@
+"""Storage interface shared by the knowledge graph backends."""
+
+import json
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+
+def to_utc(value: datetime) -> datetime:
+    """Make a timestamp timezone-aware in UTC (naive values are taken as local time)."""
+    return value.astimezone(timezone.utc)
+
+
+def time_window(
+    as_of: Optional[datetime] = None,
+    between: Optional[Tuple[datetime, datetime]] = None
+) -> Optional[Dict[str, datetime]]:
+    """
+    Build the validity window passed to search_facts and expand_hop.
+
+    Args:
+        as_of: Only facts valid at this time (valid_at <= as_of and not
+            invalidated by then)
+        between: (start, end) pair; only facts that became valid in this range
+
+    Returns:
+        Dictionary with some of start, end and as_of (UTC), or None for no window
+    """
+    if as_of is not None and between is not None:
+        raise ValueError("Pass either as_of or between, not both")
+    if as_of is not None:
+        return {"end": to_utc(as_of), "as_of": to_utc(as_of)}
+    if between is not None:
+        start, end = between
+        if start > end:
+            raise ValueError("between must be a (start, end) pair with start <= end")
+        return {"start": to_utc(start), "end": to_utc(end)}
+    return None
+
+
+class GraphStore(ABC):
+    """
+    Graph storage backend used by KnowledgeGraphRAG.
+
+    Backends store the Graphiti data model: ``Episodic`` nodes for document
+    chunks, ``Entity`` nodes, ``RELATES_TO`` edges between entities and
+    ``MENTIONS`` edges from episodes to entities.
+    """
+
+    backend_name = "base"
+
+    @abstractmethod
+    def ensure_indexes(self) -> None:
+        """Create the indexes the lookups rely on."""
+
+    @abstractmethod
+    def add_episode(
+        self,
+        name: str,
+        content: str,
+        source_description: str,
+        reference_time: datetime,
+        group_id: str = ""
+    ) -> str:
+        """
+        Store a document chunk as an episode.
+
+        Args:
+            name: Episode name
+            content: Episode text
+            source_description: Description of the source
+            reference_time: Time the content refers to
+            group_id: Partition the episode belongs to
+
+        Returns:
+            Episode uuid
+        """
+
+    @abstractmethod
+    def add_entities(
+        self,
+        entities: List[Dict[str, Any]],
+        group_id: str = "",
+        episode_uuid: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Store entities, reusing existing ones with the same name and group.
+
+        Args:
+            entities: Dictionaries with name and optional type and summary
+            group_id: Partition the entities belong to
+            episode_uuid: Episode that mentions the entities
+
+        Returns:
+            Mapping of entity name to uuid
+        """
+
+    @abstractmethod
+    def add_edges(
+        self,
+        edges: List[Dict[str, Any]],
+        group_id: str = "",
+        episode_uuid: Optional[str] = None
+    ) -> int:
+        """
+        Store RELATES_TO edges between entities.
+
+        Args:
+            edges: Dictionaries with source_uuid, target_uuid, relation and fact
+            group_id: Partition the edges belong to
+            episode_uuid: Episode the edges were extracted from
+
+        Returns:
+            Number of edges stored
+        """
+
+    @abstractmethod
+    def bulk_write(self, rows: Dict[str, List[Dict[str, Any]]], group_id: str = "") -> Dict[str, int]:
+        """
+        Write a staged slice of a bulk load with one batched statement per row kind.
+
+        Args:
+            rows: Dictionary from bulk_load.stage_records with episodes,
+                entities (merged by name), mentions and edges (entities
+                referenced by name)
+            group_id: Partition the rows belong to
+
+        Returns:
+            Dictionary with the number of episodes, entities (newly created)
+            and edges written
+        """
+
+    @abstractmethod
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get node and relationship counts with a single round trip.
+
+        Returns:
+            Dictionary with total_nodes, total_relationships, num_entities,
+            num_episodes, labels (label -> node count), relationship_types
+            (type -> count) and degree (p50, p90, p99 and max entity degree)
+        """
+
+    @abstractmethod
+    def iter_entity_relationships(
+        self,
+        entity_names: List[str],
+        relationship_types: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        fetch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the relationships of many entities.
+
+        Records are ordered by entity, relationship, source and target, so
+        ``skip``/``limit`` pages are stable.
+
+        Yields:
+            Dictionaries with entity, source, relationship and target
+        """
+
+    @abstractmethod
+    def iter_edges(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream entity-to-entity edges ordered by creation time.
+
+        Args:
+            since: Only edges created at or after this time
+
+        Yields:
+            Dictionaries with source/target uuid and name, uuid, relation,
+            fact and created_at (native datetime)
+        """
+
+    @abstractmethod
+    def iter_entities(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream entities ordered by creation time.
+
+        Args:
+            since: Only entities created at or after this time
+
+        Yields:
+            Dictionaries with uuid, name, summary and created_at (native datetime)
+        """
+
+    @abstractmethod
+    def search_facts(
+        self,
+        query: str,
+        limit: int = 10,
+        window: Optional[Dict[str, datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Keyword search over edge facts.
+
+        Without a window, expired facts are skipped. With a window (see
+        time_window) only facts whose validity matches it are returned.
+
+        Returns:
+            Dictionaries with edge_uuid, fact, relation, source_uuid and target_uuid
+        """
+
+    @abstractmethod
+    def expand_hop(
+        self,
+        uuids: List[str],
+        seen_edges: List[str],
+        fan_out: int,
+        window: Optional[Dict[str, datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Expand a frontier of entities by one hop, newest edges first.
+
+        With a window (see time_window) only edges valid in it are followed.
+
+        Returns:
+            Records with from_uuid and an edge dictionary (edge_uuid, fact,
+            relation, source, target, neighbor_uuid, timestamp)
+        """
+
+    @abstractmethod
+    def entity_names(self, uuids: List[str]) -> List[str]:
+        """Resolve entity uuids to names."""
+
+    @abstractmethod
+    def clear(self, group_id: Optional[str] = None, batch_size: int = 10000) -> Dict[str, Any]:
+        """
+        Delete nodes and relationships in bounded batches.
+
+        Args:
+            group_id: Only delete this partition (None deletes everything)
+            batch_size: Nodes deleted per transaction
+
+        Returns:
+            Dictionary with deleted_nodes, seconds and nodes_per_second
+        """
+
+    @abstractmethod
+    def compact(
+        self,
+        group_id: Optional[str] = None,
+        batch_size: int = 1000,
+        archive_path: Optional[str] = None,
+        expired_before: Optional[datetime] = None,
+        expire_superseded: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Remove the duplication and stale data that re-ingestion leaves behind.
+
+        In order: merge entities whose names differ only in case, archive
+        facts that were invalidated or expired, merge
+        RELATES_TO edges with the same endpoints, relation and fact, merge
+        episodes with identical content, and delete entities left without
+        any relationship. Every step runs in batches of ``batch_size``.
+
+        Args:
+            group_id: Only compact this partition (None compacts everything)
+            batch_size: Groups or rows handled per transaction
+            archive_path: JSONL file archived facts are appended to (None drops them)
+            expired_before: Only archive facts invalidated/expired before this
+                time (defaults to now)
+            expire_superseded: First expire facts restated differently by a
+                later document (same endpoints and relation). Backends that
+                invalidate facts during ingestion ignore this
+
+        Returns:
+            Dictionary with before/after statistics, merged_entities,
+            merged_edges, archived_edges, merged_episodes, deleted_orphans
+            and seconds
+        """
+
+    @staticmethod
+    def _archive_facts(records: List[Dict[str, Any]], path: Optional[str]) -> None:
+        """Append archived facts to a JSONL file."""
+        if not path or not records:
+            return
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        archived_at = datetime.now().isoformat()
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps({**record, "archived_at": archived_at}, default=str) + "\n")
+
+    def _compaction_summary(
+        self,
+        before: Dict[str, int],
+        counts: Dict[str, int],
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Build the result of ``compact`` and print before/after counts."""
+        after = self.get_statistics()
+        elapsed = time.time() - start_time
+        print(f"Compacted graph in {elapsed:.2f}s: "
+              f"nodes {before['total_nodes']} -> {after['total_nodes']}, "
+              f"relationships {before['total_relationships']} -> {after['total_relationships']}")
+        for step, count in counts.items():
+            print(f"  - {step.replace('_', ' ')}: {count}")
+        return {"before": before, "after": after, **counts, "seconds": elapsed}
+
+    @staticmethod
+    def _report_clear_progress(deleted: int, total: int, start_time: float) -> None:
+        """Print deletion progress and throughput."""
+        elapsed = max(time.time() - start_time, 1e-9)
+        print(f"  Deleted {deleted}/{total} nodes ({deleted / elapsed:.0f} nodes/s)")
+
+    @staticmethod
+    def _clear_summary(deleted: int, start_time: float, group_id: Optional[str]) -> Dict[str, Any]:
+        """Build the result of ``clear`` and print the throughput."""
+        elapsed = time.time() - start_time
+        rate = deleted / elapsed if elapsed > 0 else 0.0
+        scope = f"group '{group_id}'" if group_id is not None else "graph"
+        print(f"Cleared {scope}: {deleted} nodes in {elapsed:.2f}s ({rate:.0f} nodes/s)")
+        return {
+            "group_id": group_id,
+            "deleted_nodes": deleted,
+            "seconds": elapsed,
+            "nodes_per_second": rate
+        }
+
+    def close(self) -> None:
+        """Release backend resources."""
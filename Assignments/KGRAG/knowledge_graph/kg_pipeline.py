@@ -1,14 +1,40 @@
-"""Knowledge Graph RAG Pipeline using Graphiti and Neo4j."""
+"""Knowledge Graph RAG Pipeline using Graphiti and Neo4j (or an embedded SQLite store)."""
 
+import asyncio
 import os
 import time
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from datetime import datetime, timedelta, timezone
 
 from graphiti_core import Graphiti
 from graphiti_core.nodes import EpisodeType
-from neo4j import GraphDatabase
-from langchain_openai import ChatOpenAI
+from graphiti_core.utils.bulk_utils import RawEpisode
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from .bulk_load import extract_to_jsonl, load_jsonl, read_records
+from .communities import CommunityIndex
+from .entity_index import EntityIndex
+from .extraction import extract_graph, extract_graph_batch
+from .graph_mirror import GraphMirror
+from .graph_store import GraphStore, time_window, to_utc
+from .llm_cache import LLMCache
+from .llm_client import TrackedOpenAIClient
+from .neo4j_store import Neo4jGraphStore
+from .sqlite_store import SQLiteGraphStore
+
+
+def _to_epoch(value) -> float:
+    """Convert a Neo4j or native temporal value to a sortable number."""
+    if value is None:
+        return 0.0
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    return value.timestamp()
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
 
 
 class KnowledgeGraphRAG:
@@ -16,105 +42,758 @@ class KnowledgeGraphRAG:
 
     def __init__(
         self,
-        neo4j_uri: str,
-        neo4j_user: str,
-        neo4j_password: str,
-        openai_api_key: str,
-        model_name: str = "gpt-4-turbo-preview"
+        neo4j_uri: Optional[str] = None,
+        neo4j_user: Optional[str] = None,
+        neo4j_password: Optional[str] = None,
+        openai_api_key: Optional[str] = None,
+        model_name: str = "gpt-4-turbo-preview",
+        backend: str = "neo4j",
+        sqlite_path: str = "knowledge_graph.db",
+        llm_cache: Optional[LLMCache] = None,
+        base_url: Optional[str] = None
     ):
         """
         Initialize Knowledge Graph RAG system.
 
         Args:
-            neo4j_uri: Neo4j database URI
-            neo4j_user: Neo4j username
-            neo4j_password: Neo4j password
+            neo4j_uri: Neo4j database URI (neo4j backend)
+            neo4j_user: Neo4j username (neo4j backend)
+            neo4j_password: Neo4j password (neo4j backend)
             openai_api_key: OpenAI API key
             model_name: LLM model to use
+            backend: Graph store backend, "neo4j" (Graphiti) or "sqlite" (embedded)
+            sqlite_path: Database file for the sqlite backend, or ":memory:"
+            llm_cache: Persistent cache for extraction LLM calls
+            base_url: OpenAI-compatible API base URL (e.g. the replay server
+                from comparison.replay); None uses the OpenAI API
         """
         self.neo4j_uri = neo4j_uri
         self.neo4j_user = neo4j_user
         self.neo4j_password = neo4j_password
         self.openai_api_key = openai_api_key
         self.model_name = model_name
+        self.backend = backend
+        self.llm_cache = llm_cache
+        self.base_url = base_url
 
-        # Initialize Neo4j driver
-        self.driver = GraphDatabase.driver(
-            neo4j_uri,
-            auth=(neo4j_user, neo4j_password)
-        )
+        if backend == "neo4j":
+            if not (neo4j_uri and neo4j_user and neo4j_password):
+                raise ValueError("The neo4j backend requires neo4j_uri, neo4j_user and neo4j_password")
 
-        # Initialize Graphiti with new API (v0.3.6+)
-        from graphiti_core.llm_client import OpenAIClient
-        from graphiti_core.llm_client.config import LLMConfig
+            self.store: GraphStore = Neo4jGraphStore(neo4j_uri, neo4j_user, neo4j_password)
 
-        llm_config = LLMConfig(
-            api_key=openai_api_key,
-            model=model_name,
-            max_tokens=4096  # GPT-4 Turbo max completion tokens
-        )
-        llm_client = OpenAIClient(config=llm_config)
+            # Initialize Graphiti with new API (v0.3.6+)
+            from graphiti_core.llm_client.config import LLMConfig
 
-        self.graphiti = Graphiti(
-            uri=neo4j_uri,
-            user=neo4j_user,
-            password=neo4j_password,
-            llm_client=llm_client
-        )
+            llm_config = LLMConfig(
+                api_key=openai_api_key,
+                model=model_name,
+                base_url=base_url,
+                max_tokens=4096  # GPT-4 Turbo max completion tokens
+            )
+            llm_client = TrackedOpenAIClient(config=llm_config, cache=llm_cache)
+
+            self.graphiti = Graphiti(
+                uri=neo4j_uri,
+                user=neo4j_user,
+                password=neo4j_password,
+                llm_client=llm_client
+            )
+        elif backend == "sqlite":
+            # Embedded store; extraction and search are done without Graphiti
+            self.store = SQLiteGraphStore(sqlite_path)
+            self.graphiti = None
+            llm_client = None
+        else:
+            raise ValueError(f"Unknown graph backend: {backend}")
+
+        self.llm_client = llm_client
+        # LLM calls made by the sqlite backend's own extraction
+        self._extraction_calls = 0
+
+        # Kept for callers that issue their own Cypher
+        self.driver = getattr(self.store, "driver", None)
 
         # Initialize LLM for response generation
         self.llm = ChatOpenAI(
             model=model_name,
             temperature=0,
-            api_key=openai_api_key
+            api_key=openai_api_key,
+            base_url=base_url
         )
 
-        print("Knowledge Graph RAG initialized")
+        # Optional in-process snapshot of the entity graph (see enable_mirror)
+        self.mirror: Optional[GraphMirror] = None
+        self.mirror_path: Optional[str] = None
+
+        # Optional precomputed community summaries (see enable_communities)
+        self.communities: Optional[CommunityIndex] = None
+
+        # Optional local entity linker (see enable_entity_index)
+        self.entity_index: Optional[EntityIndex] = None
+        self.entity_index_path: Optional[str] = None
+
+        # Cached get_graph_statistics result, dropped on ingest, clear and compaction
+        self._statistics: Optional[Dict[str, Any]] = None
+        self._statistics_time = 0.0
+
+        print(f"Knowledge Graph RAG initialized ({backend} backend)")
+
+    def enable_mirror(self, path: Optional[str] = None) -> GraphMirror:
+        """
+        Keep an in-process CSR mirror of the entity graph for fast lookups.
+
+        Args:
+            path: Optional directory to warm-start from and persist to
+
+        Returns:
+            The synced GraphMirror
+        """
+        self.mirror_path = path
+        if path and os.path.exists(os.path.join(path, "meta.json")):
+            self.mirror = GraphMirror.load(path)
+        else:
+            self.mirror = GraphMirror()
+
+        # Only edges created since the persisted watermark are fetched
+        self.mirror.refresh(self.store)
+        if path:
+            self.mirror.save(path)
+        return self.mirror
+
+    def _sync_mirror(self) -> None:
+        """Apply newly ingested edges to the mirror, if enabled."""
+        if self.mirror is None:
+            return
+        self.mirror.refresh(self.store)
+        if self.mirror_path:
+            self.mirror.save(self.mirror_path)
+
+    def enable_entity_index(
+        self,
+        path: Optional[str] = None,
+        embedding_model: Optional[str] = "text-embedding-3-small"
+    ) -> EntityIndex:
+        """
+        Keep a local entity index for linking questions to seed entities.
+
+        Args:
+            path: Optional directory to warm-start from and persist to
+            embedding_model: OpenAI embedding model for the semantic fallback
+                (None links by entity name only)
+
+        Returns:
+            The synced EntityIndex
+        """
+        embeddings = None
+        if embedding_model:
+            embeddings = OpenAIEmbeddings(model=embedding_model, api_key=self.openai_api_key, base_url=self.base_url)
+
+        self.entity_index_path = path
+        if path and os.path.exists(os.path.join(path, "meta.json")):
+            self.entity_index = EntityIndex.load(path, embeddings)
+        else:
+            self.entity_index = EntityIndex(embeddings)
+
+        # Only entities created since the persisted watermark are embedded
+        self.entity_index.refresh(self.store)
+        if path:
+            self.entity_index.save(path)
+        return self.entity_index
+
+    def _sync_entity_index(self) -> None:
+        """Index newly ingested entities, if enabled."""
+        if self.entity_index is None:
+            return
+        self.entity_index.refresh(self.store)
+        if self.entity_index_path:
+            self.entity_index.save(self.entity_index_path)
+
+    async def enable_communities(
+        self,
+        path: Optional[str] = None,
+        resolution: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        Build community summaries for global questions and keep them up to date.
+
+        Once enabled, ingestion re-summarises only the communities it changed.
+
+        Args:
+            path: Optional JSON file to warm-start from and persist to
+            resolution: Louvain resolution (higher gives smaller communities)
+
+        Returns:
+            Refresh report (see CommunityIndex.refresh)
+        """
+        self.communities = CommunityIndex(path=path, resolution=resolution)
+        return await self.communities.refresh(self.store, self.llm)
+
+    async def _sync_communities(self) -> Optional[Dict[str, Any]]:
+        """Re-summarise communities changed by ingestion, if enabled."""
+        if self.communities is None:
+            return None
+        return await self.communities.refresh(self.store, self.llm)
+
+    def clear_graph(self, group_id: Optional[str] = None, batch_size: int = 10000) -> Dict[str, Any]:
+        """
+        Clear nodes and relationships from the graph in batched transactions.
+
+        Args:
+            group_id: Only clear this document set (see add_documents_to_graph);
+                None clears the whole graph
+            batch_size: Nodes deleted per transaction
 
-    def clear_graph(self) -> None:
-        """Clear all nodes and relationships from the graph."""
-        with self.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        Returns:
+            Dictionary with deleted_nodes, seconds and nodes_per_second
+        """
+        report = self.store.clear(group_id=group_id, batch_size=batch_size)
+        self.invalidate_statistics()
+        if self.mirror is not None:
+            self.mirror.reset()
+            self._sync_mirror()
+        if self.entity_index is not None:
+            self.entity_index.reset()
+            self._sync_entity_index()
+        if self.communities is not None:
+            # Communities of other groups keep their summaries
+            if group_id is None:
+                self.communities.reset()
+            else:
+                self.communities.prune({entity["uuid"] for entity in self.store.iter_entities()})
+            if self.communities.path:
+                self.communities.save(self.communities.path)
         print("Graph cleared")
+        return report
+
+    def compact_graph(
+        self,
+        group_id: Optional[str] = None,
+        batch_size: int = 1000,
+        archive_path: Optional[str] = "archive/expired_facts.jsonl",
+        retention_days: float = 0.0,
+        expire_superseded: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Merge duplicates, archive superseded facts and drop orphan nodes.
+
+        Run this after re-ingesting overlapping documents so the graph (and
+        search and expansion latency) does not grow with every rebuild.
+
+        Args:
+            group_id: Only compact this document set (None compacts the whole graph)
+            batch_size: Groups or rows handled per transaction
+            archive_path: JSONL file superseded facts are appended to (None drops them)
+            retention_days: Keep superseded facts this many days before archiving
+            expire_superseded: On the sqlite backend, also expire facts that a
+                later document states differently for the same entities and
+                relation (off by default; such facts are often not contradictions)
+
+        Returns:
+            Dictionary with before/after statistics and per-step counts
+        """
+        report = self.store.compact(
+            group_id=group_id,
+            batch_size=batch_size,
+            archive_path=archive_path,
+            expired_before=datetime.now(timezone.utc) - timedelta(days=retention_days),
+            expire_superseded=expire_superseded
+        )
+        self.invalidate_statistics()
+        if self.mirror is not None:
+            self.mirror.reset()
+            self._sync_mirror()
+        if self.entity_index is not None:
+            self.entity_index.reset()
+            self._sync_entity_index()
+        return report
+
+    @property
+    def llm_calls(self) -> int:
+        """Number of extraction LLM calls made so far."""
+        if self.llm_client is not None:
+            return self.llm_client.num_calls
+        return self._extraction_calls
 
     async def add_documents_to_graph(
         self,
         documents: List[str],
-        source: str = "api_documentation"
-    ) -> None:
+        source: str = "api_documentation",
+        group_id: Optional[str] = None,
+        bulk: bool = False,
+        batch_size: int = 10,
+        timestamps: Optional[List[datetime]] = None
+    ) -> Dict[str, Any]:
         """
         Add documents to the knowledge graph.
 
         Args:
             documents: List of document chunks
             source: Source identifier for the documents
+            group_id: Graph partition for the documents (defaults to source),
+                so one document set can be cleared and rebuilt on its own
+            bulk: Ingest ``batch_size`` chunks at a time. With Graphiti this uses
+                add_episode_bulk (batched extraction, entity resolution and
+                embedding, but no temporal edge invalidation); the sqlite
+                backend extracts a whole batch with one prompt.
+            batch_size: Number of chunks per bulk batch
+            timestamps: When each document was written or published, used as
+                the episode reference time and as valid_at of its facts
+                (defaults to now); naive values are taken as local time
+
+        Returns:
+            Dictionary with chunks, seconds, chunks_per_second, llm_calls
+            (API calls, cache hits excluded), llm_calls_per_chunk and,
+            with a cache, llm_cache statistics and, with communities
+            enabled, the community refresh report
         """
-        print(f"Adding {len(documents)} documents to knowledge graph...")
+        group_id = group_id if group_id is not None else source
+        mode = "bulk" if bulk else "per-episode"
+        print(f"Adding {len(documents)} documents to knowledge graph ({mode})...")
         start_time = time.time()
+        start_calls = self.llm_calls
+
+        episodes = self._make_episodes(documents, source, timestamps)
+        step = batch_size if bulk else 1
+        self.invalidate_statistics()
+
+        for batch_start in range(0, len(episodes), step):
+            batch = episodes[batch_start:batch_start + step]
+
+            if self.graphiti is not None and bulk:
+                await self.graphiti.add_episode_bulk(
+                    [
+                        RawEpisode(
+                            name=episode["name"],
+                            content=episode["content"],
+                            source_description=episode["source_description"],
+                            source=EpisodeType.text,
+                            reference_time=episode["reference_time"]
+                        )
+                        for episode in batch
+                    ],
+                    group_id=group_id
+                )
+            elif self.graphiti is not None:
+                # Add each document as an episode to Graphiti
+                episode = batch[0]
+                await self.graphiti.add_episode(
+                    name=episode["name"],
+                    episode_body=episode["content"],
+                    source_description=episode["source_description"],
+                    reference_time=episode["reference_time"],
+                    source=EpisodeType.text,
+                    group_id=group_id
+                )
+            else:
+                await self._add_episodes_to_store(batch, group_id)
+
+            processed = batch_start + len(batch)
+            if processed % 10 < len(batch) or processed == len(episodes):
+                print(f"  Processed {processed}/{len(documents)} chunks...")
+
+        if self.graphiti is not None:
+            self.store.backfill_valid_at([episode["name"] for episode in episodes], group_id)
+
+        build_time = time.time() - start_time
+        print(f"Knowledge graph built in {build_time:.2f} seconds")
+
+        self.invalidate_statistics()
+        self._sync_mirror()
+        self._sync_entity_index()
+        communities = await self._sync_communities()
+
+        llm_calls = self.llm_calls - start_calls
+        report = {
+            "mode": mode,
+            "chunks": len(documents),
+            "seconds": build_time,
+            "chunks_per_second": len(documents) / build_time if build_time > 0 else 0.0,
+            "llm_calls": llm_calls,
+            "llm_calls_per_chunk": llm_calls / len(documents) if documents else 0.0
+        }
+        if self.llm_cache is not None:
+            report["llm_cache"] = self.llm_cache.stats()
+            print(f"  LLM cache: {report['llm_cache']['hits']} hits, "
+                  f"{report['llm_cache']['misses']} misses, {llm_calls} API calls")
+        if communities is not None:
+            report["communities"] = communities
+        return report
+
+    @staticmethod
+    def _make_episodes(
+        documents: List[str],
+        source: str,
+        timestamps: Optional[List[datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """Episode dictionaries for document chunks, stamped with their (UTC) reference time."""
+        if timestamps is not None and len(timestamps) != len(documents):
+            raise ValueError("timestamps must have one entry per document")
+        return [
+            {
+                "name": f"{source}_chunk_{i}",
+                "content": doc,
+                "source_description": f"Document chunk {i} from {source}",
+                "reference_time": to_utc(timestamps[i]) if timestamps is not None else datetime.now(timezone.utc)
+            }
+            for i, doc in enumerate(documents)
+        ]
+
+    async def _extract(self, contents: List[str]) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """Extract entities and relations from chunks with one LLM call, through the cache."""
+        cache_key = None
+        extracted = None
+        if self.llm_cache is not None:
+            cache_key = LLMCache.make_key(self.model_name, contents, {"task": "extract_graph"})
+            extracted = self.llm_cache.get(cache_key)
+
+        if extracted is None:
+            if len(contents) == 1:
+                extracted = [await extract_graph(self.llm, contents[0])]
+            else:
+                extracted = await extract_graph_batch(self.llm, contents)
+            self._extraction_calls += 1
+            if cache_key is not None:
+                self.llm_cache.set(cache_key, extracted, model=self.model_name)
+        return extracted
+
+    async def extract_to_file(
+        self,
+        documents: List[str],
+        path: str,
+        source: str = "api_documentation",
+        timestamps: Optional[List[datetime]] = None,
+        batch_size: int = 10,
+        max_concurrency: int = 4,
+        embedding_model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract a corpus to a JSONL file for load_from_file (phase one of a bulk build).
+
+        Nothing is written to the graph. Re-running with the same path
+        resumes after the chunks already extracted.
+
+        Args:
+            documents: List of document chunks
+            path: JSONL file to append to
+            source: Source identifier for the documents
+            timestamps: Document timestamps (see add_documents_to_graph)
+            batch_size: Chunks per extraction prompt
+            max_concurrency: Extraction calls in flight at once
+            embedding_model: Embed entity names and facts for Graphiti's
+                hybrid search (defaults to text-embedding-3-small on the
+                neo4j backend and no embeddings on sqlite)
+
+        Returns:
+            Dictionary with chunks, skipped, seconds, chunks_per_second and llm_calls
+        """
+        if embedding_model is None and self.graphiti is not None:
+            embedding_model = "text-embedding-3-small"
+        embeddings = None
+        if embedding_model:
+            embeddings = OpenAIEmbeddings(model=embedding_model, api_key=self.openai_api_key, base_url=self.base_url)
+
+        start_calls = self.llm_calls
+        report = await extract_to_jsonl(
+            self._extract,
+            self._make_episodes(documents, source, timestamps),
+            path,
+            source=source,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+            embeddings=embeddings
+        )
+        report["llm_calls"] = self.llm_calls - start_calls
+        return report
+
+    async def load_from_file(
+        self,
+        path: str,
+        group_id: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Bulk-load a file written by extract_to_file (phase two of a bulk build).
+
+        Chunks are written ``batch_size`` at a time with one batched
+        statement per node and relationship kind, after the indexes are
+        built. Graphiti's per-episode entity resolution and edge
+        invalidation are skipped, so use this for the initial build and
+        add_documents_to_graph for incremental updates.
 
-        for i, doc in enumerate(documents):
-            # Add each document as an episode to Graphiti
-            await self.graphiti.add_episode(
-                name=f"{source}_chunk_{i}",
-                episode_body=doc,
-                source_description=f"Document chunk {i} from {source}",
-                reference_time=datetime.now(),
-                source=EpisodeType.text
+        Args:
+            path: JSONL file written by extract_to_file
+            group_id: Graph partition (defaults to the source the file was extracted from)
+            batch_size: Chunks per bulk write
+
+        Returns:
+            Dictionary with episodes, entities, edges, seconds,
+            nodes_per_second and edges_per_second
+        """
+        if group_id is None:
+            group_id = next(read_records(path), {}).get("source", "")
+
+        self.invalidate_statistics()
+        report = await asyncio.to_thread(load_jsonl, self.store, path, group_id, batch_size)
+        self.invalidate_statistics()
+        self._sync_mirror()
+        self._sync_entity_index()
+        communities = await self._sync_communities()
+        if communities is not None:
+            report["communities"] = communities
+        return report
+
+    async def _add_episodes_to_store(self, episodes: List[Dict[str, Any]], group_id: str = "") -> None:
+        """Extract entities and relations with the LLM and write them to the store."""
+        extracted = await self._extract([episode["content"] for episode in episodes])
+
+        for episode, graph in zip(episodes, extracted):
+            episode_uuid = self.store.add_episode(
+                episode["name"], episode["content"], episode["source_description"],
+                episode["reference_time"], group_id
             )
+            uuids = self.store.add_entities(graph["entities"], group_id, episode_uuid)
+            edges = [
+                {
+                    "source_uuid": uuids[relation["source"]],
+                    "target_uuid": uuids[relation["target"]],
+                    "relation": relation["relation"],
+                    "fact": relation["fact"],
+                    "valid_at": episode["reference_time"]
+                }
+                for relation in graph["relations"]
+            ]
+            self.store.add_edges(edges, group_id, episode_uuid)
+
+    def expand_entities(
+        self,
+        seed_scores: Dict[str, float],
+        hops: int = 2,
+        fan_out: int = 10,
+        hop_decay: float = 0.5,
+        window: Optional[Dict[str, datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Expand seed entities through RELATES_TO edges, one batched store call per hop.
 
-            if (i + 1) % 10 == 0:
-                print(f"  Processed {i + 1}/{len(documents)} chunks...")
+        Args:
+            seed_scores: Mapping of seed entity uuid to its retrieval score
+            hops: Number of hops to expand
+            fan_out: Maximum number of edges followed per node and hop
+            hop_decay: Score multiplier applied at every hop
+            window: Only follow edges valid in this window (see graph_store.time_window)
 
-        build_time = time.time() - start_time
-        print(f"Knowledge graph built in {build_time:.2f} seconds")
+        Returns:
+            Scored edge records, best first
+        """
+        node_scores = dict(seed_scores)
+        frontier = dict(seed_scores)
+        seen_edges = set()
+        paths = []
+
+        for hop in range(1, hops + 1):
+            if not frontier:
+                break
+
+            records = self.store.expand_hop(list(frontier), list(seen_edges), fan_out, window)
+
+            # Rank edges in this hop by recency, newest first
+            timestamps = sorted(
+                {_to_epoch(r["edge"]["timestamp"]) for r in records},
+                reverse=True
+            )
+            recency_rank = {ts: i for i, ts in enumerate(timestamps)}
+
+            next_frontier = {}
+            for record in records:
+                edge = record["edge"]
+                if edge["edge_uuid"] in seen_edges:
+                    continue
+                seen_edges.add(edge["edge_uuid"])
+
+                recency = 1.0 - recency_rank[_to_epoch(edge["timestamp"])] / max(len(timestamps), 1)
+                score = frontier[record["from_uuid"]] * hop_decay * (0.5 + 0.5 * recency)
+                paths.append({**edge, "hop": hop, "score": score})
+
+                neighbor = edge["neighbor_uuid"]
+                if score > node_scores.get(neighbor, 0.0):
+                    node_scores[neighbor] = score
+                    next_frontier[neighbor] = score
+
+            frontier = next_frontier
+
+        paths.sort(key=lambda p: p["score"], reverse=True)
+        return paths
+
+    async def search_edges(
+        self,
+        question: str,
+        max_facts: int = 10,
+        window: Optional[Dict[str, datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search facts with Graphiti (neo4j backend) or the store's keyword search.
+
+        Args:
+            question: User's question
+            max_facts: Maximum number of edges returned
+            window: Only facts valid in this window (see graph_store.time_window);
+                windowed searches always go to the store, which reads the
+                window through its valid_at index
+
+        Returns:
+            Dictionaries with edge_uuid, fact, relation, source_uuid and target_uuid
+        """
+        if self.graphiti is None or window is not None:
+            return await asyncio.to_thread(self.store.search_facts, question, max_facts, window)
+
+        # Graphiti search returns EntityEdge objects
+        return [
+            {
+                "edge_uuid": getattr(edge, "uuid", None),
+                "fact": getattr(edge, "fact", None),
+                "relation": getattr(edge, "name", None),
+                "source_uuid": getattr(edge, "source_node_uuid", None),
+                "target_uuid": getattr(edge, "target_node_uuid", None)
+            }
+            for edge in await self.graphiti.search(query=question, num_results=max_facts)
+        ]
+
+    async def retrieve(
+        self,
+        question: str,
+        max_facts: int = 10,
+        mode: str = "search",
+        hops: int = 2,
+        fan_out: int = 10,
+        token_budget: int = 2000,
+        as_of: Optional[datetime] = None,
+        between: Optional[Tuple[datetime, datetime]] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve facts for a question without generating an answer.
+
+        Args:
+            question: User's question
+            max_facts: Maximum number of facts returned by the search step
+            mode: "search" for flat fact search, "expand" to also expand
+                the seed entities through the graph, "global" to use the
+                precomputed community summaries (see enable_communities),
+                "link" to expand entities linked by the local entity index
+                (see enable_entity_index) without a remote search
+            hops: Number of hops to expand in "expand" and "link" mode
+            fan_out: Maximum edges followed per node and hop when expanding
+            token_budget: Approximate token budget for the facts in "expand",
+                "link" and "global" mode
+            as_of: Only use facts valid at this time
+            between: (start, end) pair; only use facts that became valid in
+                this range
+
+        Returns:
+            Dictionary with facts, fact_ids (edge uuids, or community ids in
+            "global" mode, aligned with facts), entities and relationships
+        """
+        if mode not in ("search", "expand", "global", "link"):
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        window = time_window(as_of, between)
+
+        if mode == "global":
+            if window is not None:
+                raise ValueError("Global mode does not support as_of or between")
+            if self.communities is None or not self.communities.communities:
+                raise ValueError("Global mode needs community summaries; call enable_communities() first")
+            selected = self.communities.select(question, token_budget)
+            return {
+                "facts": [CommunityIndex.render(c) for c in selected],
+                "fact_ids": [f"community:{c['id']}" for c in selected],
+                "entities": [name for c in selected for name in c["names"]],
+                "relationships": []
+            }
+
+        if mode == "link":
+            if self.entity_index is None:
+                raise ValueError("Link mode needs an entity index; call enable_entity_index() first")
+            # Seeds come from the local index; no remote search per question
+            linked = await asyncio.to_thread(self.entity_index.link, question, max_facts)
+            search_results = []
+        else:
+            linked = []
+            search_results = await self.search_edges(question, max_facts, window)
+
+        candidates = []
+        seed_scores = {entity["uuid"]: entity["score"] for entity in linked}
+        for rank, edge in enumerate(search_results):
+            score = 1.0 / (1 + rank)
+            candidates.append({
+                "edge_uuid": edge["edge_uuid"],
+                "fact": edge["fact"],
+                "relation": edge["relation"],
+                "score": score
+            })
+            for node_uuid in (edge["source_uuid"], edge["target_uuid"]):
+                if node_uuid and score > seed_scores.get(node_uuid, 0.0):
+                    seed_scores[node_uuid] = score
+
+        entities = await asyncio.to_thread(self.store.entity_names, list(seed_scores))
+        if mode in ("expand", "link") and seed_scores:
+            paths = await asyncio.to_thread(self.expand_entities, seed_scores, hops, fan_out, window=window)
+            candidates.extend(paths)
+            for path in paths:
+                entities.extend([path["source"], path["target"]])
+
+        facts = []
+        fact_ids = []
+        relationships = []
+        seen = set()
+        used_tokens = 0
+        for candidate in sorted(candidates, key=lambda c: c["score"], reverse=True):
+            fact = candidate["fact"]
+            if not fact or fact in seen or candidate["edge_uuid"] in seen:
+                continue
+            cost = _estimate_tokens(fact)
+            if mode in ("expand", "link") and facts and used_tokens + cost > token_budget:
+                continue
+            seen.add(fact)
+            if candidate["edge_uuid"]:
+                seen.add(candidate["edge_uuid"])
+            used_tokens += cost
+            facts.append(fact)
+            fact_ids.append(candidate["edge_uuid"])
+            if candidate.get("relation"):
+                relationships.append(candidate["relation"])
+
+        return {
+            "facts": facts,
+            "fact_ids": fact_ids,
+            "entities": [e for e in dict.fromkeys(entities) if e],
+            "relationships": relationships
+        }
 
-    async def query(self, question: str, max_facts: int = 10) -> Dict[str, Any]:
+    async def query(
+        self,
+        question: str,
+        max_facts: int = 10,
+        mode: str = "search",
+        hops: int = 2,
+        fan_out: int = 10,
+        token_budget: int = 2000,
+        as_of: Optional[datetime] = None,
+        between: Optional[Tuple[datetime, datetime]] = None
+    ) -> Dict[str, Any]:
         """
         Query the knowledge graph.
 
         Args:
             question: User's question
             max_facts: Maximum number of facts to retrieve
+            mode: Retrieval mode, "search", "expand", "global" or "link" (see retrieve)
+            hops: Number of hops to expand in "expand" and "link" mode
+            fan_out: Maximum edges followed per node and hop when expanding
+            token_budget: Approximate token budget for the facts in "expand",
+                "link" and "global" mode
+            as_of: Only use facts valid at this time
+            between: (start, end) pair; only use facts that became valid in
+                this range
 
         Returns:
             Dictionary with answer, facts, and metrics
@@ -122,42 +801,42 @@ class KnowledgeGraphRAG:
         print(f"\nQuerying Knowledge Graph: {question}")
         start_time = time.time()
 
-        # Search the knowledge graph for relevant facts
-        search_results = await self.graphiti.search(
-            query=question,
-            num_results=max_facts
+        retrieved = await self.retrieve(
+            question,
+            max_facts=max_facts,
+            mode=mode,
+            hops=hops,
+            fan_out=fan_out,
+            token_budget=token_budget,
+            as_of=as_of,
+            between=between
         )
+        facts = retrieved["facts"]
+        entities = retrieved["entities"]
+        relationships = retrieved["relationships"]
 
         retrieval_time = time.time() - start_time
 
-        # Extract facts from search results
-        facts = []
-        entities = []
-        relationships = []
-
-        for result in search_results:
-            if hasattr(result, 'fact'):
-                facts.append(result.fact)
-            if hasattr(result, 'content'):
-                facts.append(result.content)
-
-            # Extract entities and relationships
-            if hasattr(result, 'nodes'):
-                for node in result.nodes:
-                    if hasattr(node, 'name'):
-                        entities.append(node.name)
-
-            if hasattr(result, 'edges'):
-                for edge in result.edges:
-                    if hasattr(edge, 'fact'):
-                        relationships.append(edge.fact)
-
         # Build context from facts
         context = "\n\n".join(facts) if facts else "No relevant information found."
 
         # Generate answer using LLM
         generation_start = time.time()
-        prompt = f"""You are a helpful AI assistant answering questions about the CloudStore API documentation.
+        if mode == "global":
+            prompt = f"""You are a helpful AI assistant answering questions about the CloudStore API documentation.
+
+Use the following summaries of communities of related entities from the documentation's knowledge graph to answer the question.
+
+Community Summaries:
+{context}
+
+Question: {question}
+
+Provide a comprehensive answer that draws on all relevant communities. If the summaries don't contain enough information, say so.
+
+Answer:"""
+        else:
+            prompt = f"""You are a helpful AI assistant answering questions about the CloudStore API documentation.
 
 Use the following knowledge graph facts to answer the question. These facts represent relationships and entities extracted from the documentation.
 
@@ -170,7 +849,7 @@ Provide a comprehensive answer based on the knowledge graph facts. If the facts
 
 Answer:"""
 
-        response = self.llm.invoke(prompt)
+        response = await self.llm.ainvoke(prompt)
         answer = response.content
 
         generation_time = time.time() - generation_start
@@ -195,10 +874,39 @@ Answer:"""
                 "num_entities": num_entities,
                 "num_relationships": num_relationships,
                 "answer_tokens": num_tokens,
-                "retrieval_method": "knowledge_graph"
+                "retrieval_method": "knowledge_graph",
+                "retrieval_mode": mode
             }
         }
 
+    def iter_entity_relationships(
+        self,
+        entity_names: List[str],
+        relationship_types: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        fetch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the relationships of many entities with a single query.
+
+        Records are pulled from the store in batches of ``fetch_size`` while
+        the generator is consumed, so hub entities never have to fit in memory.
+
+        Args:
+            entity_names: Names of the entities
+            relationship_types: Only return these relationship types
+            skip: Number of records to skip (pagination)
+            limit: Maximum number of records to return (pagination)
+            fetch_size: Number of records fetched per round trip
+
+        Yields:
+            Dictionaries with entity, source, relationship and target
+        """
+        return self.store.iter_entity_relationships(
+            entity_names, relationship_types, skip, limit, fetch_size
+        )
+
     def get_entity_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
         """
         Get all relationships for a specific entity.
@@ -209,49 +917,59 @@ Answer:"""
         Returns:
             List of relationships
         """
-        with self.driver.session() as session:
-            query = """
-            MATCH (e:Entity {name: $entity_name})-[r]->(target)
-            RETURN e.name as source, type(r) as relationship, target.name as target
-            UNION
-            MATCH (source)-[r]->(e:Entity {name: $entity_name})
-            RETURN source.name as source, type(r) as relationship, e.name as target
-            """
-            result = session.run(query, entity_name=entity_name)
-            return [dict(record) for record in result]
+        relationships = {}
+        for record in self.iter_entity_relationships([entity_name]):
+            key = (record["source"], record["relationship"], record["target"])
+            relationships[key] = {
+                "source": record["source"],
+                "relationship": record["relationship"],
+                "target": record["target"]
+            }
+        return list(relationships.values())
 
-    def get_graph_statistics(self) -> Dict[str, int]:
+    def get_entity_neighbors(self, entity_name: str, hops: int = 1) -> Dict[int, List[str]]:
         """
-        Get statistics about the knowledge graph.
+        Get the neighbourhood of an entity from the in-process mirror.
+
+        Args:
+            entity_name: Name of the entity
+            hops: Number of hops to expand
 
         Returns:
-            Dictionary with graph statistics
+            Mapping of hop distance to neighbour entity names
         """
-        with self.driver.session() as session:
-            # Count nodes
-            node_result = session.run("MATCH (n) RETURN count(n) as count")
-            num_nodes = node_result.single()["count"]
+        if self.mirror is None:
+            self.enable_mirror()
+        return self.mirror.neighborhood(entity_name, hops)
+
+    def get_graph_statistics(self, refresh: bool = False, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get statistics about the knowledge graph.
 
-            # Count relationships
-            rel_result = session.run("MATCH ()-[r]->() RETURN count(r) as count")
-            num_relationships = rel_result.single()["count"]
+        The store is queried once and the result is cached until the next
+        ingest, clear or compaction through this instance.
 
-            # Count entities
-            entity_result = session.run("MATCH (n:Entity) RETURN count(n) as count")
-            num_entities = entity_result.single()["count"]
+        Args:
+            refresh: Bypass the cache
+            max_age: Also re-read once the cached result is this many seconds
+                old (for graphs written by other processes)
 
-            # Count episodes
-            episode_result = session.run("MATCH (n:Episode) RETURN count(n) as count")
-            num_episodes = episode_result.single()["count"]
+        Returns:
+            Dictionary with graph statistics (see GraphStore.get_statistics)
+        """
+        stale = max_age is not None and time.time() - self._statistics_time > max_age
+        if refresh or stale or self._statistics is None:
+            self._statistics = self.store.get_statistics()
+            self._statistics_time = time.time()
+        return self._statistics
 
-        return {
-            "total_nodes": num_nodes,
-            "total_relationships": num_relationships,
-            "num_entities": num_entities,
-            "num_episodes": num_episodes
-        }
+    def invalidate_statistics(self) -> None:
+        """Drop the cached graph statistics."""
+        self._statistics = None
 
     def close(self) -> None:
-        """Close the Neo4j driver connection."""
-        self.driver.close()
-        print("Neo4j connection closed")
+        """Close the graph store connection."""
+        self.store.close()
+        if self.llm_cache is not None:
+            self.llm_cache.close()
+        print(f"{self.store.backend_name} connection closed")
@@ -0,0 +1,173 @@
+"""Persistent SQLite cache for LLM responses."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_idx ON responses (accessed_at);
+"""
+
+
+class LLMCache:
+    """
+    Size-capped LLM response cache with LRU eviction and optional TTL.
+
+    Entries are keyed by model, a hash of the prompt messages and the
+    generation parameters, so changing any of them is a miss.
+    """
+
+    def __init__(
+        self,
+        path: str = "llm_cache/responses.db",
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the LLM cache.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Evict least recently used entries beyond this size
+            ttl_seconds: Treat entries older than this as misses (None = never expire)
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._total_bytes = self.conn.execute(
+            "SELECT coalesce(sum(size), 0) FROM responses"
+        ).fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_served = 0
+
+    @staticmethod
+    def make_key(model: str, messages: Any, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            model: Model name
+            messages: Prompt messages (anything JSON-serialisable)
+            params: Generation parameters (temperature, max_tokens, ...)
+
+        Returns:
+            Key of the form ``model:sha256``
+        """
+        payload = json.dumps(
+            {"messages": messages, "params": params or {}},
+            sort_keys=True,
+            default=str
+        )
+        return f"{model}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, size, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds is not None and now - row[2] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            self.bytes_served += row[1]
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, model: Optional[str] = None) -> None:
+        """
+        Store a response, evicting least recently used entries if over capacity.
+
+        Args:
+            key: Key from make_key
+            value: JSON-serialisable response
+            model: Model name (informational)
+        """
+        data = json.dumps(value, default=str)
+        size = len(data.encode("utf-8"))
+        now = time.time()
+        with self._lock, self.conn:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, data, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+
+            if self._total_bytes > self.max_bytes:
+                candidates = self.conn.execute(
+                    "SELECT key, size FROM responses WHERE key != ? ORDER BY accessed_at", (key,)
+                )
+                victims = []
+                for victim_key, victim_size in candidates:
+                    if self._total_bytes <= self.max_bytes:
+                        break
+                    victims.append((victim_key,))
+                    self._total_bytes -= victim_size
+                self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+                self.evictions += len(victims)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries, bytes,
+            bytes_served and evictions
+        """
+        with self._lock:
+            entries = self.conn.execute("SELECT count(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "bytes_served": self.bytes_served,
+            "evictions": self.evictions
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
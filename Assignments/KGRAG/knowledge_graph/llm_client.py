@@ -0,0 +1,56 @@
+"""Graphiti LLM client with call accounting and a persistent response cache."""
+
+from typing import Optional
+
+from graphiti_core.llm_client import OpenAIClient
+
+from .llm_cache import LLMCache
+
+
+class TrackedOpenAIClient(OpenAIClient):
+    """
+    OpenAIClient that counts the LLM calls Graphiti makes during extraction.
+
+    With an LLMCache, identical extraction prompts are answered from the
+    cache, so rebuilding a graph from the same documents costs (almost) no
+    API calls. ``num_calls`` counts only calls that reached the API.
+    """
+
+    def __init__(self, config=None, cache: Optional[LLMCache] = None, **kwargs):
+        """
+        Initialize the client.
+
+        Args:
+            config: Graphiti LLMConfig
+            cache: Optional persistent response cache
+            **kwargs: Passed through to OpenAIClient
+        """
+        super().__init__(config=config, **kwargs)
+        self.response_cache = cache
+        self.num_calls = 0
+
+    def _cache_key(self, messages, args, kwargs) -> str:
+        serialized = [m.model_dump() if hasattr(m, "model_dump") else m for m in messages]
+        params = {
+            "temperature": getattr(self, "temperature", None),
+            "max_tokens": getattr(self, "max_tokens", None),
+            "args": args,
+            "kwargs": kwargs
+        }
+        return LLMCache.make_key(self.model, serialized, params)
+
+    async def generate_response(self, messages, *args, **kwargs):
+        """Generate a response, serving repeated prompts from the cache."""
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key(messages, args, kwargs)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        self.num_calls += 1
+        response = await super().generate_response(messages, *args, **kwargs)
+
+        if key is not None:
+            self.response_cache.set(key, response, model=self.model)
+        return response
@@ -0,0 +1,110 @@
+"""Graph statistics in the Prometheus text format, served over HTTP for dashboards."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(stats: Dict[str, Any], llm_cache: Optional[Dict[str, Any]] = None, prefix: str = "kgrag") -> str:
+    """
+    Render graph statistics in the Prometheus text exposition format.
+
+    Args:
+        stats: Dictionary from KnowledgeGraphRAG.get_graph_statistics
+        llm_cache: Optional dictionary from LLMCache.stats
+        prefix: Metric name prefix
+
+    Returns:
+        Metrics text ending with a newline
+    """
+    lines: List[str] = []
+
+    def metric(name: str, help_text: str, samples: List[tuple], kind: str = "gauge") -> None:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text else f"{prefix}_{name} {value}")
+
+    metric("graph_nodes", "Nodes in the knowledge graph.", [({}, stats["total_nodes"])])
+    metric("graph_relationships", "Relationships in the knowledge graph.", [({}, stats["total_relationships"])])
+    metric("graph_label_nodes", "Nodes per label.",
+           [({"label": label}, count) for label, count in sorted(stats.get("labels", {}).items())])
+    metric("graph_type_relationships", "Relationships per type.",
+           [({"type": rel_type}, count) for rel_type, count in sorted(stats.get("relationship_types", {}).items())])
+    degree = stats.get("degree", {})
+    metric("graph_entity_degree", "Entity degree percentiles.",
+           [({"quantile": quantile}, degree[key])
+            for key, quantile in (("p50", "0.5"), ("p90", "0.9"), ("p99", "0.99"), ("max", "1"))
+            if key in degree])
+
+    if llm_cache is not None:
+        for key in ("hits", "misses", "evictions"):
+            metric(f"llm_cache_{key}_total", f"LLM cache {key} since start.", [({}, llm_cache[key])], "counter")
+        metric("llm_cache_entries", "Responses stored in the LLM cache.", [({}, llm_cache["entries"])])
+        metric("llm_cache_bytes", "Size of the LLM cache in bytes.", [({}, llm_cache["bytes"])])
+
+    return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(
+    kg_system,
+    host: str = "127.0.0.1",
+    port: int = 9108,
+    max_age: float = 30.0
+) -> ThreadingHTTPServer:
+    """
+    Serve the graph statistics in a background thread.
+
+    ``/metrics`` returns the Prometheus text format and ``/stats`` the raw
+    statistics as JSON. Both read the cached statistics, so scrapes cost a
+    store round trip at most once every ``max_age`` seconds and after each
+    ingest, clear or compaction.
+
+    Args:
+        kg_system: KnowledgeGraphRAG instance
+        host: Interface to bind
+        port: Port to listen on (0 picks a free port)
+        max_age: Seconds before cached statistics are re-read
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path not in ("/metrics", "/stats"):
+                self.send_error(404)
+                return
+            try:
+                stats = kg_system.get_graph_statistics(max_age=max_age)
+            except Exception as e:
+                self.send_error(503, str(e))
+                return
+
+            if path == "/stats":
+                body = json.dumps(stats).encode("utf-8")
+                content_type = "application/json"
+            else:
+                cache = kg_system.llm_cache.stats() if kg_system.llm_cache is not None else None
+                body = render_metrics(stats, cache).encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"Metrics endpoint running at http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,677 @@
+"""Neo4j graph store (the schema Graphiti writes)."""
+
+import re
+import time
+import uuid as uuid_lib
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterator
+
+from neo4j import GraphDatabase
+
+from .graph_store import GraphStore, to_utc
+
+
+INDEX_STATEMENTS = [
+    "CREATE INDEX entity_name_index IF NOT EXISTS FOR (n:Entity) ON (n.name)",
+    "CREATE INDEX entity_uuid_index IF NOT EXISTS FOR (n:Entity) ON (n.uuid)",
+    "CREATE INDEX entity_group_index IF NOT EXISTS FOR (n:Entity) ON (n.group_id)",
+    "CREATE INDEX episodic_group_index IF NOT EXISTS FOR (n:Episodic) ON (n.group_id)",
+    "CREATE INDEX episodic_name_index IF NOT EXISTS FOR (n:Episodic) ON (n.name)",
+    "CREATE INDEX episodic_uuid_index IF NOT EXISTS FOR (n:Episodic) ON (n.uuid)",
+    # Range indexes backing the as_of / between validity windows
+    "CREATE INDEX relates_to_valid_at_index IF NOT EXISTS FOR ()-[r:RELATES_TO]-() ON (r.valid_at)",
+    "CREATE INDEX relates_to_invalid_at_index IF NOT EXISTS FOR ()-[r:RELATES_TO]-() ON (r.invalid_at)",
+    "CREATE INDEX episodic_valid_at_index IF NOT EXISTS FOR (n:Episodic) ON (n.valid_at)",
+]
+
+# Labels carrying a group_id, deleted by a scoped clear
+SCOPED_LABELS = ["Episodic", "Entity", "Community"]
+
+# Batches deleted per clear round trip (progress is reported after each)
+CLEAR_ROUND_BATCHES = 10
+
+# Appended to a MATCH binding n. Deletes one round of nodes in batched
+# sub-transactions; must run in an auto-commit transaction (session.run).
+CLEAR_BATCH_QUERY = """
+WITH n LIMIT $round_size
+CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF $batch_size ROWS
+RETURN count(*) AS deleted
+"""
+
+# All statistics in one round trip. Totals and per-label/per-type counts come
+# from the count store via APOC; degree percentiles use the per-node degree
+# (GetDegree) rather than expanding relationships.
+STATISTICS_QUERY = """
+CALL apoc.meta.stats() YIELD nodeCount, relCount, labels, relTypesCount
+CALL {
+    MATCH (n:Entity)
+    WITH COUNT { (n)--() } AS degree
+    RETURN percentileDisc(degree, 0.5) AS p50, percentileDisc(degree, 0.9) AS p90,
+           percentileDisc(degree, 0.99) AS p99, max(degree) AS max_degree
+}
+RETURN nodeCount, relCount, labels, relTypesCount, p50, p90, p99, max_degree
+"""
+
+# Relationships of many entities in one pass. Both directions come from a
+# single undirected match anchored on the Entity.name index. The total order
+# keeps SKIP/LIMIT pages stable between calls.
+ENTITY_RELATIONSHIPS_QUERY = """
+UNWIND $entity_names AS entity_name
+MATCH (e:Entity {name: entity_name})-[r]-(other)
+WHERE $relationship_types IS NULL OR type(r) IN $relationship_types
+RETURN entity_name AS entity,
+       CASE WHEN startNode(r) = e THEN e.name ELSE other.name END AS source,
+       type(r) AS relationship,
+       CASE WHEN startNode(r) = e THEN other.name ELSE e.name END AS target
+ORDER BY entity, relationship, source, target, elementId(r)
+"""
+
+# Expands a frontier of entity uuids by one hop. Edges are ordered by recency
+# and capped per node so hub entities cannot flood the result.
+EXPAND_HOP_QUERY = """
+UNWIND $uuids AS uuid
+MATCH (n:Entity {uuid: uuid})-[r:RELATES_TO]-(m:Entity)
+WHERE r.expired_at IS NULL AND NOT r.uuid IN $seen_edges
+WITH n, r, m
+ORDER BY coalesce(r.valid_at, r.created_at) DESC
+WITH n, collect({
+    edge_uuid: r.uuid,
+    fact: r.fact,
+    relation: r.name,
+    source: startNode(r).name,
+    target: endNode(r).name,
+    neighbor_uuid: m.uuid,
+    timestamp: coalesce(r.valid_at, r.created_at)
+})[..$fan_out] AS edges
+UNWIND edges AS edge
+RETURN n.uuid AS from_uuid, edge
+"""
+
+# Entity-to-entity edges created at or after a sync point.
+EDGES_SINCE_QUERY = """
+MATCH (a:Entity)-[r:RELATES_TO]->(b:Entity)
+WHERE $since IS NULL OR r.created_at >= $since
+RETURN a.uuid as source_uuid, a.name as source_name,
+       b.uuid as target_uuid, b.name as target_name,
+       r.uuid as uuid, r.name as relation, r.fact as fact, r.created_at as created_at
+ORDER BY r.created_at
+"""
+
+ENTITIES_SINCE_QUERY = """
+MATCH (n:Entity)
+WHERE $since IS NULL OR n.created_at >= $since
+RETURN n.uuid as uuid, n.name as name, n.summary as summary, n.created_at as created_at
+ORDER BY n.created_at
+"""
+
+ENTITY_NAMES_QUERY = "MATCH (n:Entity) WHERE n.uuid IN $uuids RETURN n.name as name"
+
+SEARCH_FACTS_QUERY = """
+CALL db.index.fulltext.queryRelationships('edge_name_and_fact', $query, {limit: $limit})
+YIELD relationship AS r, score
+RETURN r.uuid AS edge_uuid, r.fact AS fact, r.name AS relation,
+       startNode(r).uuid AS source_uuid, endNode(r).uuid AS target_uuid
+ORDER BY score DESC
+"""
+
+# Facts in a validity window, read through the valid_at range index and
+# ranked by matched query terms; {predicate} comes from _window_predicate.
+WINDOW_SEARCH_QUERY = """
+MATCH (a:Entity)-[r:RELATES_TO]->(b:Entity)
+WHERE {predicate}
+WITH a, r, b, size([term IN $terms WHERE toLower(r.fact) CONTAINS term]) AS score
+WHERE score > 0
+RETURN r.uuid AS edge_uuid, r.fact AS fact, r.name AS relation,
+       a.uuid AS source_uuid, b.uuid AS target_uuid
+ORDER BY score DESC, r.valid_at DESC
+LIMIT $limit
+"""
+
+# Graphiti leaves valid_at empty when no date is extracted from the text;
+# those facts take the timestamp of the episode they came from.
+BACKFILL_VALID_AT_QUERY = """
+UNWIND $episode_names AS name
+MATCH (ep:Episodic {name: name})-[:MENTIONS]->(:Entity)-[r:RELATES_TO]->(:Entity)
+WHERE ep.group_id = $group_id AND r.valid_at IS NULL AND ep.uuid IN r.episodes
+SET r.valid_at = ep.valid_at
+RETURN count(DISTINCT r) AS count
+"""
+
+ADD_EPISODE_QUERY = """
+CREATE (e:Episodic {
+    uuid: $uuid, name: $name, group_id: $group_id, source: 'text',
+    source_description: $source_description, content: $content,
+    valid_at: $reference_time, created_at: $created_at, entity_edges: []
+})
+"""
+
+ADD_ENTITIES_QUERY = """
+UNWIND $entities AS entity
+MERGE (n:Entity {name: entity.name, group_id: $group_id})
+ON CREATE SET n.uuid = entity.uuid, n.summary = entity.summary,
+              n.labels = [entity.type], n.created_at = $created_at
+WITH n
+OPTIONAL MATCH (ep:Episodic {uuid: $episode_uuid})
+FOREACH (_ IN CASE WHEN ep IS NULL THEN [] ELSE [1] END |
+    MERGE (ep)-[m:MENTIONS]->(n)
+    ON CREATE SET m.uuid = randomUUID(), m.group_id = $group_id, m.created_at = $created_at
+)
+RETURN n.name AS name, n.uuid AS uuid
+"""
+
+ADD_EDGES_QUERY = """
+UNWIND $edges AS edge
+MATCH (a:Entity {uuid: edge.source_uuid}), (b:Entity {uuid: edge.target_uuid})
+CREATE (a)-[r:RELATES_TO {
+    uuid: edge.uuid, name: edge.relation, fact: edge.fact, group_id: $group_id,
+    episodes: CASE WHEN $episode_uuid IS NULL THEN [] ELSE [$episode_uuid] END,
+    created_at: $created_at, valid_at: edge.valid_at,
+    invalid_at: null, expired_at: null
+}]->(b)
+RETURN count(r) AS count
+"""
+
+
+# Bulk load (see bulk_load.py): one UNWIND statement per row kind and slice.
+BULK_EPISODES_QUERY = """
+UNWIND $rows AS row
+CREATE (e:Episodic {
+    uuid: row.uuid, name: row.name, group_id: $group_id, source: 'text',
+    source_description: row.source_description, content: row.content,
+    valid_at: row.reference_time, created_at: $created_at, entity_edges: []
+})
+"""
+
+BULK_ENTITIES_QUERY = """
+UNWIND $rows AS row
+MERGE (n:Entity {name: row.name, group_id: $group_id})
+ON CREATE SET n.uuid = row.uuid, n.summary = row.summary, n.labels = [row.type],
+              n.name_embedding = row.name_embedding, n.created_at = $created_at
+RETURN n.name AS name, n.uuid AS uuid, n.uuid = row.uuid AS created
+"""
+
+BULK_MENTIONS_QUERY = """
+UNWIND $rows AS row
+MATCH (ep:Episodic {uuid: row.episode_uuid}), (n:Entity {uuid: row.entity_uuid})
+CREATE (ep)-[:MENTIONS {uuid: randomUUID(), group_id: $group_id, created_at: $created_at}]->(n)
+"""
+
+BULK_EDGES_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Entity {uuid: row.source_uuid}), (b:Entity {uuid: row.target_uuid})
+CREATE (a)-[r:RELATES_TO {
+    uuid: row.uuid, name: row.relation, fact: row.fact, group_id: $group_id,
+    episodes: [row.episode_uuid], created_at: $created_at, valid_at: row.valid_at,
+    invalid_at: null, expired_at: null, fact_embedding: row.fact_embedding
+}]->(b)
+RETURN count(r) AS count
+"""
+
+
+# Compaction steps. Each statement handles up to $batch_size duplicate
+# groups (or rows) and is re-run until it reports 0, so every batch is its
+# own transaction. Entity and episode merges use APOC.
+MERGE_ENTITIES_QUERY = """
+MATCH (n:Entity)
+WHERE $group_id IS NULL OR n.group_id = $group_id
+WITH n ORDER BY n.created_at
+WITH n.group_id AS group_id, toLower(trim(n.name)) AS key, collect(n) AS nodes
+WHERE size(nodes) > 1
+WITH nodes LIMIT $batch_size
+CALL apoc.refactor.mergeNodes(nodes, {properties: 'discard', mergeRels: false}) YIELD node
+RETURN count(node) AS groups, coalesce(sum(size(nodes) - 1), 0) AS merged
+"""
+
+MERGE_EDGES_QUERY = """
+MATCH (a:Entity)-[r:RELATES_TO]->(b:Entity)
+WHERE r.expired_at IS NULL AND ($group_id IS NULL OR r.group_id = $group_id)
+WITH a, b, r ORDER BY r.created_at
+WITH a, b, r.name AS relation, toLower(trim(coalesce(r.fact, ''))) AS fact, collect(r) AS rels
+WHERE size(rels) > 1
+WITH rels LIMIT $batch_size
+WITH head(rels) AS keep, tail(rels) AS duplicates
+SET keep.episodes = reduce(
+    acc = coalesce(keep.episodes, []),
+    d IN duplicates | acc + [e IN coalesce(d.episodes, []) WHERE NOT e IN acc]
+)
+FOREACH (d IN duplicates | DELETE d)
+RETURN count(keep) AS groups, coalesce(sum(size(duplicates)), 0) AS merged
+"""
+
+ARCHIVE_EDGES_QUERY = """
+MATCH (a:Entity)-[r:RELATES_TO]->(b:Entity)
+WHERE ($group_id IS NULL OR r.group_id = $group_id)
+  AND ((r.expired_at IS NOT NULL AND r.expired_at <= $cutoff)
+       OR (r.invalid_at IS NOT NULL AND r.invalid_at <= $cutoff))
+WITH a, b, r LIMIT $batch_size
+WITH a, b, r, {
+    uuid: r.uuid, relation: r.name, fact: r.fact, group_id: r.group_id,
+    episodes: r.episodes, created_at: r.created_at, valid_at: r.valid_at,
+    invalid_at: r.invalid_at, expired_at: r.expired_at,
+    source_uuid: a.uuid, source_name: a.name, target_uuid: b.uuid, target_name: b.name
+} AS fact
+DELETE r
+RETURN fact
+"""
+
+MERGE_EPISODES_QUERY = """
+MATCH (e:Episodic)
+WHERE $group_id IS NULL OR e.group_id = $group_id
+WITH e ORDER BY e.created_at
+WITH e.group_id AS group_id, e.content AS content, collect(e) AS episodes
+WHERE size(episodes) > 1
+WITH episodes LIMIT $batch_size
+CALL apoc.refactor.mergeNodes(episodes, {properties: 'discard', mergeRels: true}) YIELD node
+RETURN count(node) AS groups, coalesce(sum(size(episodes) - 1), 0) AS merged
+"""
+
+# Prefix for CLEAR_BATCH_QUERY: entities without any relationship
+ORPHAN_ENTITIES_MATCH = """
+MATCH (n:Entity)
+WHERE ($group_id IS NULL OR n.group_id = $group_id) AND NOT (n)--()
+"""
+
+
+def _window_predicate(window: Dict[str, datetime]) -> str:
+    """Cypher condition on ``r`` for a validity window (see graph_store.time_window)."""
+    conditions = []
+    if "start" in window:
+        conditions.append("r.valid_at >= $window_start")
+    if "end" in window:
+        conditions.append("r.valid_at <= $window_end")
+    if "as_of" in window:
+        conditions.append("(r.invalid_at IS NULL OR r.invalid_at > $window_as_of)")
+    return " AND ".join(conditions)
+
+
+def _window_params(window: Dict[str, datetime]) -> Dict[str, datetime]:
+    return {f"window_{key}": value for key, value in window.items()}
+
+
+def _native(value):
+    """Convert Neo4j temporal values to native datetimes."""
+    if hasattr(value, "to_native"):
+        return value.to_native()
+    return value
+
+
+class Neo4jGraphStore(GraphStore):
+    """Graph store backed by a Neo4j server."""
+
+    backend_name = "neo4j"
+
+    def __init__(self, uri: str, user: str, password: str):
+        """
+        Initialize the Neo4j graph store.
+
+        Args:
+            uri: Neo4j database URI
+            user: Neo4j username
+            password: Neo4j password
+        """
+        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        self._indexes_ready = False
+
+    def ensure_indexes(self) -> None:
+        """Create the indexes the lookups rely on."""
+        if self._indexes_ready:
+            return
+        with self.driver.session() as session:
+            for statement in INDEX_STATEMENTS:
+                session.run(statement)
+        self._indexes_ready = True
+
+    def add_episode(
+        self,
+        name: str,
+        content: str,
+        source_description: str,
+        reference_time: datetime,
+        group_id: str = ""
+    ) -> str:
+        """Store a document chunk as an Episodic node."""
+        episode_uuid = str(uuid_lib.uuid4())
+        with self.driver.session() as session:
+            session.run(
+                ADD_EPISODE_QUERY,
+                uuid=episode_uuid,
+                name=name,
+                group_id=group_id,
+                source_description=source_description,
+                content=content,
+                reference_time=reference_time,
+                created_at=datetime.now(timezone.utc)
+            )
+        return episode_uuid
+
+    def add_entities(
+        self,
+        entities: List[Dict[str, Any]],
+        group_id: str = "",
+        episode_uuid: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Merge Entity nodes by name and link them to their episode."""
+        rows = [
+            {
+                "uuid": str(uuid_lib.uuid4()),
+                "name": entity["name"],
+                "type": entity.get("type", "Entity"),
+                "summary": entity.get("summary", "")
+            }
+            for entity in entities
+        ]
+        with self.driver.session() as session:
+            result = session.run(
+                ADD_ENTITIES_QUERY,
+                entities=rows,
+                group_id=group_id,
+                episode_uuid=episode_uuid,
+                created_at=datetime.now(timezone.utc)
+            )
+            return {record["name"]: record["uuid"] for record in result}
+
+    def add_edges(
+        self,
+        edges: List[Dict[str, Any]],
+        group_id: str = "",
+        episode_uuid: Optional[str] = None
+    ) -> int:
+        """Create RELATES_TO edges between existing entities."""
+        rows = [
+            {
+                "uuid": edge.get("uuid") or str(uuid_lib.uuid4()),
+                "source_uuid": edge["source_uuid"],
+                "target_uuid": edge["target_uuid"],
+                "relation": edge.get("relation", "RELATES_TO"),
+                "fact": edge.get("fact", ""),
+                "valid_at": edge.get("valid_at")
+            }
+            for edge in edges
+        ]
+        with self.driver.session() as session:
+            result = session.run(
+                ADD_EDGES_QUERY,
+                edges=rows,
+                group_id=group_id,
+                episode_uuid=episode_uuid,
+                created_at=datetime.now(timezone.utc)
+            )
+            return result.single()["count"]
+
+    def bulk_write(self, rows: Dict[str, List[Dict[str, Any]]], group_id: str = "") -> Dict[str, int]:
+        """Write a staged slice with four UNWIND statements."""
+        created_at = datetime.now(timezone.utc)
+        with self.driver.session() as session:
+            session.run(BULK_EPISODES_QUERY, rows=rows["episodes"], group_id=group_id, created_at=created_at)
+            result = session.run(BULK_ENTITIES_QUERY, rows=rows["entities"], group_id=group_id, created_at=created_at)
+            uuids = {}
+            created = 0
+            for record in result:
+                uuids[record["name"]] = record["uuid"]
+                created += record["created"]
+
+            mentions = [
+                {"episode_uuid": m["episode_uuid"], "entity_uuid": uuids[m["entity_name"]]}
+                for m in rows["mentions"]
+            ]
+            session.run(BULK_MENTIONS_QUERY, rows=mentions, group_id=group_id, created_at=created_at)
+
+            edges = [
+                {**edge, "source_uuid": uuids[edge["source_name"]], "target_uuid": uuids[edge["target_name"]]}
+                for edge in rows["edges"]
+            ]
+            result = session.run(BULK_EDGES_QUERY, rows=edges, group_id=group_id, created_at=created_at)
+            num_edges = result.single()["count"]
+
+        return {"episodes": len(rows["episodes"]), "entities": created, "edges": num_edges}
+
+    def backfill_valid_at(self, episode_names: List[str], group_id: str = "") -> int:
+        """
+        Give facts without an extracted date the timestamp of their episode.
+
+        Args:
+            episode_names: Names of the episodes just ingested
+            group_id: Partition the episodes belong to
+
+        Returns:
+            Number of facts updated
+        """
+        self.ensure_indexes()
+        with self.driver.session() as session:
+            result = session.run(BACKFILL_VALID_AT_QUERY, episode_names=episode_names, group_id=group_id)
+            return result.single()["count"]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get counts, histograms and degree percentiles in a single round trip (requires APOC)."""
+        with self.driver.session() as session:
+            record = session.run(STATISTICS_QUERY).single()
+
+        labels = {label: count for label, count in record["labels"].items() if count}
+        # relTypesCount also holds pattern keys like "()-[:RELATES_TO]->(:Entity)"
+        relationship_types = {
+            rel_type: count for rel_type, count in record["relTypesCount"].items()
+            if count and "(" not in rel_type
+        }
+        return {
+            "total_nodes": record["nodeCount"],
+            "total_relationships": record["relCount"],
+            "num_entities": labels.get("Entity", 0),
+            "num_episodes": labels.get("Episodic", 0),
+            "labels": labels,
+            "relationship_types": relationship_types,
+            "degree": {
+                "p50": record["p50"] or 0,
+                "p90": record["p90"] or 0,
+                "p99": record["p99"] or 0,
+                "max": record["max_degree"] or 0
+            }
+        }
+
+    def iter_entity_relationships(
+        self,
+        entity_names: List[str],
+        relationship_types: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        fetch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream relationships, fetching ``fetch_size`` records per round trip."""
+        self.ensure_indexes()
+
+        query = ENTITY_RELATIONSHIPS_QUERY + "\nSKIP $skip"
+        if limit is not None:
+            query += " LIMIT $limit"
+
+        with self.driver.session(fetch_size=fetch_size) as session:
+            result = session.run(
+                query,
+                entity_names=list(entity_names),
+                relationship_types=relationship_types,
+                skip=skip,
+                limit=limit
+            )
+            for record in result:
+                yield record.data()
+
+    def iter_edges(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream entity-to-entity edges created at or after ``since``."""
+        with self.driver.session() as session:
+            result = session.run(EDGES_SINCE_QUERY, since=to_utc(since) if since else None)
+            for record in result:
+                edge = record.data()
+                edge["created_at"] = _native(edge["created_at"])
+                yield edge
+
+    def iter_entities(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream entities created at or after ``since``."""
+        with self.driver.session() as session:
+            result = session.run(ENTITIES_SINCE_QUERY, since=to_utc(since) if since else None)
+            for record in result:
+                entity = record.data()
+                entity["created_at"] = _native(entity["created_at"])
+                yield entity
+
+    def search_facts(
+        self,
+        query: str,
+        limit: int = 10,
+        window: Optional[Dict[str, datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search facts through Graphiti's fulltext index, or the valid_at index for a window."""
+        if window is None:
+            with self.driver.session() as session:
+                result = session.run(SEARCH_FACTS_QUERY, query=query, limit=limit)
+                return [record.data() for record in result]
+
+        terms = [term for term in re.findall(r"\w+", query.lower()) if len(term) > 2]
+        if not terms:
+            return []
+        self.ensure_indexes()
+        with self.driver.session() as session:
+            result = session.run(
+                WINDOW_SEARCH_QUERY.format(predicate=_window_predicate(window)),
+                terms=terms,
+                limit=limit,
+                **_window_params(window)
+            )
+            return [record.data() for record in result]
+
+    def expand_hop(
+        self,
+        uuids: List[str],
+        seen_edges: List[str],
+        fan_out: int,
+        window: Optional[Dict[str, datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """Expand a frontier by one hop with a single batched query."""
+        query = EXPAND_HOP_QUERY
+        params = {}
+        if window is not None:
+            # Validity is judged by the window instead of by expiry
+            query = query.replace("r.expired_at IS NULL", _window_predicate(window))
+            params = _window_params(window)
+        with self.driver.session() as session:
+            result = session.run(
+                query,
+                uuids=uuids,
+                seen_edges=seen_edges,
+                fan_out=fan_out,
+                **params
+            )
+            records = [record.data() for record in result]
+        for record in records:
+            record["edge"]["timestamp"] = _native(record["edge"]["timestamp"])
+        return records
+
+    def entity_names(self, uuids: List[str]) -> List[str]:
+        """Resolve entity uuids to names in a single round trip."""
+        if not uuids:
+            return []
+        with self.driver.session() as session:
+            result = session.run(ENTITY_NAMES_QUERY, uuids=uuids)
+            return [record["name"] for record in result]
+
+    def clear(self, group_id: Optional[str] = None, batch_size: int = 10000) -> Dict[str, Any]:
+        """
+        Delete nodes in sub-transactions so the heap never holds the whole graph.
+
+        Each round trip deletes up to ``CLEAR_ROUND_BATCHES`` batches, which
+        gives regular progress reports without one statement per batch.
+        """
+        if group_id is None:
+            matches = ["MATCH (n)"]
+        else:
+            matches = [f"MATCH (n:{label}) WHERE n.group_id = $group_id" for label in SCOPED_LABELS]
+
+        start_time = time.time()
+        deleted = 0
+        with self.driver.session() as session:
+            total = sum(
+                session.run(match + " RETURN count(n) AS count", group_id=group_id).single()["count"]
+                for match in matches
+            )
+            for match in matches:
+                while True:
+                    result = session.run(
+                        match + CLEAR_BATCH_QUERY,
+                        group_id=group_id,
+                        round_size=batch_size * CLEAR_ROUND_BATCHES,
+                        batch_size=batch_size
+                    )
+                    count = result.single()["deleted"]
+                    if count == 0:
+                        break
+                    deleted += count
+                    self._report_clear_progress(deleted, total, start_time)
+
+        return self._clear_summary(deleted, start_time, group_id)
+
+    def compact(
+        self,
+        group_id: Optional[str] = None,
+        batch_size: int = 1000,
+        archive_path: Optional[str] = None,
+        expired_before: Optional[datetime] = None,
+        expire_superseded: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Compact the graph with batched auto-commit statements (requires APOC).
+
+        ``expire_superseded`` is ignored: Graphiti already invalidates
+        contradicted facts during ingestion.
+        """
+        start_time = time.time()
+        before = self.get_statistics()
+        counts = {}
+        params = {"group_id": group_id, "batch_size": batch_size}
+
+        with self.driver.session() as session:
+            def merge_batches(query):
+                merged = 0
+                while True:
+                    record = session.run(query, **params).single()
+                    if record["groups"] == 0:
+                        return merged
+                    merged += record["merged"]
+
+            counts["merged_entities"] = merge_batches(MERGE_ENTITIES_QUERY)
+
+            archived = 0
+            cutoff = to_utc(expired_before) if expired_before else datetime.now(timezone.utc)
+            while True:
+                result = session.run(ARCHIVE_EDGES_QUERY, cutoff=cutoff, **params)
+                facts = [
+                    {key: _native(value) for key, value in record["fact"].items()}
+                    for record in result
+                ]
+                if not facts:
+                    break
+                self._archive_facts(facts, archive_path)
+                archived += len(facts)
+            counts["archived_edges"] = archived
+
+            # After entity merges and archiving, so parallel duplicates are caught
+            # and a live fact is never dropped in favour of a superseded one
+            counts["merged_edges"] = merge_batches(MERGE_EDGES_QUERY)
+
+            counts["merged_episodes"] = merge_batches(MERGE_EPISODES_QUERY)
+
+            deleted = 0
+            while True:
+                result = session.run(
+                    ORPHAN_ENTITIES_MATCH + CLEAR_BATCH_QUERY,
+                    group_id=group_id,
+                    round_size=batch_size * CLEAR_ROUND_BATCHES,
+                    batch_size=batch_size
+                )
+                count = result.single()["deleted"]
+                if count == 0:
+                    break
+                deleted += count
+            counts["deleted_orphans"] = deleted
+
+        return self._compaction_summary(before, counts, start_time)
+
+    def close(self) -> None:
+        """Close the Neo4j driver connection."""
+        self.driver.close()
@@ -1,13 +1,17 @@
 """Query interface for Knowledge Graph RAG."""
 
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
 from .kg_pipeline import KnowledgeGraphRAG
 
 
 async def query_kg(
     kg_system: KnowledgeGraphRAG,
     question: str,
-    verbose: bool = True
+    verbose: bool = True,
+    mode: str = "search",
+    as_of: Optional[datetime] = None,
+    between: Optional[Tuple[datetime, datetime]] = None
 ) -> Dict[str, Any]:
     """
     Query the Knowledge Graph RAG system and return formatted results.
@@ -16,11 +20,15 @@ async def query_kg(
         kg_system: Initialized KnowledgeGraphRAG instance
         question: User's question
         verbose: Whether to print detailed information
+        mode: Retrieval mode, "search", "expand" (multi-hop expansion),
+            "global" (community summaries) or "link" (local entity linking)
+        as_of: Only use facts valid at this time
+        between: (start, end) pair; only use facts that became valid in this range
 
     Returns:
         Dictionary with answer and metrics
     """
-    result = await kg_system.query(question)
+    result = await kg_system.query(question, mode=mode, as_of=as_of, between=between)
 
     if verbose:
         print("\n" + "=" * 80)
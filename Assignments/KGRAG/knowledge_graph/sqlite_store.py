@@ -0,0 +1,705 @@
+"""Embedded graph store: SQLite tables plus in-memory adjacency (no Neo4j required)."""
+
+import math
+import re
+import sqlite3
+import threading
+import time
+import uuid as uuid_lib
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterator
+
+from .graph_store import GraphStore, to_utc
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    uuid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    group_id TEXT NOT NULL DEFAULT '',
+    source_description TEXT,
+    content TEXT,
+    valid_at TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entities (
+    uuid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    group_id TEXT NOT NULL DEFAULT '',
+    entity_type TEXT,
+    summary TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE (group_id, name)
+);
+CREATE TABLE IF NOT EXISTS edges (
+    uuid TEXT PRIMARY KEY,
+    source_uuid TEXT NOT NULL,
+    target_uuid TEXT NOT NULL,
+    name TEXT,
+    fact TEXT,
+    group_id TEXT NOT NULL DEFAULT '',
+    episode_uuid TEXT,
+    created_at TEXT NOT NULL,
+    valid_at TEXT,
+    invalid_at TEXT,
+    expired_at TEXT
+);
+CREATE TABLE IF NOT EXISTS mentions (
+    episode_uuid TEXT NOT NULL,
+    entity_uuid TEXT NOT NULL,
+    PRIMARY KEY (episode_uuid, entity_uuid)
+);
+CREATE INDEX IF NOT EXISTS entities_name_idx ON entities (name);
+CREATE INDEX IF NOT EXISTS edges_source_idx ON edges (source_uuid);
+CREATE INDEX IF NOT EXISTS edges_target_idx ON edges (target_uuid);
+CREATE INDEX IF NOT EXISTS edges_created_idx ON edges (created_at);
+CREATE INDEX IF NOT EXISTS edges_valid_idx ON edges (valid_at);
+CREATE INDEX IF NOT EXISTS edges_invalid_idx ON edges (invalid_at);
+CREATE INDEX IF NOT EXISTS episodes_valid_idx ON episodes (valid_at);
+CREATE INDEX IF NOT EXISTS mentions_entity_idx ON mentions (entity_uuid);
+CREATE VIRTUAL TABLE IF NOT EXISTS edges_fts USING fts5 (uuid UNINDEXED, name, fact);
+"""
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _window_sql(window: Dict[str, datetime]) -> tuple:
+    """SQL condition on ``r`` and its parameters for a validity window (see graph_store.time_window)."""
+    conditions = []
+    if "start" in window:
+        conditions.append("r.valid_at >= :window_start")
+    if "end" in window:
+        conditions.append("r.valid_at <= :window_end")
+    if "as_of" in window:
+        conditions.append("(r.invalid_at IS NULL OR r.invalid_at > :window_as_of)")
+    return " AND ".join(conditions), {f"window_{key}": _iso(value) for key, value in window.items()}
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class SQLiteGraphStore(GraphStore):
+    """
+    Graph store embedded in the process.
+
+    Everything is persisted to SQLite; entity adjacency is also kept in
+    memory so traversals never touch disk. Use ``":memory:"`` as the path
+    for throwaway graphs (CI, tests, demos).
+    """
+
+    backend_name = "sqlite"
+
+    def __init__(self, path: str = "knowledge_graph.db"):
+        """
+        Initialize the SQLite graph store.
+
+        Args:
+            path: Database file path, or ":memory:"
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._load_adjacency()
+
+    def _load_adjacency(self) -> None:
+        """Build the in-memory adjacency from the edges table."""
+        self._names: Dict[str, str] = {}
+        self._adjacency: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for row in self.conn.execute("SELECT uuid, name FROM entities"):
+                self._names[row["uuid"]] = row["name"]
+            rows = self.conn.execute(
+                "SELECT uuid, source_uuid, target_uuid, name, fact, created_at, valid_at "
+                "FROM edges WHERE expired_at IS NULL"
+            ).fetchall()
+        for row in rows:
+            self._index_edge(dict(row))
+
+    def _index_edge(self, edge: Dict[str, Any], adjacency: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> None:
+        adjacency = self._adjacency if adjacency is None else adjacency
+        adjacency.setdefault(edge["source_uuid"], []).append(edge)
+        if edge["target_uuid"] != edge["source_uuid"]:
+            adjacency.setdefault(edge["target_uuid"], []).append(edge)
+
+    def ensure_indexes(self) -> None:
+        """Indexes are part of the schema; nothing to do."""
+
+    def add_episode(
+        self,
+        name: str,
+        content: str,
+        source_description: str,
+        reference_time: datetime,
+        group_id: str = ""
+    ) -> str:
+        """Store a document chunk as an episode row."""
+        episode_uuid = str(uuid_lib.uuid4())
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO episodes (uuid, name, group_id, source_description, content, valid_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (episode_uuid, name, group_id, source_description, content,
+                 _iso(reference_time), _iso(datetime.now()))
+            )
+        return episode_uuid
+
+    def add_entities(
+        self,
+        entities: List[Dict[str, Any]],
+        group_id: str = "",
+        episode_uuid: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Insert entities by name and group, reusing existing ones."""
+        created_at = _iso(datetime.now())
+        uuids = {}
+        with self._lock, self.conn:
+            for entity in entities:
+                name = entity["name"]
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO entities (uuid, name, group_id, entity_type, summary, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (str(uuid_lib.uuid4()), name, group_id, entity.get("type", "Entity"),
+                     entity.get("summary", ""), created_at)
+                )
+                row = self.conn.execute(
+                    "SELECT uuid FROM entities WHERE group_id = ? AND name = ?", (group_id, name)
+                ).fetchone()
+                uuids[name] = row["uuid"]
+                self._names[row["uuid"]] = name
+                if episode_uuid:
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO mentions (episode_uuid, entity_uuid) VALUES (?, ?)",
+                        (episode_uuid, row["uuid"])
+                    )
+        return uuids
+
+    def add_edges(
+        self,
+        edges: List[Dict[str, Any]],
+        group_id: str = "",
+        episode_uuid: Optional[str] = None
+    ) -> int:
+        """Insert RELATES_TO edges between known entities."""
+        created_at = _iso(datetime.now())
+        stored = []
+        with self._lock, self.conn:
+            for edge in edges:
+                if edge["source_uuid"] not in self._names or edge["target_uuid"] not in self._names:
+                    continue
+                row = {
+                    "uuid": edge.get("uuid") or str(uuid_lib.uuid4()),
+                    "source_uuid": edge["source_uuid"],
+                    "target_uuid": edge["target_uuid"],
+                    "name": edge.get("relation", "RELATES_TO"),
+                    "fact": edge.get("fact", ""),
+                    "created_at": created_at,
+                    "valid_at": _iso(edge.get("valid_at")),
+                }
+                self.conn.execute(
+                    "INSERT INTO edges (uuid, source_uuid, target_uuid, name, fact, group_id, "
+                    "episode_uuid, created_at, valid_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (row["uuid"], row["source_uuid"], row["target_uuid"], row["name"], row["fact"],
+                     group_id, episode_uuid, row["created_at"], row["valid_at"])
+                )
+                self.conn.execute(
+                    "INSERT INTO edges_fts (uuid, name, fact) VALUES (?, ?, ?)",
+                    (row["uuid"], row["name"], row["fact"])
+                )
+                stored.append(row)
+        for row in stored:
+            self._index_edge(row)
+        return len(stored)
+
+    def bulk_write(self, rows: Dict[str, List[Dict[str, Any]]], group_id: str = "") -> Dict[str, int]:
+        """Write a staged slice with executemany, in one transaction."""
+        created_at = _iso(datetime.now())
+        names = [entity["name"] for entity in rows["entities"]]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO episodes (uuid, name, group_id, source_description, content, valid_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(e["uuid"], e["name"], group_id, e["source_description"], e["content"],
+                  _iso(e["reference_time"]), created_at) for e in rows["episodes"]]
+            )
+            created = self.conn.executemany(
+                "INSERT OR IGNORE INTO entities (uuid, name, group_id, entity_type, summary, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(e["uuid"], e["name"], group_id, e["type"], e["summary"], created_at) for e in rows["entities"]]
+            ).rowcount
+            uuids = {}
+            for batch_start in range(0, len(names), 500):
+                batch = names[batch_start:batch_start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                for row in self.conn.execute(
+                    f"SELECT name, uuid FROM entities WHERE group_id = ? AND name IN ({placeholders})",
+                    (group_id, *batch)
+                ):
+                    uuids[row["name"]] = row["uuid"]
+
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO mentions (episode_uuid, entity_uuid) VALUES (?, ?)",
+                [(m["episode_uuid"], uuids[m["entity_name"]]) for m in rows["mentions"]]
+            )
+            edges = [
+                {
+                    "uuid": edge["uuid"],
+                    "source_uuid": uuids[edge["source_name"]],
+                    "target_uuid": uuids[edge["target_name"]],
+                    "name": edge["relation"],
+                    "fact": edge["fact"],
+                    "created_at": created_at,
+                    "valid_at": _iso(edge["valid_at"])
+                }
+                for edge in rows["edges"]
+            ]
+            self.conn.executemany(
+                "INSERT INTO edges (uuid, source_uuid, target_uuid, name, fact, group_id, episode_uuid, "
+                "created_at, valid_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(e["uuid"], e["source_uuid"], e["target_uuid"], e["name"], e["fact"], group_id,
+                  staged["episode_uuid"], e["created_at"], e["valid_at"]) for e, staged in zip(edges, rows["edges"])]
+            )
+            self.conn.executemany(
+                "INSERT INTO edges_fts (uuid, name, fact) VALUES (?, ?, ?)",
+                [(e["uuid"], e["name"], e["fact"]) for e in edges]
+            )
+
+        for name, entity_uuid in uuids.items():
+            self._names[entity_uuid] = name
+        for edge in edges:
+            self._index_edge(edge)
+        return {"episodes": len(rows["episodes"]), "entities": created, "edges": len(edges)}
+
+    def _scalar(self, sql: str, params=()) -> Any:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()[0]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get counts, histograms and entity degree percentiles."""
+        with self._lock:
+            num_entities, num_episodes, num_edges, num_mentions = self.conn.execute(
+                "SELECT (SELECT count(*) FROM entities), (SELECT count(*) FROM episodes), "
+                "(SELECT count(*) FROM edges), (SELECT count(*) FROM mentions)"
+            ).fetchone()
+            # Degree as Neo4j counts it: RELATES_TO in both directions plus MENTIONS
+            degrees = [row[0] for row in self.conn.execute("""
+                SELECT (SELECT count(*) FROM edges WHERE source_uuid = e.uuid)
+                     + (SELECT count(*) FROM edges WHERE target_uuid = e.uuid AND source_uuid != e.uuid)
+                     + (SELECT count(*) FROM mentions WHERE entity_uuid = e.uuid) AS degree
+                FROM entities e ORDER BY degree
+            """)]
+
+        def percentile(fraction: float) -> int:
+            # Nearest rank, like Cypher's percentileDisc
+            if not degrees:
+                return 0
+            return degrees[max(0, math.ceil(len(degrees) * fraction) - 1)]
+
+        return {
+            "total_nodes": num_entities + num_episodes,
+            "total_relationships": num_edges + num_mentions,
+            "num_entities": num_entities,
+            "num_episodes": num_episodes,
+            "labels": {"Entity": num_entities, "Episodic": num_episodes},
+            "relationship_types": {"RELATES_TO": num_edges, "MENTIONS": num_mentions},
+            "degree": {
+                "p50": percentile(0.5),
+                "p90": percentile(0.9),
+                "p99": percentile(0.99),
+                "max": degrees[-1] if degrees else 0
+            }
+        }
+
+    def iter_entity_relationships(
+        self,
+        entity_names: List[str],
+        relationship_types: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        fetch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream relationships, reading ``fetch_size`` rows at a time."""
+        sql = """
+        SELECT e.name AS entity, e.name AS source, 'RELATES_TO' AS relationship, t.name AS target
+        FROM entities e JOIN edges r ON r.source_uuid = e.uuid JOIN entities t ON t.uuid = r.target_uuid
+        WHERE e.name = :name
+        UNION ALL
+        SELECT e.name, s.name, 'RELATES_TO', e.name
+        FROM entities e JOIN edges r ON r.target_uuid = e.uuid JOIN entities s ON s.uuid = r.source_uuid
+        WHERE e.name = :name AND r.source_uuid != r.target_uuid
+        UNION ALL
+        SELECT e.name, ep.name, 'MENTIONS', e.name
+        FROM entities e JOIN mentions m ON m.entity_uuid = e.uuid JOIN episodes ep ON ep.uuid = m.episode_uuid
+        WHERE e.name = :name
+        ORDER BY relationship, source, target
+        """
+        emitted = 0
+        skipped = 0
+        # Same order as the Neo4j store, so pages match across backends
+        for name in sorted(entity_names):
+            with self._lock:
+                cursor = self.conn.execute(sql, {"name": name})
+                rows = cursor.fetchmany(fetch_size)
+            while rows:
+                for row in rows:
+                    if relationship_types is not None and row["relationship"] not in relationship_types:
+                        continue
+                    if skipped < skip:
+                        skipped += 1
+                        continue
+                    if limit is not None and emitted >= limit:
+                        return
+                    emitted += 1
+                    yield dict(row)
+                with self._lock:
+                    rows = cursor.fetchmany(fetch_size)
+
+    def iter_edges(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream entity-to-entity edges created at or after ``since``."""
+        sql = """
+        SELECT s.uuid AS source_uuid, s.name AS source_name,
+               t.uuid AS target_uuid, t.name AS target_name,
+               r.uuid AS uuid, r.name AS relation, r.fact AS fact, r.created_at AS created_at
+        FROM edges r JOIN entities s ON s.uuid = r.source_uuid JOIN entities t ON t.uuid = r.target_uuid
+        WHERE ? IS NULL OR r.created_at >= ?
+        ORDER BY r.created_at
+        """
+        with self._lock:
+            rows = self.conn.execute(sql, (_iso(since), _iso(since))).fetchall()
+        for row in rows:
+            edge = dict(row)
+            edge["created_at"] = _parse(edge["created_at"])
+            yield edge
+
+    def iter_entities(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream entities created at or after ``since``."""
+        sql = """
+        SELECT uuid, name, summary, created_at FROM entities
+        WHERE ? IS NULL OR created_at >= ?
+        ORDER BY created_at
+        """
+        with self._lock:
+            rows = self.conn.execute(sql, (_iso(since), _iso(since))).fetchall()
+        for row in rows:
+            entity = dict(row)
+            entity["created_at"] = _parse(entity["created_at"])
+            yield entity
+
+    def search_facts(
+        self,
+        query: str,
+        limit: int = 10,
+        window: Optional[Dict[str, datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """BM25 keyword search over edge facts, or term matching over the valid_at index for a window."""
+        terms = re.findall(r"\w+", query.lower())
+        if window is not None:
+            return self._search_window(terms, limit, window)
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        sql = """
+        SELECT r.uuid AS edge_uuid, r.fact AS fact, r.name AS relation,
+               r.source_uuid AS source_uuid, r.target_uuid AS target_uuid
+        FROM edges_fts JOIN edges r ON r.uuid = edges_fts.uuid
+        WHERE edges_fts MATCH ? AND r.expired_at IS NULL
+        ORDER BY bm25(edges_fts)
+        LIMIT ?
+        """
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, (match, limit))]
+
+    def _search_window(self, terms: List[str], limit: int, window: Dict[str, datetime]) -> List[Dict[str, Any]]:
+        """Rank the facts in a validity window by matched terms (same as the Neo4j store)."""
+        terms = [term for term in terms if len(term) > 2]
+        if not terms:
+            return []
+        validity, params = _window_sql(window)
+        score = " + ".join(f"(instr(lower(r.fact), :t{i}) > 0)" for i in range(len(terms)))
+        params.update({f"t{i}": term for i, term in enumerate(terms)}, limit=limit)
+        sql = f"""
+        SELECT edge_uuid, fact, relation, source_uuid, target_uuid FROM (
+            SELECT r.uuid AS edge_uuid, r.fact AS fact, r.name AS relation,
+                   r.source_uuid AS source_uuid, r.target_uuid AS target_uuid,
+                   r.valid_at AS valid_at, {score} AS score
+            FROM edges r INDEXED BY edges_valid_idx
+            WHERE {validity}
+        )
+        WHERE score > 0
+        ORDER BY score DESC, valid_at DESC
+        LIMIT :limit
+        """
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def expand_hop(
+        self,
+        uuids: List[str],
+        seen_edges: List[str],
+        fan_out: int,
+        window: Optional[Dict[str, datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """Expand a frontier by one hop using the in-memory adjacency (or the valid_at index for a window)."""
+        adjacency = self._adjacency if window is None else self._window_adjacency(uuids, window)
+        seen = set(seen_edges)
+        records = []
+        for node_uuid in uuids:
+            edges = [e for e in adjacency.get(node_uuid, []) if e["uuid"] not in seen]
+            edges.sort(key=lambda e: e["valid_at"] or e["created_at"], reverse=True)
+            for edge in edges[:fan_out]:
+                neighbor = edge["target_uuid"] if edge["source_uuid"] == node_uuid else edge["source_uuid"]
+                records.append({
+                    "from_uuid": node_uuid,
+                    "edge": {
+                        "edge_uuid": edge["uuid"],
+                        "fact": edge["fact"],
+                        "relation": edge["name"],
+                        "source": self._names.get(edge["source_uuid"]),
+                        "target": self._names.get(edge["target_uuid"]),
+                        "neighbor_uuid": neighbor,
+                        "timestamp": _parse(edge["valid_at"] or edge["created_at"])
+                    }
+                })
+        return records
+
+    def _window_adjacency(self, uuids: List[str], window: Dict[str, datetime]) -> Dict[str, List[Dict[str, Any]]]:
+        """Adjacency of the frontier restricted to edges valid in the window."""
+        validity, params = _window_sql(window)
+        rows = {}
+        for batch_start in range(0, len(uuids), 500):
+            batch = uuids[batch_start:batch_start + 500]
+            placeholders = ", ".join(f":u{i}" for i in range(len(batch)))
+            batch_params = {**params, **{f"u{i}": node_uuid for i, node_uuid in enumerate(batch)}}
+            sql = f"""
+            SELECT uuid, source_uuid, target_uuid, name, fact, created_at, valid_at
+            FROM edges r WHERE r.source_uuid IN ({placeholders}) AND {validity}
+            UNION
+            SELECT uuid, source_uuid, target_uuid, name, fact, created_at, valid_at
+            FROM edges r WHERE r.target_uuid IN ({placeholders}) AND {validity}
+            """
+            with self._lock:
+                for row in self.conn.execute(sql, batch_params):
+                    rows[row["uuid"]] = dict(row)
+
+        adjacency: Dict[str, List[Dict[str, Any]]] = {}
+        for edge in rows.values():
+            self._index_edge(edge, adjacency)
+        return adjacency
+
+    def entity_names(self, uuids: List[str]) -> List[str]:
+        """Resolve entity uuids to names."""
+        return [self._names[u] for u in uuids if u in self._names]
+
+    def clear(self, group_id: Optional[str] = None, batch_size: int = 10000) -> Dict[str, Any]:
+        """Delete rows in batches, committing after each one."""
+        scope = "" if group_id is None else "WHERE group_id = :group_id"
+        params = {"group_id": group_id, "batch_size": batch_size}
+        start_time = time.time()
+
+        total = sum(
+            self._scalar(f"SELECT count(*) FROM {table} {scope}", params)
+            for table in ("episodes", "entities")
+        )
+
+        # Edges first, together with their fulltext rows
+        batch = f"SELECT uuid FROM edges {scope} ORDER BY uuid LIMIT :batch_size"
+        while self._scalar(f"SELECT count(*) FROM ({batch})", params):
+            with self._lock, self.conn:
+                self.conn.execute(f"DELETE FROM edges_fts WHERE uuid IN ({batch})", params)
+                self.conn.execute(f"DELETE FROM edges WHERE uuid IN ({batch})", params)
+
+        deleted = 0
+        for table, mention_key in (("episodes", "episode_uuid"), ("entities", "entity_uuid")):
+            batch = f"SELECT uuid FROM {table} {scope} ORDER BY uuid LIMIT :batch_size"
+            while True:
+                with self._lock, self.conn:
+                    self.conn.execute(f"DELETE FROM mentions WHERE {mention_key} IN ({batch})", params)
+                    count = self.conn.execute(f"DELETE FROM {table} WHERE uuid IN ({batch})", params).rowcount
+                if count == 0:
+                    break
+                deleted += count
+                self._report_clear_progress(deleted, total, start_time)
+
+        self._load_adjacency()
+        return self._clear_summary(deleted, start_time, group_id)
+
+    def compact(
+        self,
+        group_id: Optional[str] = None,
+        batch_size: int = 1000,
+        archive_path: Optional[str] = None,
+        expired_before: Optional[datetime] = None,
+        expire_superseded: bool = False
+    ) -> Dict[str, Any]:
+        """Compact the graph, committing after every batch."""
+        start_time = time.time()
+        before = self.get_statistics()
+        counts = {}
+        params = {"group_id": group_id, "batch_size": batch_size}
+        scope = "(:group_id IS NULL OR group_id = :group_id)"
+
+        # Entities whose names differ only in case; the oldest is kept
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT uuid, name, group_id FROM entities WHERE {scope} ORDER BY created_at, rowid", params
+            ).fetchall()
+        groups: Dict[tuple, List[str]] = {}
+        for row in rows:
+            key = (row["group_id"], row["name"].strip().lower())
+            groups.setdefault(key, []).append(row["uuid"])
+        pairs = [(uuids[0], dup) for uuids in groups.values() for dup in uuids[1:]]
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            with self._lock, self.conn:
+                self.conn.executemany("UPDATE edges SET source_uuid = ? WHERE source_uuid = ?", batch)
+                self.conn.executemany("UPDATE edges SET target_uuid = ? WHERE target_uuid = ?", batch)
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO mentions (episode_uuid, entity_uuid) "
+                    "SELECT episode_uuid, ? FROM mentions WHERE entity_uuid = ?", batch
+                )
+                self.conn.executemany("DELETE FROM mentions WHERE entity_uuid = ?", [(dup,) for _, dup in batch])
+                self.conn.executemany("DELETE FROM entities WHERE uuid = ?", [(dup,) for _, dup in batch])
+        counts["merged_entities"] = len(pairs)
+
+        # This backend has no contradiction detection. On request, a fact
+        # counts as superseded once the same relation between the same
+        # entities is stated differently by a later document (later valid_at)
+        now = datetime.now(timezone.utc)
+        superseded = f"""
+        UPDATE edges SET
+            invalid_at = (
+                SELECT min(n.valid_at) FROM edges n
+                WHERE n.expired_at IS NULL AND n.group_id = edges.group_id
+                  AND n.source_uuid = edges.source_uuid AND n.target_uuid = edges.target_uuid
+                  AND n.name = edges.name AND n.valid_at > edges.valid_at
+                  AND lower(trim(coalesce(n.fact, ''))) != lower(trim(coalesce(edges.fact, '')))
+            ),
+            expired_at = :now
+        WHERE uuid IN (
+            SELECT r.uuid FROM edges r
+            WHERE r.expired_at IS NULL AND (:group_id IS NULL OR r.group_id = :group_id)
+              AND EXISTS (
+                SELECT 1 FROM edges n
+                WHERE n.expired_at IS NULL AND n.group_id = r.group_id
+                  AND n.source_uuid = r.source_uuid AND n.target_uuid = r.target_uuid
+                  AND n.name = r.name AND n.valid_at > r.valid_at
+                  AND lower(trim(coalesce(n.fact, ''))) != lower(trim(coalesce(r.fact, '')))
+              )
+            LIMIT :batch_size
+        )
+        """
+        if expire_superseded:
+            expired = 0
+            while True:
+                with self._lock, self.conn:
+                    count = self.conn.execute(superseded, {**params, "now": _iso(now)}).rowcount
+                if count == 0:
+                    break
+                expired += count
+            counts["superseded_edges"] = expired
+
+        cutoff = _iso(to_utc(expired_before) if expired_before else now)
+        expired = f"""
+        SELECT r.uuid AS uuid, r.name AS relation, r.fact AS fact, r.group_id AS group_id,
+               r.episode_uuid AS episode_uuid, r.created_at AS created_at, r.valid_at AS valid_at,
+               r.invalid_at AS invalid_at, r.expired_at AS expired_at,
+               r.source_uuid AS source_uuid, s.name AS source_name,
+               r.target_uuid AS target_uuid, t.name AS target_name
+        FROM edges r JOIN entities s ON s.uuid = r.source_uuid JOIN entities t ON t.uuid = r.target_uuid
+        WHERE (:group_id IS NULL OR r.group_id = :group_id)
+          AND (r.expired_at <= :cutoff OR r.invalid_at <= :cutoff)
+        LIMIT :batch_size
+        """
+        archived = 0
+        while True:
+            with self._lock:
+                facts = [dict(row) for row in self.conn.execute(expired, {**params, "cutoff": cutoff})]
+            if not facts:
+                break
+            self._archive_facts(facts, archive_path)
+            with self._lock, self.conn:
+                self.conn.executemany("DELETE FROM edges_fts WHERE uuid = ?", [(f["uuid"],) for f in facts])
+                self.conn.executemany("DELETE FROM edges WHERE uuid = ?", [(f["uuid"],) for f in facts])
+            archived += len(facts)
+        counts["archived_edges"] = archived
+
+        # Edges with the same endpoints, relation and fact; the oldest is kept.
+        # Superseded facts are archived first so a live duplicate is never dropped for them
+        duplicates = f"""
+        SELECT uuid FROM edges
+        WHERE expired_at IS NULL AND {scope} AND rowid NOT IN (
+            SELECT min(rowid) FROM edges WHERE expired_at IS NULL AND {scope}
+            GROUP BY source_uuid, target_uuid, name, lower(trim(coalesce(fact, '')))
+        )
+        LIMIT :batch_size
+        """
+        counts["merged_edges"] = self._delete_edge_batches(duplicates, params)
+
+        # Episodes re-ingested with identical content; the oldest is kept
+        duplicates = f"""
+        SELECT k.uuid AS keep, e.uuid AS dup
+        FROM (
+            SELECT group_id, content, min(rowid) AS keep_rowid FROM episodes
+            WHERE {scope} GROUP BY group_id, content HAVING count(*) > 1
+        ) g
+        JOIN episodes e ON e.group_id = g.group_id AND e.content = g.content AND e.rowid != g.keep_rowid
+        JOIN episodes k ON k.rowid = g.keep_rowid
+        LIMIT :batch_size
+        """
+        merged = 0
+        while True:
+            with self._lock, self.conn:
+                batch = [(row["keep"], row["dup"]) for row in self.conn.execute(duplicates, params)]
+                if not batch:
+                    break
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO mentions (episode_uuid, entity_uuid) "
+                    "SELECT ?, entity_uuid FROM mentions WHERE episode_uuid = ?", batch
+                )
+                self.conn.executemany("UPDATE edges SET episode_uuid = ? WHERE episode_uuid = ?", batch)
+                self.conn.executemany("DELETE FROM mentions WHERE episode_uuid = ?", [(dup,) for _, dup in batch])
+                self.conn.executemany("DELETE FROM episodes WHERE uuid = ?", [(dup,) for _, dup in batch])
+            merged += len(batch)
+        counts["merged_episodes"] = merged
+
+        orphans = f"""
+        SELECT uuid FROM entities n
+        WHERE {scope}
+          AND NOT EXISTS (SELECT 1 FROM edges WHERE source_uuid = n.uuid)
+          AND NOT EXISTS (SELECT 1 FROM edges WHERE target_uuid = n.uuid)
+          AND NOT EXISTS (SELECT 1 FROM mentions WHERE entity_uuid = n.uuid)
+        LIMIT :batch_size
+        """
+        deleted = 0
+        while True:
+            with self._lock, self.conn:
+                count = self.conn.execute(f"DELETE FROM entities WHERE uuid IN ({orphans})", params).rowcount
+            if count == 0:
+                break
+            deleted += count
+        counts["deleted_orphans"] = deleted
+
+        self._load_adjacency()
+        return self._compaction_summary(before, counts, start_time)
+
+    def _delete_edge_batches(self, batch: str, params: Dict[str, Any]) -> int:
+        """Delete the edges selected by ``batch`` (and their fulltext rows) until none are left."""
+        deleted = 0
+        while True:
+            with self._lock, self.conn:
+                uuids = [(row["uuid"],) for row in self.conn.execute(batch, params)]
+                if not uuids:
+                    return deleted
+                self.conn.executemany("DELETE FROM edges_fts WHERE uuid = ?", uuids)
+                self.conn.executemany("DELETE FROM edges WHERE uuid = ?", uuids)
+            deleted += len(uuids)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self.conn.close()
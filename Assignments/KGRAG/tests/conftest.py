@@ -0,0 +1,67 @@
+"""Shared fixtures for the test suite."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from knowledge_graph.sqlite_store import SQLiteGraphStore
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+T1 = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def write_chunk(store, name, group_id, entities, relations, reference_time=T0):
+    """
+    Write one chunk with its entities and relations through the GraphStore API.
+
+    Args:
+        store: GraphStore to write to
+        name: Episode name
+        group_id: Partition for the chunk
+        entities: Entity names mentioned by the chunk
+        relations: (source, relation, target, fact) tuples
+        reference_time: Episode time and valid_at of the facts
+
+    Returns:
+        Mapping of entity name to uuid
+    """
+    episode_uuid = store.add_episode(name, f"Content of {name}", "test chunk", reference_time, group_id)
+    uuids = store.add_entities([{"name": entity} for entity in entities], group_id, episode_uuid)
+    store.add_edges(
+        [
+            {"source_uuid": uuids[source], "target_uuid": uuids[target], "relation": relation,
+             "fact": fact, "valid_at": reference_time}
+            for source, relation, target, fact in relations
+        ],
+        group_id,
+        episode_uuid
+    )
+    return uuids
+
+
+@pytest.fixture
+def store():
+    """Empty in-memory SQLite store."""
+    sqlite_store = SQLiteGraphStore(":memory:")
+    yield sqlite_store
+    sqlite_store.close()
+
+
+@pytest.fixture
+def populated(store):
+    """
+    Store with two groups: "docs" (Alpha, Beta, Gamma over two dates) and "other".
+
+    Returns:
+        (store, uuids) with uuids keyed by entity name
+    """
+    uuids = write_chunk(store, "docs_chunk_0", "docs", ["Alpha", "Beta"], [
+        ("Alpha", "USES", "Beta", "Alpha uses Beta for authentication"),
+    ], T0)
+    uuids.update(write_chunk(store, "docs_chunk_1", "docs", ["Beta", "Gamma"], [
+        ("Beta", "CALLS", "Gamma", "Beta calls Gamma over HTTP"),
+    ], T1))
+    uuids.update(write_chunk(store, "other_chunk_0", "other", ["Delta", "Epsilon"], [
+        ("Delta", "FEEDS", "Epsilon", "Delta feeds Epsilon with events"),
+    ], T0))
+    return store, uuids
@@ -0,0 +1,79 @@
+"""Tests for the bootstrap statistics behind benchmark comparisons."""
+
+import numpy as np
+
+from comparison.benchmark import bootstrap_ratio, compare_to_baseline, latency_summary
+
+
+def _results(rag_seconds, kg_seconds):
+    samples = [{"system": "rag", "seconds": s, "error": None} for s in rag_seconds]
+    samples += [{"system": "kg", "seconds": s, "error": None} for s in kg_seconds]
+    return {"samples": samples}
+
+
+def test_bootstrap_ratio_brackets_the_ratio_of_medians():
+    rng = np.random.default_rng(1)
+    numerator = rng.normal(2.0, 0.1, 200)
+    denominator = rng.normal(1.0, 0.05, 200)
+
+    ratio, low, high = bootstrap_ratio(numerator, denominator, n_resamples=2000)
+
+    assert ratio == np.median(numerator) / np.median(denominator)
+    assert low < ratio < high
+    assert 1.9 < low and high < 2.1
+
+
+def test_bootstrap_ratio_is_reproducible_and_seeded():
+    values = np.arange(1.0, 21.0)
+
+    assert bootstrap_ratio(values, values[::-1], seed=3) == bootstrap_ratio(values, values[::-1], seed=3)
+    assert bootstrap_ratio(values, values, paired=True) == (1.0, 1.0, 1.0)
+
+
+def test_unpaired_bootstrap_is_wider_for_identical_samples():
+    values = np.random.default_rng(2).lognormal(0, 0.5, 100)
+
+    _, low, high = bootstrap_ratio(values, values, paired=False, n_resamples=2000)
+
+    assert low < 1.0 < high
+
+
+def test_compare_to_baseline_flags_only_significant_slowdowns():
+    rng = np.random.default_rng(4)
+    baseline = _results(rng.normal(1.0, 0.05, 60), rng.normal(2.0, 0.1, 60))
+    current = _results(rng.normal(1.3, 0.05, 60), rng.normal(2.0, 0.1, 60))
+
+    comparison = compare_to_baseline(baseline, current, n_resamples=2000)
+
+    assert comparison["regressed"]
+    assert comparison["systems"]["rag"]["regressed"]
+    assert not comparison["systems"]["kg"]["regressed"]
+    assert not comparison["systems"]["kg"]["improved"]
+
+
+def test_compare_to_baseline_reports_improvements_and_missing_samples():
+    baseline = _results([2.0, 2.1, 1.9, 2.0] * 10, [1.0])
+    current = _results([1.0, 1.1, 0.9, 1.0] * 10, [1.0, 1.0])
+
+    comparison = compare_to_baseline(baseline, current, n_resamples=1000)
+
+    assert comparison["systems"]["rag"]["improved"]
+    assert comparison["systems"]["kg"] is None
+    assert not comparison["regressed"]
+
+
+def test_compare_to_baseline_ignores_failed_samples():
+    baseline = _results([1.0] * 10, [1.0] * 10)
+    current = _results([1.0] * 10, [1.0] * 10)
+    current["samples"].append({"system": "rag", "seconds": 100.0, "error": "TimeoutError"})
+
+    assert compare_to_baseline(baseline, current, n_resamples=500)["systems"]["rag"]["current_p50"] == 1.0
+
+
+def test_latency_summary():
+    summary = latency_summary([1.0, 2.0, 3.0, 4.0])
+
+    assert summary["n"] == 4
+    assert summary["mean"] == 2.5
+    assert summary["min"] == 1.0 and summary["max"] == 4.0
+    assert latency_summary([]) == {"n": 0}
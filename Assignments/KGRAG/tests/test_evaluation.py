@@ -0,0 +1,63 @@
+"""Tests for the ranking metrics of retrieval sweeps."""
+
+import pytest
+
+from comparison.evaluation import pareto_front, ranking_metrics, relevance_matrices
+
+
+def _metrics(judged, k=5):
+    new_hits, any_hits, num_targets, ideal_hits = relevance_matrices(judged, k)
+    return ranking_metrics(new_hits, any_hits, num_targets, k, ideal_hits)
+
+
+@pytest.mark.parametrize("targets", [1, 2, 5])
+def test_perfect_ranking_scores_one_for_any_target_count(targets):
+    metrics = _metrics([([{i} for i in range(targets)], targets)])
+
+    assert metrics == {"recall": 1.0, "mrr": 1.0, "ndcg": pytest.approx(1.0)}
+
+
+def test_one_result_covering_every_target_is_perfect():
+    assert _metrics([([{0, 1, 2}, set()], 3)])["ndcg"] == pytest.approx(1.0)
+
+
+def test_results_covering_several_targets_count_each_target():
+    new_hits, _, _, _ = relevance_matrices([([{0, 1}, {1}, {2}], 3)], 3)
+
+    assert new_hits.tolist() == [[2.0, 0.0, 1.0]]
+    assert _metrics([([{0, 1}, {1}], 3)], k=2)["recall"] == pytest.approx(2 / 3)
+
+
+def test_late_hits_lower_mrr_and_ndcg():
+    metrics = _metrics([([set(), {0}], 1)])
+
+    assert metrics["recall"] == 1.0
+    assert metrics["mrr"] == 0.5
+    assert metrics["ndcg"] == pytest.approx(1 / 1.584962500721156)
+
+
+def test_missed_targets_count_against_ndcg():
+    # Two of four targets found at the top; the other two were never retrieved
+    metrics = _metrics([([{0}, {1}], 4)])
+
+    assert metrics["recall"] == 0.5
+    assert 0.5 < metrics["ndcg"] < 1.0
+
+
+def test_metrics_average_over_questions_and_handle_misses():
+    metrics = _metrics([([{0}], 1), ([set(), set()], 1), ([], 0)])
+
+    assert metrics["recall"] == pytest.approx(1 / 3)
+    assert metrics["mrr"] == pytest.approx(1 / 3)
+    assert metrics["ndcg"] == pytest.approx(1 / 3)
+
+
+def test_hits_beyond_k_are_ignored():
+    assert _metrics([([set(), set(), {0}], 1)], k=2) == {"recall": 0.0, "mrr": 0.0, "ndcg": 0.0}
+
+
+def test_pareto_front_keeps_undominated_configurations():
+    costs = [1.0, 2.0, 3.0, 2.5]
+    qualities = [0.5, 0.7, 0.9, 0.6]
+
+    assert pareto_front(costs, qualities) == [0, 1, 2]
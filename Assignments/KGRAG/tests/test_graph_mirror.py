@@ -0,0 +1,132 @@
+"""Tests for the in-process CSR graph mirror."""
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from knowledge_graph.graph_mirror import GraphMirror
+
+from conftest import T0
+
+
+def _edge(i, source, target, relation="RELATES_TO"):
+    return {
+        "uuid": f"e{i}",
+        "source_uuid": f"u-{source}",
+        "source_name": source,
+        "target_uuid": f"u-{target}",
+        "target_name": target,
+        "relation": relation,
+        "created_at": T0 + timedelta(minutes=i)
+    }
+
+
+class EdgeStore:
+    """Minimal GraphStore stand-in serving iter_edges from a list."""
+
+    def __init__(self, edges):
+        self.edges = list(edges)
+
+    def iter_edges(self, since=None):
+        return [edge for edge in self.edges if since is None or edge["created_at"] >= since]
+
+
+@pytest.fixture
+def chain():
+    """A - B - C - D plus a branch B - E."""
+    return [_edge(0, "A", "B"), _edge(1, "B", "C"), _edge(2, "C", "D"), _edge(3, "B", "E", "OWNS")]
+
+
+def test_apply_edges_skips_known_edge_uuids(chain):
+    mirror = GraphMirror()
+
+    assert mirror.apply_edges(chain) == 4
+    assert mirror.apply_edges(chain[:2]) == 0
+    assert mirror.num_nodes == 5
+    assert mirror.num_edges == 4
+    assert mirror.relation_names == ["RELATES_TO", "OWNS"]
+
+
+def test_neighborhood_groups_by_hop(chain):
+    mirror = GraphMirror()
+    mirror.apply_edges(chain)
+
+    hops = mirror.neighborhood("A", hops=3)
+
+    assert hops[1] == ["B"]
+    assert sorted(hops[2]) == ["C", "E"]
+    assert hops[3] == ["D"]
+    assert sorted(mirror.neighbors_of("u-C", hops=1)) == ["B", "D"]
+    assert mirror.neighborhood("Unknown") == {}
+
+
+def test_degree_counts_directions(chain):
+    mirror = GraphMirror()
+    mirror.apply_edges(chain)
+
+    assert mirror.degree("B") == {"out": 2, "in": 1, "total": 3}
+    assert mirror.degree("D") == {"out": 0, "in": 1, "total": 1}
+
+
+def test_pagerank_of_a_cycle_is_uniform():
+    mirror = GraphMirror()
+    mirror.apply_edges([_edge(0, "A", "B"), _edge(1, "B", "C"), _edge(2, "C", "A")])
+
+    np.testing.assert_allclose(mirror.pagerank(), np.full(3, 1 / 3))
+
+
+def test_pagerank_spreads_dangling_nodes_uniformly():
+    mirror = GraphMirror()
+    mirror.apply_edges([_edge(0, "A", "B")])
+
+    ranks = mirror.pagerank(damping=0.85)
+
+    # r_A = 0.15 / 2 + 0.85 * r_B / 2 and r_A + r_B = 1
+    np.testing.assert_allclose(ranks, [0.5 / 1.425, 1 - 0.5 / 1.425], atol=1e-8)
+    assert GraphMirror().pagerank().size == 0
+
+
+def test_refresh_is_incremental(chain):
+    store = EdgeStore(chain[:2])
+    mirror = GraphMirror()
+
+    assert mirror.refresh(store) == 2
+    store.edges.extend(chain[2:])
+    assert mirror.refresh(store) == 2
+    assert mirror.refresh(store) == 0
+    assert mirror.watermark == chain[-1]["created_at"]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(chain, tmp_path, mmap):
+    mirror = GraphMirror()
+    mirror.refresh(EdgeStore(chain))
+    mirror.save(str(tmp_path))
+
+    loaded = GraphMirror.load(str(tmp_path), mmap=mmap)
+
+    assert loaded.names == mirror.names
+    assert loaded.watermark == mirror.watermark
+    assert loaded.neighborhood("A", hops=3) == mirror.neighborhood("A", hops=3)
+    np.testing.assert_allclose(loaded.pagerank(), mirror.pagerank())
+
+
+def test_saving_a_loaded_mirror_keeps_its_files_intact(chain, tmp_path):
+    store = EdgeStore(chain)
+    mirror = GraphMirror()
+    mirror.refresh(store)
+    mirror.save(str(tmp_path))
+
+    # A no-op refresh of a memory-mapped mirror must not truncate the files it reads
+    loaded = GraphMirror.load(str(tmp_path))
+    loaded.refresh(store)
+    loaded.save(str(tmp_path))
+    assert GraphMirror.load(str(tmp_path)).neighborhood("A", hops=3) == mirror.neighborhood("A", hops=3)
+
+    store.edges.append(_edge(4, "D", "F"))
+    loaded.refresh(store)
+    loaded.save(str(tmp_path))
+    reloaded = GraphMirror.load(str(tmp_path))
+    assert reloaded.num_edges == 5
+    assert reloaded.neighbors_of("F") == ["D"]
@@ -0,0 +1,87 @@
+"""Tests for the persistent LLM response cache."""
+
+import pytest
+
+from knowledge_graph.llm_cache import LLMCache
+
+
+@pytest.fixture
+def cache():
+    llm_cache = LLMCache(":memory:", max_bytes=30)
+    yield llm_cache
+    llm_cache.close()
+
+
+def _touch(cache, key, accessed_at):
+    with cache.conn:
+        cache.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (accessed_at, key))
+
+
+def test_keys_depend_on_model_messages_and_params():
+    key = LLMCache.make_key("gpt", [{"role": "user", "content": "hi"}], {"temperature": 0})
+
+    assert key.startswith("gpt:")
+    assert key == LLMCache.make_key("gpt", [{"role": "user", "content": "hi"}], {"temperature": 0})
+    assert key != LLMCache.make_key("other", [{"role": "user", "content": "hi"}], {"temperature": 0})
+    assert key != LLMCache.make_key("gpt", [{"role": "user", "content": "hi"}], {"temperature": 1})
+
+
+def test_get_counts_hits_and_misses(cache):
+    cache.set("a", {"answer": 1})
+
+    assert cache.get("a") == {"answer": 1}
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.set("a", "x" * 10)  # 12 bytes as JSON
+    cache.set("b", "x" * 10)
+    _touch(cache, "a", 1.0)
+    _touch(cache, "b", 2.0)
+    assert cache.get("a") is not None  # now the most recently used
+
+    cache.set("c", "x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 24
+
+
+def test_replacing_an_entry_does_not_double_count_its_size(cache):
+    cache.set("a", "x" * 10)
+    cache.set("a", "y" * 10)
+
+    assert cache.stats()["bytes"] == 12
+    assert cache.stats()["evictions"] == 0
+
+
+def test_entries_older_than_the_ttl_are_misses():
+    llm_cache = LLMCache(":memory:", ttl_seconds=60)
+    try:
+        llm_cache.set("old", "stale")
+        llm_cache.set("new", "fresh")
+        with llm_cache.conn:
+            llm_cache.conn.execute("UPDATE responses SET created_at = created_at - 61 WHERE key = 'old'")
+
+        assert llm_cache.get("old") is None
+        assert llm_cache.get("new") == "fresh"
+    finally:
+        llm_cache.close()
+
+
+def test_size_survives_reopening(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = LLMCache(path)
+    first.set("a", "x" * 10)
+    first.close()
+
+    second = LLMCache(path)
+    try:
+        assert second.stats()["bytes"] == 12
+        assert second.get("a") == "x" * 10
+    finally:
+        second.close()
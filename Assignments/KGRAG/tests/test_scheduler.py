@@ -0,0 +1,107 @@
+"""Tests for rate limiting, retries and resuming of scheduled suites."""
+
+import asyncio
+import json
+
+from comparison.scheduler import RateLimiter, SuiteScheduler, is_transient, percentile
+
+
+def test_is_transient_reads_the_exception_name():
+    assert is_transient("RateLimitError: slow down")
+    assert is_transient("TimeoutError")
+    assert not is_transient("ValueError: bad input")
+
+
+def test_percentile_is_nearest_rank():
+    values = [5.0, 1.0, 3.0, 2.0, 4.0]
+
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 100) == 5.0
+    assert percentile(values, 0) == 1.0
+
+
+def test_rate_limiter_starts_full_then_waits_for_refill():
+    async def scenario():
+        limiter = RateLimiter(rpm=600)  # 10 requests per second
+        first = await limiter.acquire(600)
+        second = await limiter.acquire(1)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == 0.0
+    assert 0.05 < second < 0.5
+
+
+def test_rate_limiter_paces_tokens_and_caps_oversized_requests():
+    async def scenario():
+        limiter = RateLimiter(rpm=5, tpm=6000)  # 100 tokens per second
+        oversized = await limiter.acquire(requests=10, tokens=6000)
+        paced = await limiter.acquire(requests=0, tokens=20)
+        return oversized, paced
+
+    oversized, paced = asyncio.run(scenario())
+
+    assert oversized == 0.0
+    assert 0.1 < paced < 0.6
+
+
+def test_unlimited_rate_limiter_never_waits():
+    assert asyncio.run(RateLimiter().acquire(1000, 10 ** 9)) == 0.0
+
+
+def test_transient_errors_are_retried():
+    calls = []
+
+    async def job(question):
+        calls.append(question)
+        if len(calls) == 1:
+            return {"question": question, "errors": {"kg": "RateLimitError: slow down"}}
+        return {"question": question, "errors": {}}
+
+    suite = asyncio.run(SuiteScheduler(max_retries=2, backoff=0).run(["q"], job))
+
+    assert calls == ["q", "q"]
+    assert suite["results"][0]["schedule"]["attempts"] == 2
+    assert suite["summary"]["retries"] == 1
+    assert suite["summary"]["failed"] == 0
+
+
+def test_permanent_errors_are_not_retried():
+    async def job(question):
+        return {"question": question, "errors": {"rag": "ValueError: bad"}}
+
+    suite = asyncio.run(SuiteScheduler(max_retries=3, backoff=0).run(["q"], job))
+
+    assert suite["results"][0]["schedule"]["attempts"] == 1
+    assert suite["summary"]["failed"] == 1
+
+
+def test_rerun_resumes_from_the_output_file(tmp_path):
+    output = tmp_path / "results.jsonl"
+    questions = ["a", "b", "c"]
+    calls = []
+
+    async def flaky(question):
+        calls.append(question)
+        errors = {"kg": "ValueError: broken"} if question == "b" else {}
+        return {"question": question, "answer": question.upper(), "errors": errors}
+
+    async def healthy(question):
+        calls.append(question)
+        return {"question": question, "answer": question.upper(), "errors": {}}
+
+    first = asyncio.run(SuiteScheduler(output_path=str(output)).run(questions, flaky))
+    assert first["summary"]["failed"] == 1
+
+    calls.clear()
+    streamed = []
+    second = asyncio.run(SuiteScheduler(output_path=str(output)).run(questions, healthy, on_result=streamed.append))
+
+    assert calls == ["b"]
+    assert [record["question"] for record in streamed] == ["b"]
+    assert second["summary"]["resumed"] == 2
+    assert second["summary"]["failed"] == 0
+    assert [result["question"] for result in second["results"]] == questions
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [line["question"] for line in lines].count("b") == 2
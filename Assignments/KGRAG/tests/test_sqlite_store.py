@@ -0,0 +1,235 @@
+"""Tests for the embedded SQLite graph store."""
+
+import json
+from datetime import timedelta
+
+from knowledge_graph.bulk_load import stage_records
+from knowledge_graph.graph_store import time_window
+from knowledge_graph.sqlite_store import SQLiteGraphStore
+
+from conftest import T0, T1, write_chunk
+
+
+def _record(name, entities, relations, reference_time=T0):
+    """Extraction record in the extract_to_jsonl format."""
+    return {
+        "name": name,
+        "source": "test",
+        "content": f"Content of {name}",
+        "source_description": "test chunk",
+        "reference_time": reference_time.isoformat(),
+        "entities": [{"name": entity, "type": "Entity", "summary": ""} for entity in entities],
+        "relations": [
+            {"source": source, "relation": relation, "target": target, "fact": fact}
+            for source, relation, target, fact in relations
+        ]
+    }
+
+
+def _facts(records):
+    return sorted(record["fact"] for record in records)
+
+
+def test_add_counts_nodes_and_relationships(populated):
+    store, _ = populated
+    stats = store.get_statistics()
+
+    assert stats["num_entities"] == 5
+    assert stats["num_episodes"] == 3
+    assert stats["relationship_types"] == {"RELATES_TO": 3, "MENTIONS": 6}
+    assert stats["total_nodes"] == 8
+    assert stats["degree"]["max"] == 4  # Beta: two edges, two mentions
+
+
+def test_add_entities_reuses_names_within_a_group(populated):
+    store, uuids = populated
+
+    again = store.add_entities([{"name": "Alpha"}], "docs")
+    elsewhere = store.add_entities([{"name": "Alpha"}], "other")
+
+    assert again["Alpha"] == uuids["Alpha"]
+    assert elsewhere["Alpha"] != uuids["Alpha"]
+
+
+def test_add_edges_skips_unknown_entities(store):
+    uuids = write_chunk(store, "chunk", "docs", ["Alpha"], [])
+
+    added = store.add_edges([{"source_uuid": uuids["Alpha"], "target_uuid": "missing", "fact": "dangling"}], "docs")
+
+    assert added == 0
+    assert store.get_statistics()["relationship_types"]["RELATES_TO"] == 0
+
+
+def test_bulk_write_matches_incremental_writes(populated):
+    incremental, _ = populated
+    bulk = SQLiteGraphStore(":memory:")
+    try:
+        bulk.bulk_write(stage_records([
+            _record("docs_chunk_0", ["Alpha", "Beta"], [("Alpha", "USES", "Beta", "Alpha uses Beta for authentication")]),
+            _record("docs_chunk_1", ["Beta", "Gamma"], [("Beta", "CALLS", "Gamma", "Beta calls Gamma over HTTP")], T1),
+        ]), "docs")
+        counts = bulk.bulk_write(stage_records([
+            _record("other_chunk_0", ["Delta", "Epsilon"], [("Delta", "FEEDS", "Epsilon", "Delta feeds Epsilon with events")]),
+        ]), "other")
+
+        assert counts == {"episodes": 1, "entities": 2, "edges": 1}
+        assert bulk.get_statistics() == incremental.get_statistics()
+        assert _facts(bulk.search_facts("Beta")) == _facts(incremental.search_facts("Beta"))
+    finally:
+        bulk.close()
+
+
+def test_bulk_write_reuses_existing_entities(populated):
+    store, uuids = populated
+
+    counts = store.bulk_write(stage_records([
+        _record("docs_chunk_2", ["Alpha", "Zeta"], [("Alpha", "OWNS", "Zeta", "Alpha owns Zeta")]),
+    ]), "docs")
+
+    assert counts["entities"] == 1
+    assert ("Alpha", "RELATES_TO", "Zeta") in {
+        (r["source"], r["relationship"], r["target"]) for r in store.iter_entity_relationships(["Alpha"])
+    }
+    assert store.entity_names([uuids["Alpha"]]) == ["Alpha"]
+
+
+def test_entity_relationships_are_ordered(populated):
+    store, _ = populated
+
+    records = list(store.iter_entity_relationships(["Gamma", "Beta"]))
+    keys = [(r["entity"], r["relationship"], r["source"], r["target"]) for r in records]
+
+    assert keys == sorted(keys)
+    assert {r["entity"] for r in records} == {"Beta", "Gamma"}
+
+
+def test_entity_relationship_pages_cover_every_record_once(populated):
+    store, _ = populated
+    names = ["Alpha", "Beta", "Gamma", "Delta"]
+    everything = list(store.iter_entity_relationships(names))
+
+    pages = []
+    for skip in range(0, len(everything), 3):
+        pages.extend(store.iter_entity_relationships(names, skip=skip, limit=3))
+
+    assert len(everything) == 10
+    assert pages == everything
+
+
+def test_entity_relationships_filter_by_type(populated):
+    store, _ = populated
+
+    records = list(store.iter_entity_relationships(["Beta"], relationship_types=["MENTIONS"]))
+
+    assert {r["source"] for r in records} == {"docs_chunk_0", "docs_chunk_1"}
+    assert all(r["relationship"] == "MENTIONS" for r in records)
+
+
+def test_search_facts_ranks_keyword_matches(populated):
+    store, uuids = populated
+
+    results = store.search_facts("authentication")
+
+    assert [r["fact"] for r in results] == ["Alpha uses Beta for authentication"]
+    assert results[0]["source_uuid"] == uuids["Alpha"]
+    assert store.search_facts("") == []
+
+
+def test_search_facts_within_a_time_window(populated):
+    store, _ = populated
+
+    as_of_t0 = store.search_facts("Beta", window=time_window(as_of=T0 + timedelta(days=1)))
+    around_t1 = store.search_facts("Beta", window=time_window(between=(T1 - timedelta(days=1), T1 + timedelta(days=1))))
+
+    assert _facts(as_of_t0) == ["Alpha uses Beta for authentication"]
+    assert _facts(around_t1) == ["Beta calls Gamma over HTTP"]
+
+
+def test_expand_hop_follows_edges_newest_first(populated):
+    store, uuids = populated
+
+    records = store.expand_hop([uuids["Beta"]], [], 10)
+
+    assert [r["edge"]["neighbor_uuid"] for r in records] == [uuids["Gamma"], uuids["Alpha"]]
+    assert records[0]["edge"]["timestamp"] == T1
+    assert len(store.expand_hop([uuids["Beta"]], [], 1)) == 1
+
+    seen = [records[0]["edge"]["edge_uuid"]]
+    assert [r["edge"]["target"] for r in store.expand_hop([uuids["Beta"]], seen, 10)] == ["Beta"]
+
+
+def test_expand_hop_within_a_time_window(populated):
+    store, uuids = populated
+
+    records = store.expand_hop([uuids["Beta"]], [], 10, window=time_window(as_of=T0 + timedelta(days=1)))
+
+    assert [r["edge"]["neighbor_uuid"] for r in records] == [uuids["Alpha"]]
+
+
+def test_scoped_clear_keeps_other_groups(populated):
+    store, uuids = populated
+
+    report = store.clear(group_id="docs")
+    stats = store.get_statistics()
+
+    assert report["deleted_nodes"] == 5
+    assert stats["num_entities"] == 2
+    assert stats["relationship_types"] == {"RELATES_TO": 1, "MENTIONS": 2}
+    assert store.expand_hop([uuids["Beta"]], [], 10) == []
+    assert len(store.expand_hop([uuids["Delta"]], [], 10)) == 1
+
+
+def test_full_clear_empties_the_store(populated):
+    store, _ = populated
+
+    store.clear(batch_size=2)
+
+    assert store.get_statistics()["total_nodes"] == 0
+    assert store.get_statistics()["total_relationships"] == 0
+    assert store.search_facts("Beta") == []
+
+
+def test_compact_merges_duplicates(store):
+    write_chunk(store, "chunk_0", "docs", ["Alpha", "Beta"], [("Alpha", "USES", "Beta", "Alpha uses Beta")])
+    # Re-ingested chunk: identical episode content, a case variant and a repeated fact
+    write_chunk(store, "chunk_0", "docs", ["alpha", "Beta"], [("alpha", "USES", "Beta", "Alpha uses Beta")])
+    # Names that differ in more than case stay apart, as does another group
+    write_chunk(store, "chunk_1", "docs", ["Alpha-Beta", "AlphaBeta"], [])
+    write_chunk(store, "chunk_0", "other", ["Beta", "beta"], [])
+
+    report = store.compact(group_id="docs")
+
+    assert report["merged_entities"] == 1
+    assert report["merged_edges"] == 1
+    assert report["merged_episodes"] == 1
+    assert report["after"]["num_entities"] == 6
+    assert report["after"]["num_episodes"] == 3
+    assert [r["fact"] for r in store.search_facts("uses")] == ["Alpha uses Beta"]
+
+
+def test_compact_archives_expired_facts(populated, tmp_path):
+    store, _ = populated
+    store.conn.execute(
+        "UPDATE edges SET invalid_at = ? WHERE fact = ?", (T1.isoformat(), "Alpha uses Beta for authentication")
+    )
+    archive = tmp_path / "archive.jsonl"
+
+    report = store.compact(archive_path=str(archive))
+
+    archived = [json.loads(line) for line in archive.read_text(encoding="utf-8").splitlines()]
+    assert report["archived_edges"] == 1
+    assert [fact["fact"] for fact in archived] == ["Alpha uses Beta for authentication"]
+    assert store.search_facts("authentication") == []
+
+
+def test_compact_keeps_restated_facts_unless_asked(store):
+    write_chunk(store, "chunk_0", "docs", ["Alpha", "Beta"], [("Alpha", "USES", "Beta", "Alpha uses Beta for auth")], T0)
+    write_chunk(store, "chunk_1", "docs", ["Alpha", "Beta"], [("Alpha", "USES", "Beta", "Alpha uses Beta for logging")], T1)
+
+    kept = store.compact(archive_path=None)
+    expired = store.compact(archive_path=None, expire_superseded=True)
+
+    assert "superseded_edges" not in kept
+    assert kept["after"]["relationship_types"]["RELATES_TO"] == 2
+    assert expired["superseded_edges"] == 1
+    assert [r["fact"] for r in store.search_facts("Alpha")] == ["Alpha uses Beta for logging"]
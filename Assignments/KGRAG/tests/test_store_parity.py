@@ -0,0 +1,31 @@
+"""SQLite/Neo4j parity check against a live database (opt in with ``pytest -m neo4j``)."""
+
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.neo4j
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_sqlite_and_neo4j_stores_agree(monkeypatch):
+    pytest.importorskip("neo4j")
+    from benchmarks.common import SAMPLE_FILES, load_chunks, neo4j_settings
+    from benchmarks.store_parity import check_parity
+    from knowledge_graph.neo4j_store import Neo4jGraphStore
+    from knowledge_graph.sqlite_store import SQLiteGraphStore
+
+    monkeypatch.chdir(PROJECT_ROOT)
+    settings = neo4j_settings()
+    if not settings:
+        pytest.skip("NEO4J_URI is not configured")
+
+    chunks = [chunk for path in SAMPLE_FILES for chunk in load_chunks(path)]
+    sqlite_store = SQLiteGraphStore(":memory:")
+    neo4j_store = Neo4jGraphStore(settings["uri"], settings["user"], settings["password"])
+    try:
+        assert check_parity(sqlite_store, neo4j_store, chunks) == []
+    finally:
+        sqlite_store.close()
+        neo4j_store.close()
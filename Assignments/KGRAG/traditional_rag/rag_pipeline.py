@@ -1,8 +1,10 @@
 """Traditional RAG Pipeline using LangChain, OpenAI, and FAISS."""
 
+import hashlib
+import json
 import os
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
@@ -22,7 +24,8 @@ class TraditionalRAG:
         model_name: str = "gpt-4-turbo-preview",
         embedding_model: str = "text-embedding-3-small",
         chunk_size: int = 1000,
-        chunk_overlap: int = 200
+        chunk_overlap: int = 200,
+        base_url: Optional[str] = None
     ):
         """
         Initialize Traditional RAG system.
@@ -33,23 +36,28 @@ class TraditionalRAG:
             embedding_model: Embedding model to use
             chunk_size: Size of text chunks
             chunk_overlap: Overlap between chunks
+            base_url: OpenAI-compatible API base URL (e.g. the replay server
+                from comparison.replay); None uses the OpenAI API
         """
         self.openai_api_key = openai_api_key
         self.model_name = model_name
         self.embedding_model = embedding_model
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.base_url = base_url
 
         # Initialize components
         self.embeddings = OpenAIEmbeddings(
             model=embedding_model,
-            api_key=openai_api_key
+            api_key=openai_api_key,
+            base_url=base_url
         )
 
         self.llm = ChatOpenAI(
             model=model_name,
             temperature=0,
-            api_key=openai_api_key
+            api_key=openai_api_key,
+            base_url=base_url
         )
 
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -149,14 +157,18 @@ Answer: """
         print(f"\nQuerying Traditional RAG: {question}")
         start_time = time.time()
 
-        # Execute query
-        result = self.qa_chain.invoke({"query": question})
+        # Execute the chain's two stages separately so each can be timed
+        source_docs = self.qa_chain.retriever.invoke(question)
+        retrieval_time = time.time() - start_time
 
-        query_time = time.time() - start_time
+        generation_start = time.time()
+        result = self.qa_chain.combine_documents_chain.invoke(
+            {"input_documents": source_docs, "question": question}
+        )
+        answer = result['output_text']
+        generation_time = time.time() - generation_start
 
-        # Extract results
-        answer = result['result']
-        source_docs = result['source_documents']
+        query_time = time.time() - start_time
 
         # Calculate metrics
         num_tokens = len(answer.split())  # Rough estimate
@@ -167,6 +179,8 @@ Answer: """
             "source_documents": source_docs,
             "metrics": {
                 "query_time": query_time,
+                "retrieval_time": retrieval_time,
+                "generation_time": generation_time,
                 "num_source_chunks": num_chunks,
                 "answer_tokens": num_tokens,
                 "retrieval_method": "vector_similarity"
@@ -204,3 +218,48 @@ Answer: """
         )
         self._create_qa_chain()
         print(f"Index loaded from {path}")
+
+    def index_key(self, file_path: str) -> str:
+        """
+        Key identifying the index of a file under the current settings.
+
+        The key changes with the file's contents, the embedding model and
+        the chunking parameters, so a stale index is never reused.
+
+        Args:
+            file_path: Path to the document file
+
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        settings = {
+            "embedding_model": self.embedding_model,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap
+        }
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def load_or_build_index(self, file_path: str, index_dir: str = "vector_index") -> bool:
+        """
+        Load the persisted index of a file, or build and persist it.
+
+        Args:
+            file_path: Path to the document file
+            index_dir: Directory holding one saved index per key
+
+        Returns:
+            True if an existing index was loaded, False if it was built
+        """
+        path = Path(index_dir) / self.index_key(file_path)
+        if (path / "index.faiss").exists():
+            self.load_index(str(path))
+            return True
+
+        self.build_index(self.load_documents(file_path))
+        self.save_index(str(path))
+        return False